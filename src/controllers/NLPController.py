@@ -1,22 +1,50 @@
 from .BaseController import BaseController
-from models.db_schemes import Project, DataChunk
+from models.db_schemes import Project, DataChunk, RetrievedDocument
 from typing import List
-from stores.llm.LLMEnums import DocumentTypeEnums
+from stores.llm.LLMEnums import DocumentTypeEnums, StreamEventEnums
+from models.enums import ResponseSignal
+from stores.vectordb.VectorDBEnums import FilterOperatorEnums, VectorMetadataEnums
+from stores.lexical.LexicalSearchEnums import SearchModeEnums
+from stores.querycache.QueryCacheEnums import QueryCacheKindEnums
+from stores.llm.context.ContextPacker import ContextPacker
+import asyncio
 import json
+import logging
 
 
 class NLPController(BaseController):
 
     def __init__(
-        self, vectordb_client, generation_client, embedding_client, template_parser
+        self,
+        vectordb_client,
+        generation_client,
+        embedding_client,
+        template_parser,
+        lexical_client=None,
+        query_cache=None,
+        token_counter=None,
     ):
         super().__init__()
 
         self.vectordb_client = vectordb_client
+        self.lexical_client = lexical_client
+        self.query_cache = query_cache
+        self.token_counter = token_counter
+        self.context_packer = (
+            ContextPacker(
+                token_counter=token_counter,
+                duplicate_threshold=self.app_settings.GENERATION_CONTEXT_DUPLICATE_THRESHOLD,
+                merge_adjacent=self.app_settings.GENERATION_CONTEXT_MERGE_ADJACENT,
+            )
+            if token_counter
+            else None
+        )
         self.generation_client = generation_client
         self.embedding_client = embedding_client
         self.template_parser = template_parser
 
+        self.logger = logging.getLogger("uvicorn.error")
+
     # create_collection_name method
     def create_collection_name(self, project_id: str):
         return f"collection_{self.vectordb_client.default_vector_size}_{project_id}".strip()
@@ -39,6 +67,59 @@ class NLPController(BaseController):
             json.dumps(collection_info, default=lambda x: x.__dict__),
         )
 
+    # get_chunk_vector_metadata method
+    def get_chunk_vector_metadata(self, chunk: DataChunk) -> dict:
+        # asset and order are stored with the vector so searches can filter on them
+        return {
+            **(chunk.chunk_metadata or {}),
+            VectorMetadataEnums.ASSET_ID.value: chunk.chunk_asset_id,
+            VectorMetadataEnums.CHUNK_ORDER.value: chunk.chunk_order,
+        }
+
+    # build_search_filters method
+    def build_search_filters(self, asset_ids: List[int] = None, filters: List[dict] = None):
+        """
+        Turn the request filters into the backend-neutral filter list of
+        `search_by_vector`. Returns None if any condition is invalid.
+        """
+        search_filters = []
+        if asset_ids:
+            search_filters.append(
+                {
+                    "field": VectorMetadataEnums.ASSET_ID.value,
+                    "operator": FilterOperatorEnums.IN.value,
+                    "value": list(asset_ids),
+                }
+            )
+
+        operators = [operator.value for operator in FilterOperatorEnums]
+        for condition in filters or []:
+            operator = condition.get("operator") or FilterOperatorEnums.EQ.value
+            if not condition.get("field") or operator not in operators:
+                return None
+
+            value = condition.get("value")
+            if isinstance(value, list) != (operator == FilterOperatorEnums.IN.value):
+                return None
+
+            is_range = operator not in (
+                FilterOperatorEnums.EQ.value,
+                FilterOperatorEnums.NE.value,
+                FilterOperatorEnums.IN.value,
+            )
+            if is_range and (isinstance(value, bool) or not isinstance(value, (int, float))):
+                return None
+
+            search_filters.append(
+                {
+                    "field": condition["field"],
+                    "operator": operator,
+                    "value": value,
+                }
+            )
+
+        return search_filters
+
     # index_into_vectordb method
     async def index_into_vectordb(
         self,
@@ -52,8 +133,8 @@ class NLPController(BaseController):
 
         # step2: manage items
         texts = [c.chunk_text for c in chunks]
-        metadata = [c.chunk_metadata for c in chunks]
-        vectors = self.embedding_client.embed_text(
+        metadata = [self.get_chunk_vector_metadata(c) for c in chunks]
+        vectors = await self.embedding_client.embed_text_async(
             text=texts, document_type=DocumentTypeEnums.DOCUMENT.value
         )
 
@@ -74,24 +155,316 @@ class NLPController(BaseController):
 
         return True
 
+    # index_chunks_pipeline method
+    async def index_chunks_pipeline(
+        self,
+        project: Project,
+        chunks_pages,
+        embedding_workers: int = None,
+        writer_workers: int = None,
+        queue_size: int = None,
+        on_progress=None,
+    ):
+        """
+        Overlap chunk reading, embedding and vector db writes.
+
+        `chunks_pages` is an async iterator of chunk pages. Pages flow through
+        two bounded queues (reader -> embedding workers -> writers), so a slow
+        stage applies backpressure to the ones before it.
+
+        Returns the number of inserted items, or None if any stage failed.
+        """
+        embedding_workers = (
+            embedding_workers
+            if embedding_workers
+            else self.app_settings.INDEXING_EMBEDDING_WORKERS
+        )
+        writer_workers = (
+            writer_workers if writer_workers else self.app_settings.INDEXING_WRITER_WORKERS
+        )
+        queue_size = queue_size if queue_size else self.app_settings.INDEXING_QUEUE_SIZE
+
+        collection_name = self.create_collection_name(project_id=project.project_id)
+
+        embed_queue = asyncio.Queue(maxsize=queue_size)
+        write_queue = asyncio.Queue(maxsize=queue_size)
+        inserted_items_count = 0
+
+        async def read_pages():
+            async for page_chunks in chunks_pages:
+                await embed_queue.put(page_chunks)
+
+            for _ in range(embedding_workers):
+                await embed_queue.put(None)
+
+        async def embed_pages():
+            while True:
+                page_chunks = await embed_queue.get()
+                if page_chunks is None:
+                    break
+
+                texts = [c.chunk_text for c in page_chunks]
+                vectors = await self.embedding_client.embed_text_async(
+                    text=texts,
+                    document_type=DocumentTypeEnums.DOCUMENT.value,
+                )
+                if not vectors or len(vectors) != len(texts):
+                    raise RuntimeError(
+                        f"Embedding failed for collection: {collection_name}"
+                    )
+
+                await write_queue.put(
+                    (
+                        texts,
+                        [self.get_chunk_vector_metadata(c) for c in page_chunks],
+                        vectors,
+                        [c.chunk_id for c in page_chunks],
+                    )
+                )
+
+        async def write_pages():
+            nonlocal inserted_items_count
+            while True:
+                item = await write_queue.get()
+                if item is None:
+                    break
+
+                texts, metadata, vectors, chunks_ids = item
+                is_inserted = await self.vectordb_client.insert_many(
+                    collection_name=collection_name,
+                    texts=texts,
+                    metadata=metadata,
+                    vectors=vectors,
+                    record_ids=chunks_ids,
+                )
+                if not is_inserted:
+                    raise RuntimeError(
+                        f"Vector db insert failed for collection: {collection_name}"
+                    )
+
+                inserted_items_count += len(chunks_ids)
+                if on_progress:
+                    on_progress(len(chunks_ids))
+
+        async def run_embedders():
+            await asyncio.gather(*[embed_pages() for _ in range(embedding_workers)])
+            for _ in range(writer_workers):
+                await write_queue.put(None)
+
+        tasks = [
+            asyncio.create_task(read_pages()),
+            asyncio.create_task(run_embedders()),
+            *[asyncio.create_task(write_pages()) for _ in range(writer_workers)],
+        ]
+
+        try:
+            await asyncio.gather(*tasks)
+        except Exception as e:
+            self.logger.error(f"Error while indexing project chunks: {e}")
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            return None
+
+        return inserted_items_count
+
     async def search_vectordb_collection(
-        self, project: Project, text: str, limit: int = 10
+        self,
+        project: Project,
+        text: str,
+        limit: int = 10,
+        ef_search: int = None,
+        probes: int = None,
+        rerank_depth: int = None,
+        filters: List[dict] = None,
+        search_mode: str = None,
     ):
-        # step1: get collection name
+        search_mode = search_mode if search_mode else self.app_settings.SEARCH_MODE
+        search_params = {
+            "limit": limit,
+            "ef_search": ef_search,
+            "probes": probes,
+            "rerank_depth": rerank_depth,
+            "filters": filters,
+            "search_mode": search_mode,
+        }
+
         query_vector = None
-        collection_name = self.create_collection_name(project_id=project.project_id)
+        if self.query_cache:
+            cached, query_vector = await self.get_cached_result(
+                kind=QueryCacheKindEnums.SEARCH.value,
+                project=project,
+                params=search_params,
+                text=text,
+            )
+            if cached is not None:
+                return [RetrievedDocument(**result) for result in cached["results"]]
 
-        # step2: get text embedding vector
-        vectors = self.embedding_client.embed_text(
+        results = await self.retrieve_documents(
+            project=project,
             text=text,
-            document_type=DocumentTypeEnums.QUERY.value,
+            limit=limit,
+            ef_search=ef_search,
+            probes=probes,
+            rerank_depth=rerank_depth,
+            filters=filters,
+            search_mode=search_mode,
+            query_vector=query_vector,
         )
 
-        if not vectors or len(vectors) == 0:
+        if results and self.query_cache:
+            await self.query_cache.set(
+                kind=QueryCacheKindEnums.SEARCH.value,
+                project_id=project.project_id,
+                index_version=project.project_index_version,
+                params=search_params,
+                text=text,
+                vector=query_vector,
+                value={"results": [result.dict() for result in results]},
+            )
+
+        return results
+
+    # get_cached_result method
+    async def get_cached_result(
+        self, kind: str, project: Project, params: dict, text: str
+    ):
+        """
+        Look `text` up in the query cache, exact match first, then by query
+        embedding. The embedding is returned so a miss does not compute it
+        again for the actual search.
+        """
+        cached = await self.query_cache.get_exact(
+            kind=kind,
+            project_id=project.project_id,
+            index_version=project.project_index_version,
+            params=params,
+            text=text,
+        )
+        if cached is not None:
+            return cached, None
+
+        query_vector = await self.embed_query(text=text)
+        cached = await self.query_cache.get_similar(
+            kind=kind,
+            project_id=project.project_id,
+            index_version=project.project_index_version,
+            params=params,
+            vector=query_vector,
+        )
+
+        return cached, query_vector
+
+    # retrieve_documents method
+    async def retrieve_documents(
+        self,
+        project: Project,
+        text: str,
+        limit: int = 10,
+        ef_search: int = None,
+        probes: int = None,
+        rerank_depth: int = None,
+        filters: List[dict] = None,
+        search_mode: str = None,
+        query_vector: list = None,
+    ):
+        if search_mode != SearchModeEnums.HYBRID.value or self.lexical_client is None:
+            return await self.vector_search(
+                project=project,
+                text=text,
+                limit=limit,
+                ef_search=ef_search,
+                probes=probes,
+                rerank_depth=rerank_depth,
+                filters=filters,
+                query_vector=query_vector,
+            )
+
+        # hybrid: both retrievers run concurrently over a deeper candidate
+        # list, then reciprocal rank fusion picks the final top `limit`
+        candidates_limit = limit * self.app_settings.HYBRID_SEARCH_CANDIDATES_FACTOR
+        vector_results, lexical_results = await asyncio.gather(
+            self.vector_search(
+                project=project,
+                text=text,
+                limit=candidates_limit,
+                ef_search=ef_search,
+                probes=probes,
+                rerank_depth=rerank_depth,
+                filters=filters,
+                query_vector=query_vector,
+            ),
+            self.lexical_client.search(
+                project_id=project.project_id,
+                text=text,
+                limit=candidates_limit,
+                filters=filters,
+            ),
+        )
+
+        results = self.fuse_results(
+            results_lists=[vector_results or [], lexical_results or []],
+            limit=limit,
+        )
+        if not results:
             return False
 
-        if isinstance(vectors, list) and len(vectors) > 0:
-            query_vector = vectors[0]
+        return results
+
+    # fuse_results method
+    def fuse_results(
+        self, results_lists: List[List[RetrievedDocument]], limit: int
+    ) -> List[RetrievedDocument]:
+        """
+        Reciprocal rank fusion: every list adds 1 / (k + rank) to a
+        document's score, so agreement between retrievers wins without
+        comparing their raw score scales.
+        """
+        rrf_k = self.app_settings.HYBRID_SEARCH_RRF_K
+        fused_scores, documents = {}, {}
+
+        for results in results_lists:
+            for rank, document in enumerate(results, start=1):
+                key = document.chunk_id if document.chunk_id is not None else document.text
+                fused_scores[key] = fused_scores.get(key, 0.0) + 1.0 / (rrf_k + rank)
+                documents.setdefault(key, document)
+
+        ranked_keys = sorted(fused_scores, key=fused_scores.get, reverse=True)[:limit]
+        return [
+            documents[key].model_copy(update={"score": fused_scores[key]})
+            for key in ranked_keys
+        ]
+
+    # embed_query method
+    async def embed_query(self, text: str):
+        vectors = await self.embedding_client.embed_text_async(
+            text=text,
+            document_type=DocumentTypeEnums.QUERY.value,
+        )
+
+        if not vectors or len(vectors) == 0 or not vectors[0]:
+            return None
+
+        return vectors[0]
+
+    # vector_search method
+    async def vector_search(
+        self,
+        project: Project,
+        text: str,
+        limit: int = 10,
+        ef_search: int = None,
+        probes: int = None,
+        rerank_depth: int = None,
+        filters: List[dict] = None,
+        query_vector: list = None,
+    ):
+        # step1: get collection name
+        collection_name = self.create_collection_name(project_id=project.project_id)
+
+        # step2: get text embedding vector
+        if query_vector is None:
+            query_vector = await self.embed_query(text=text)
 
         if not query_vector:
             return False
@@ -101,6 +474,10 @@ class NLPController(BaseController):
             collection_name=collection_name,
             vector=query_vector,
             limit=limit,
+            ef_search=ef_search,
+            probes=probes,
+            rerank_depth=rerank_depth,
+            filters=filters,
         )
 
         if not results:
@@ -108,21 +485,218 @@ class NLPController(BaseController):
 
         return results
 
-    async def answer_rag_question(self, project: Project, query: str, limit: int = 10):
+    # search_vectordb_collection_batch method
+    async def search_vectordb_collection_batch(
+        self,
+        project: Project,
+        texts: List[str],
+        limit: int = 10,
+        ef_search: int = None,
+        probes: int = None,
+        rerank_depth: int = None,
+        filters: List[dict] = None,
+        search_mode: str = None,
+    ):
+        search_mode = search_mode if search_mode else self.app_settings.SEARCH_MODE
+        is_hybrid = (
+            search_mode == SearchModeEnums.HYBRID.value and self.lexical_client is not None
+        )
+        candidates_limit = (
+            limit * self.app_settings.HYBRID_SEARCH_CANDIDATES_FACTOR if is_hybrid else limit
+        )
 
-        answer, full_prompt, chat_history = None, None, None
+        if not is_hybrid:
+            return await self.vector_search_batch(
+                project=project,
+                texts=texts,
+                limit=candidates_limit,
+                ef_search=ef_search,
+                probes=probes,
+                rerank_depth=rerank_depth,
+                filters=filters,
+            )
+
+        vector_results, *lexical_results = await asyncio.gather(
+            self.vector_search_batch(
+                project=project,
+                texts=texts,
+                limit=candidates_limit,
+                ef_search=ef_search,
+                probes=probes,
+                rerank_depth=rerank_depth,
+                filters=filters,
+            ),
+            *[
+                self.lexical_client.search(
+                    project_id=project.project_id,
+                    text=text,
+                    limit=candidates_limit,
+                    filters=filters,
+                )
+                for text in texts
+            ],
+        )
+        if vector_results is False:
+            vector_results = [[] for _ in texts]
+
+        return [
+            self.fuse_results(
+                results_lists=[query_vector_results, query_lexical_results or []],
+                limit=limit,
+            )
+            for query_vector_results, query_lexical_results in zip(
+                vector_results, lexical_results
+            )
+        ]
+
+    # vector_search_batch method
+    async def vector_search_batch(
+        self,
+        project: Project,
+        texts: List[str],
+        limit: int = 10,
+        ef_search: int = None,
+        probes: int = None,
+        rerank_depth: int = None,
+        filters: List[dict] = None,
+    ):
+        collection_name = self.create_collection_name(project_id=project.project_id)
+
+        # one embedding call for the whole batch
+        query_vectors = await self.embedding_client.embed_text_async(
+            text=texts,
+            document_type=DocumentTypeEnums.QUERY.value,
+        )
+
+        if not query_vectors or len(query_vectors) != len(texts):
+            return False
+
+        # one vector db round-trip for the whole batch
+        results = await self.vectordb_client.search_by_vectors(
+            collection_name=collection_name,
+            vectors=query_vectors,
+            limit=limit,
+            ef_search=ef_search,
+            probes=probes,
+            rerank_depth=rerank_depth,
+            filters=filters,
+        )
+
+        if results is None or results is False:
+            return False
+
+        return results
+
+    async def answer_rag_question(
+        self,
+        project: Project,
+        query: str,
+        limit: int = 10,
+        ef_search: int = None,
+        probes: int = None,
+        rerank_depth: int = None,
+        filters: List[dict] = None,
+        search_mode: str = None,
+    ):
+
+        answer, full_prompt, chat_history, prompt_tokens = None, None, None, None
+
+        search_mode = search_mode if search_mode else self.app_settings.SEARCH_MODE
+        answer_params = self.get_answer_cache_params(
+            limit=limit,
+            ef_search=ef_search,
+            probes=probes,
+            rerank_depth=rerank_depth,
+            filters=filters,
+            search_mode=search_mode,
+        )
+
+        query_vector = None
+        if self.query_cache:
+            cached, query_vector = await self.get_cached_result(
+                kind=QueryCacheKindEnums.ANSWER.value,
+                project=project,
+                params=answer_params,
+                text=query,
+            )
+            if cached is not None:
+                return (
+                    cached["answer"],
+                    cached["full_prompt"],
+                    cached["chat_history"],
+                    cached.get("prompt_tokens"),
+                )
 
         # setp1: retrieve related documents
-        retrieved_documents = await self.search_vectordb_collection(
+        retrieved_documents = await self.retrieve_documents(
             project=project,
             text=query,
             limit=limit,
+            ef_search=ef_search,
+            probes=probes,
+            rerank_depth=rerank_depth,
+            filters=filters,
+            search_mode=search_mode,
+            query_vector=query_vector,
         )
 
         if not retrieved_documents or len(retrieved_documents) == 0:
-            return answer, full_prompt, chat_history
+            return answer, full_prompt, chat_history, prompt_tokens
 
         # step2: construct LLM prompt
+        full_prompt, chat_history, prompt_tokens = self.construct_rag_prompt(
+            query=query, retrieved_documents=retrieved_documents
+        )
+
+        # step4: Retrieve the Answer
+        answer = await self.generation_client.generate_text_async(
+            prompt=full_prompt,
+            chat_history=chat_history,
+        )
+
+        if answer and self.query_cache:
+            await self.query_cache.set(
+                kind=QueryCacheKindEnums.ANSWER.value,
+                project_id=project.project_id,
+                index_version=project.project_index_version,
+                params=answer_params,
+                text=query,
+                vector=query_vector,
+                value={
+                    "answer": answer,
+                    "full_prompt": full_prompt,
+                    "chat_history": chat_history,
+                    "results": [doc.dict() for doc in retrieved_documents],
+                    "prompt_tokens": prompt_tokens,
+                },
+            )
+
+        return answer, full_prompt, chat_history, prompt_tokens
+
+    # get_answer_cache_params method
+    def get_answer_cache_params(
+        self,
+        limit: int,
+        ef_search: int,
+        probes: int,
+        rerank_depth: int,
+        filters: List[dict],
+        search_mode: str,
+    ) -> dict:
+        return {
+            "limit": limit,
+            "ef_search": ef_search,
+            "probes": probes,
+            "rerank_depth": rerank_depth,
+            "filters": filters,
+            "search_mode": search_mode,
+            "generation_model_id": self.generation_client.generation_model_id,
+        }
+
+    # construct_rag_prompt method
+    def construct_rag_prompt(
+        self, query: str, retrieved_documents: List[RetrievedDocument]
+    ):
         system_prompt = self.template_parser.get(
             "rag",
             "system_prompt",
@@ -141,6 +715,38 @@ class NLPController(BaseController):
         #         )
         #     )
 
+        footer_prompt = self.template_parser.get(
+            "rag",
+            "footer_prompt",
+            {
+                "query": query,
+            },
+        )
+
+        token_budget = self.app_settings.GENERATION_CONTEXT_TOKEN_BUDGET
+        if self.context_packer and token_budget:
+            # the budget covers the whole prompt, documents get what is left
+            document_overhead_tokens = self.token_counter.count(
+                self.template_parser.get(
+                    "rag",
+                    "document_prompt",
+                    {"doc_num": len(retrieved_documents), "chunk_text": ""},
+                )
+            )
+            retrieved_documents, _ = self.context_packer.pack(
+                documents=retrieved_documents,
+                token_budget=token_budget
+                - self.token_counter.count(system_prompt)
+                - self.token_counter.count(footer_prompt),
+                document_overhead_tokens=document_overhead_tokens,
+            )
+            chunk_texts = [doc.text for doc in retrieved_documents]
+        else:
+            chunk_texts = [
+                self.generation_client.process_text(doc.text)
+                for doc in retrieved_documents
+            ]
+
         documents_prompts = "\n".join(
             [
                 self.template_parser.get(
@@ -148,21 +754,13 @@ class NLPController(BaseController):
                     "document_prompt",
                     {
                         "doc_num": idx + 1,
-                        "chunk_text": self.generation_client.process_text(doc.text),
+                        "chunk_text": chunk_text,
                     },
                 )
-                for idx, doc in enumerate(retrieved_documents)
+                for idx, chunk_text in enumerate(chunk_texts)
             ]
         )
 
-        footer_prompt = self.template_parser.get(
-            "rag",
-            "footer_prompt",
-            {
-                "query": query,
-            },
-        )
-
         # step3: Construct Generation Client Prompts
         chat_history = [
             self.generation_client.construct_prompt(
@@ -173,10 +771,127 @@ class NLPController(BaseController):
 
         full_prompt = "\n\n".join([documents_prompts, footer_prompt])
 
-        # step4: Retrieve the Answer
-        answer = self.generation_client.generate_text(
+        prompt_tokens = None
+        if self.token_counter:
+            prompt_tokens = self.token_counter.count(
+                system_prompt
+            ) + self.token_counter.count(full_prompt)
+
+        return full_prompt, chat_history, prompt_tokens
+
+    # stream_rag_answer method
+    async def stream_rag_answer(
+        self,
+        project: Project,
+        query: str,
+        limit: int = 10,
+        ef_search: int = None,
+        probes: int = None,
+        rerank_depth: int = None,
+        filters: List[dict] = None,
+        search_mode: str = None,
+    ):
+        """
+        Async generator of (event, data) pairs: the retrieved documents
+        first, then the answer as it is generated, then the full answer.
+        Closing the generator early closes the upstream generation stream.
+        """
+        search_mode = search_mode if search_mode else self.app_settings.SEARCH_MODE
+        answer_params = self.get_answer_cache_params(
+            limit=limit,
+            ef_search=ef_search,
+            probes=probes,
+            rerank_depth=rerank_depth,
+            filters=filters,
+            search_mode=search_mode,
+        )
+
+        query_vector = None
+        if self.query_cache:
+            cached, query_vector = await self.get_cached_result(
+                kind=QueryCacheKindEnums.ANSWER.value,
+                project=project,
+                params=answer_params,
+                text=query,
+            )
+            if cached is not None and "results" in cached:
+                yield StreamEventEnums.RETRIEVAL.value, {"results": cached["results"]}
+                yield StreamEventEnums.TOKEN.value, {"text": cached["answer"]}
+                yield StreamEventEnums.DONE.value, {
+                    "answer": cached["answer"],
+                    "prompt_tokens": cached.get("prompt_tokens"),
+                }
+                return
+
+        retrieved_documents = await self.retrieve_documents(
+            project=project,
+            text=query,
+            limit=limit,
+            ef_search=ef_search,
+            probes=probes,
+            rerank_depth=rerank_depth,
+            filters=filters,
+            search_mode=search_mode,
+            query_vector=query_vector,
+        )
+
+        if not retrieved_documents or len(retrieved_documents) == 0:
+            yield StreamEventEnums.ERROR.value, {
+                "signal": ResponseSignal.VECTORDB_SEARCH_ERROR.value
+            }
+            return
+
+        yield StreamEventEnums.RETRIEVAL.value, {
+            "results": [doc.dict() for doc in retrieved_documents]
+        }
+
+        full_prompt, chat_history, prompt_tokens = self.construct_rag_prompt(
+            query=query, retrieved_documents=retrieved_documents
+        )
+
+        answer_parts = []
+        stream = self.generation_client.generate_text_stream(
             prompt=full_prompt,
             chat_history=chat_history,
         )
+        try:
+            async for text in stream:
+                answer_parts.append(text)
+                yield StreamEventEnums.TOKEN.value, {"text": text}
+        except Exception as e:
+            self.logger.error(f"Error while streaming the answer: {e}")
+            yield StreamEventEnums.ERROR.value, {
+                "signal": ResponseSignal.RAG_ANSWER_ERROR.value
+            }
+            return
+        finally:
+            await stream.aclose()
+
+        answer = "".join(answer_parts)
+        if not answer:
+            yield StreamEventEnums.ERROR.value, {
+                "signal": ResponseSignal.RAG_ANSWER_ERROR.value
+            }
+            return
+
+        if self.query_cache:
+            await self.query_cache.set(
+                kind=QueryCacheKindEnums.ANSWER.value,
+                project_id=project.project_id,
+                index_version=project.project_index_version,
+                params=answer_params,
+                text=query,
+                vector=query_vector,
+                value={
+                    "answer": answer,
+                    "full_prompt": full_prompt,
+                    "chat_history": chat_history,
+                    "results": [doc.dict() for doc in retrieved_documents],
+                    "prompt_tokens": prompt_tokens,
+                },
+            )
 
-        return answer, full_prompt, chat_history
+        yield StreamEventEnums.DONE.value, {
+            "answer": answer,
+            "prompt_tokens": prompt_tokens,
+        }
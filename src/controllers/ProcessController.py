@@ -1,12 +1,22 @@
 from .BaseController import BaseController
 from .ProjectController import ProjectController
+from helpers.extracted_text_cache import ExtractedTextCache
 import os
 from models.enums import ProcessingEnum
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 from langchain_community.document_loaders import TextLoader
 from langchain_community.document_loaders import PyMuPDFLoader
-from typing import List
+from typing import Iterable
 from dataclasses import dataclass
+import asyncio
+import logging
+import queue
+import fitz
+
+logger = logging.getLogger("uvicorn.error")
+
+# part of the extracted text cache key, bump when page extraction changes
+PDF_LOADER_VERSION = f"pymupdf-{fitz.VersionBind}-1"
 
 
 @dataclass
@@ -15,6 +25,65 @@ class Document:
     metadata: dict
 
 
+def parse_file(
+    project_id: str,
+    file_id: str,
+    chunk_size: int,
+    overlap_size: int,
+    content_hash: str = None,
+):
+    """
+    Load and chunk one file. Module level so it can run in a worker process.
+    """
+    process_controller = ProcessController(project_id=project_id)
+
+    file_content = process_controller.get_file_pages(
+        file_id=file_id, content_hash=content_hash
+    )
+    if file_content is None:
+        return None
+
+    return process_controller.process_file_content(
+        file_content=file_content,
+        file_id=file_id,
+        chunk_size=chunk_size,
+        overlap_size=overlap_size,
+    )
+
+
+def iter_pdf_pages(file_path: str, start_page: int = 0, end_page: int = None):
+    """
+    Lazily extract pages [start_page, end_page) of a PDF, with the same
+    metadata as PyMuPDFLoader.
+    """
+    with fitz.open(file_path) as doc:
+        doc_metadata = {
+            key: value
+            for key, value in doc.metadata.items()
+            if type(value) in [str, int]
+        }
+        end_page = len(doc) if end_page is None else min(end_page, len(doc))
+
+        for page_number in range(start_page, end_page):
+            yield Document(
+                page_content=doc[page_number].get_text(),
+                metadata={
+                    "source": file_path,
+                    "file_path": file_path,
+                    "page": page_number,
+                    "total_pages": len(doc),
+                    **doc_metadata,
+                },
+            )
+
+
+def extract_pdf_pages(file_path: str, start_page: int, end_page: int):
+    """
+    Extract a page range of a PDF; each worker opens the file on its own.
+    """
+    return list(iter_pdf_pages(file_path, start_page, end_page))
+
+
 class ProcessController(BaseController):
 
     def __init__(self, project_id: str):
@@ -23,18 +92,26 @@ class ProcessController(BaseController):
         self.project_id = project_id
         self.project_path = ProjectController().get_project_path(project_id=project_id)
 
+        self.text_cache = None
+        if self.app_settings.PROCESSING_EXTRACTED_TEXT_CACHE:
+            self.text_cache = ExtractedTextCache()
+
     # get_file_extension
     def get_file_extension(self, file_id: str):
         return os.path.splitext(file_id)[-1]
 
+    # get_file_path
+    def get_file_path(self, file_id: str):
+        return os.path.join(
+            self.project_path,
+            file_id,
+        )
+
     # get_file_loader
     def get_file_loader(self, file_id: str):
 
         file_ext = self.get_file_extension(file_id=file_id)
-        file_path = os.path.join(
-            self.project_path,
-            file_id,
-        )
+        file_path = self.get_file_path(file_id=file_id)
 
         if not os.path.exists(file_path):
             return None
@@ -56,52 +133,382 @@ class ProcessController(BaseController):
 
         return None
 
+    # get_file_pages
+    def get_file_pages(self, file_id: str, content_hash: str = None):
+        file_ext = self.get_file_extension(file_id=file_id)
+        file_path = self.get_file_path(file_id=file_id)
+
+        if not os.path.exists(file_path):
+            return None
+
+        if file_ext == ProcessingEnum.TXT.value:
+            return TextLoader(file_path, encoding="utf-8").lazy_load()
+
+        # PyMuPDFLoader extracts every page before returning the first one
+        if file_ext == ProcessingEnum.PDF.value:
+            return self.get_pdf_pages(file_path=file_path, content_hash=content_hash)
+
+        return None
+
+    # get_pdf_pages
+    def get_pdf_pages(self, file_path: str, content_hash: str = None):
+        if self.text_cache:
+            cached_pages = self.text_cache.read_pages(
+                file_path, PDF_LOADER_VERSION, content_hash
+            )
+            if cached_pages is not None:
+                return (Document(**page) for page in cached_pages)
+
+        return self.cache_pdf_pages(
+            file_path=file_path,
+            pages=iter_pdf_pages(file_path),
+            content_hash=content_hash,
+        )
+
+    # cache_pdf_pages
+    def cache_pdf_pages(self, file_path: str, pages: Iterable, content_hash: str = None):
+        if not self.text_cache:
+            return pages
+
+        cached_pages = self.text_cache.write_pages(
+            file_path,
+            PDF_LOADER_VERSION,
+            (
+                {"page_content": page.page_content, "metadata": page.metadata}
+                for page in pages
+            ),
+            content_hash,
+        )
+        return (Document(**page) for page in cached_pages)
+
+    # get_file_hash
+    def get_file_hash(self, file_id: str):
+        file_path = self.get_file_path(file_id=file_id)
+        if not os.path.exists(file_path):
+            return None
+
+        return ExtractedTextCache.get_file_hash(file_path)
+
+    # get_files_hashes
+    async def get_files_hashes(self, project_file_ids: dict):
+        file_hashes = await asyncio.gather(
+            *[
+                asyncio.to_thread(self.get_file_hash, file_id)
+                for file_id in project_file_ids.values()
+            ]
+        )
+        return dict(zip(project_file_ids.keys(), file_hashes))
+
+    # is_asset_changed
+    def is_asset_changed(self, asset, content_hash: str, chunker_config: dict):
+        # missing files stay in, to be reported as failed
+        return (
+            asset.asset_processed_at is None
+            or content_hash is None
+            or asset.asset_content_hash != content_hash
+            or asset.asset_chunker_config != chunker_config
+        )
+
+    # get_pdf_page_ranges
+    def get_pdf_page_ranges(
+        self, file_id: str, pages_per_task: int, content_hash: str = None
+    ):
+        file_path = self.get_file_path(file_id=file_id)
+
+        if (
+            self.get_file_extension(file_id=file_id) != ProcessingEnum.PDF.value
+            or not os.path.exists(file_path)
+        ):
+            return None
+
+        # opening only reads the page tree, not the page contents
+        with fitz.open(file_path) as doc:
+            page_count = doc.page_count
+
+        if page_count <= pages_per_task:
+            return None
+
+        # reading the cached text back is faster than extracting in parallel
+        if self.text_cache and self.text_cache.is_valid(
+            file_path, PDF_LOADER_VERSION, content_hash
+        ):
+            return None
+
+        return [
+            (start_page, min(start_page + pages_per_task, page_count))
+            for start_page in range(0, page_count, pages_per_task)
+        ]
+
     # process_file_content
     def process_file_content(
         self,
-        file_content: list,
+        file_content: Iterable,
         file_id: str,
         chunk_size: int = 100,
         overlap_size: int = 20,
     ):
 
-        file_content_texts = [rec.page_content for rec in file_content]
-        file_content_metadata = [rec.metadata for rec in file_content]
-
         # chunks = text_splitter.create_documents(
         #    file_content_texts,
         #    metadatas=file_content_metadata,
         # )
-        chunks = self.process_simpler_splitter(
-            texts=file_content_texts,
-            metadatas=file_content_metadata,
-            chunk_size=chunk_size,
+        chunks = list(
+            self.iter_text_chunks(
+                pages=file_content,
+                chunk_size=chunk_size,
+                overlap_size=overlap_size,
+            )
         )
         return chunks
 
-    def process_simpler_splitter(
+    # iter_text_chunks
+    def iter_text_chunks(
         self,
-        texts: List[str],
-        metadatas: List[dict],
+        pages: Iterable,
         chunk_size: int,
+        overlap_size: int = 0,
         splitter_tag: str = "\n",
     ):
-        full_text = " ".join(texts)
+        """
+        Split pages into chunks of whole lines, at least `chunk_size`
+        characters each, starting every chunk with the last `overlap_size`
+        characters of the previous one.
+
+        Pages are consumed one at a time and chunks yielded as they fill, so
+        memory is bounded by the page and chunk size, not the document.
+        """
+        overlap_size = max(0, min(overlap_size or 0, chunk_size - 1))
+
+        # (piece, page, offset) of the current chunk, joined once it is full
+        buffer = []
+        buffer_size = 0
+        has_new_text = False
+
+        for page in pages:
+            page_number = page.metadata.get("page")
+            position = 0
+
+            for line in page.page_content.split(splitter_tag):
+                line_offset = position + len(line) - len(line.lstrip())
+                position += len(line) + len(splitter_tag)
+
+                line = line.strip()
+                if len(line) <= 1:
+                    continue
+
+                buffer.append((line + splitter_tag, page_number, line_offset))
+                buffer_size += len(line) + len(splitter_tag)
+                has_new_text = True
+
+                if buffer_size >= chunk_size:
+                    yield self.build_chunk(buffer=buffer)
+                    buffer = self.get_overlap_pieces(
+                        buffer=buffer,
+                        overlap_size=overlap_size,
+                        splitter_tag=splitter_tag,
+                    )
+                    buffer_size = sum(len(piece) for piece, _, _ in buffer)
+                    has_new_text = False
+
+        # a remainder that is only overlap is already in the previous chunk
+        if has_new_text:
+            yield self.build_chunk(buffer=buffer)
+
+    # get_overlap_pieces
+    def get_overlap_pieces(self, buffer: list, overlap_size: int, splitter_tag: str):
+        overlap = []
+        remaining = overlap_size
+
+        for index, (piece, page, offset) in enumerate(reversed(buffer)):
+            if remaining <= 0:
+                break
+
+            # the chunk's trailing splitter_tag is stripped, it does not overlap
+            available = len(piece) - (len(splitter_tag) if index == 0 else 0)
+            if available > remaining:
+                trimmed = piece[available - remaining :].lstrip()
+                offset += len(piece) - len(trimmed)
+                piece = trimmed
+                remaining = 0
+            else:
+                remaining -= available
+
+            if piece.strip():
+                overlap.append((piece, page, offset))
+
+        overlap.reverse()
+        return overlap
+
+    # build_chunk
+    def build_chunk(self, buffer: list):
+        _, page, offset = buffer[0]
+        return Document(
+            page_content="".join(piece for piece, _, _ in buffer).strip(),
+            metadata=self.get_chunk_metadata(page=page, offset=offset),
+        )
 
-        # split by splitter_tag
-        lines = [
-            doc.strip() for doc in full_text.split(splitter_tag) if len(doc.strip()) > 1
+    # get_chunk_metadata
+    def get_chunk_metadata(self, page: int = None, offset: int = None):
+        # where the chunk starts: the page for paged sources, and the
+        # character offset within that page's text
+        metadata = {"offset": offset}
+        if page is not None:
+            metadata["page"] = page
+        return metadata
+
+    # parse_pdf_pages_async
+    async def parse_pdf_pages_async(
+        self,
+        file_id: str,
+        page_ranges: list,
+        chunk_size: int,
+        overlap_size: int,
+        processing_pool,
+        content_hash: str = None,
+    ):
+        file_path = self.get_file_path(file_id=file_id)
+
+        # the ranges are extracted on separate workers and chunked here in
+        # page order as they arrive, so pages cross processes only once and
+        # each range is dropped as soon as it is chunked
+        range_tasks = [
+            asyncio.ensure_future(
+                processing_pool.run(extract_pdf_pages, file_path, start_page, end_page)
+            )
+            for start_page, end_page in page_ranges
         ]
-        chunks = []
-        current_chunk = ""
+        ranges_queue = queue.Queue()
+        chunking = asyncio.ensure_future(
+            asyncio.to_thread(
+                self.process_file_content,
+                self.cache_pdf_pages(
+                    file_path=file_path,
+                    pages=self.iter_queued_pages(ranges_queue=ranges_queue),
+                    content_hash=content_hash,
+                ),
+                file_id,
+                chunk_size,
+                overlap_size,
+            )
+        )
 
-        for line in lines:
-            current_chunk += line + splitter_tag
-            if len(current_chunk) >= chunk_size:
-                chunks.append(Document(page_content=current_chunk.strip(), metadata={}))
-                current_chunk = ""
+        try:
+            for range_task in range_tasks:
+                ranges_queue.put(await range_task)
+        except BaseException:
+            # stops the chunker without caching the partial pages
+            ranges_queue.put(RuntimeError(f"Page extraction failed: {file_id}"))
+            for range_task in range_tasks:
+                range_task.cancel()
+            chunking.add_done_callback(lambda task: task.exception())
+            raise
 
-        if len(current_chunk) >= 0:
-            chunks.append(Document(page_content=current_chunk.strip(), metadata={}))
+        ranges_queue.put(None)
+        return await chunking
 
-        return chunks
+    # iter_queued_pages
+    def iter_queued_pages(self, ranges_queue: queue.Queue):
+        while True:
+            range_content = ranges_queue.get()
+            if range_content is None:
+                return
+            if isinstance(range_content, Exception):
+                raise range_content
+            yield from range_content
+
+    # parse_file_async
+    async def parse_file_async(
+        self,
+        asset_id: int,
+        file_id: str,
+        chunk_size: int,
+        overlap_size: int,
+        processing_pool=None,
+        pdf_pages_per_task: int = None,
+        content_hash: str = None,
+    ):
+        try:
+            page_ranges = None
+            if processing_pool and pdf_pages_per_task:
+                page_ranges = await asyncio.to_thread(
+                    self.get_pdf_page_ranges, file_id, pdf_pages_per_task, content_hash
+                )
+
+            if page_ranges:
+                file_chunks = await self.parse_pdf_pages_async(
+                    file_id=file_id,
+                    page_ranges=page_ranges,
+                    chunk_size=chunk_size,
+                    overlap_size=overlap_size,
+                    processing_pool=processing_pool,
+                    content_hash=content_hash,
+                )
+            elif processing_pool:
+                file_chunks = await processing_pool.run(
+                    parse_file,
+                    self.project_id,
+                    file_id,
+                    chunk_size,
+                    overlap_size,
+                    content_hash,
+                )
+            else:
+                file_chunks = await asyncio.to_thread(
+                    parse_file,
+                    self.project_id,
+                    file_id,
+                    chunk_size,
+                    overlap_size,
+                    content_hash,
+                )
+        except asyncio.TimeoutError:
+            logger.error(f"Timed out while processing file: {file_id}")
+            file_chunks = None
+        except Exception as e:
+            logger.error(f"Exception while processing file: {file_id}: {e}")
+            file_chunks = None
+
+        return asset_id, file_id, file_chunks
+
+    # process_files
+    async def process_files(
+        self,
+        project_file_ids: dict,
+        chunk_size: int = 100,
+        overlap_size: int = 20,
+        processing_pool=None,
+        pdf_pages_per_task: int = None,
+        file_hashes: dict = None,
+    ):
+        """
+        Parse and chunk the given {asset_id: file_id} files concurrently,
+        yielding (asset_id, file_id, chunks) as each file finishes; chunks
+        is None when the file could not be processed.
+
+        With a pool and `pdf_pages_per_task`, larger PDFs are also split
+        into page ranges extracted on separate workers. `file_hashes`
+        ({asset_id: content hash}) spares the extracted text cache from
+        hashing the files again.
+        """
+        file_hashes = file_hashes or {}
+        tasks = [
+            asyncio.create_task(
+                self.parse_file_async(
+                    asset_id=asset_id,
+                    file_id=file_id,
+                    chunk_size=chunk_size,
+                    overlap_size=overlap_size,
+                    processing_pool=processing_pool,
+                    pdf_pages_per_task=pdf_pages_per_task,
+                    content_hash=file_hashes.get(asset_id),
+                )
+            )
+            for asset_id, file_id in project_file_ids.items()
+        ]
+
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
@@ -1,7 +1,7 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 import os
 from dotenv import load_dotenv
-from typing import List
+from typing import List, Optional
 
 load_dotenv()
 
@@ -15,12 +15,25 @@ class Settings(BaseSettings):
     FILE_MAX_SIZE: int
     FILE_DEFAULT_CHUNK_SIZE: int
 
+    PROCESSING_WORKERS: Optional[int] = None
+    PROCESSING_MAX_IN_FLIGHT: int = 2
+    PROCESSING_FILE_TIMEOUT_SECONDS: Optional[float] = None
+    PROCESSING_PDF_PAGES_PER_TASK: Optional[int] = None
+    PROCESSING_EXTRACTED_TEXT_CACHE: bool = True
+
     POSTGRES_USERNAME: str
     POSTGRES_PASSWORD: str
     POSTGRES_HOST: str
     POSTGRES_PORT: int
     POSTGRES_MAIN_DATABASE: str
 
+    CHUNKS_PAGE_SIZE: int = 50
+    CHUNKS_INSERT_BATCH_SIZE: int = 1000
+
+    INDEXING_EMBEDDING_WORKERS: int = 4
+    INDEXING_WRITER_WORKERS: int = 1
+    INDEXING_QUEUE_SIZE: int = 8
+
     GENERATION_BACKEND: str
     EMBEDDING_BACKEND: str
 
@@ -34,12 +47,83 @@ class Settings(BaseSettings):
     INPUT_DEFAULT_MAX_CHARACTERS: int = None
     GENERATION_DEFAULT_MAX_TOKENS: int = None
     GENERATION_DEFAULT_TEMPERATURE: float = None
+    GENERATION_CONTEXT_TOKEN_BUDGET: Optional[int] = None
+    GENERATION_CONTEXT_DUPLICATE_THRESHOLD: float = 0.9
+    GENERATION_CONTEXT_MERGE_ADJACENT: bool = True
+    GENERATION_TOKENIZER_ENCODING: str = "cl100k_base"
+
+    EMBEDDING_CACHE_BACKEND: str = None
+    EMBEDDING_CACHE_PATH: str = "embedding_cache"
+    EMBEDDING_CACHE_MEMORY_MAX_MB: int = 64
+    EMBEDDING_BATCH_WINDOW_MS: Optional[float] = None
+    EMBEDDING_BATCH_MAX_SIZE: int = 64
+
+    LLM_HTTP_TIMEOUT: float = 60.0
+    LLM_HTTP_CONNECT_TIMEOUT: float = 10.0
+    LLM_HTTP_MAX_CONNECTIONS: int = 100
+    LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    LLM_HTTP_KEEPALIVE_EXPIRY: float = 30.0
 
     VECTOR_DB_BACKEND_LITERAL: List[str] = None
     VECTOR_DB_BACKEND: str
     VECTOR_DB_PATH: str
     VECTOR_DB_DISTANCE_METHOD: str = None
+    VECTOR_DB_QDRANT_URL: Optional[str] = None
+    VECTOR_DB_QDRANT_API_KEY: Optional[str] = None
+    VECTOR_DB_QDRANT_PREFER_GRPC: bool = False
+    VECTOR_DB_QDRANT_TIMEOUT: Optional[int] = None
+    VECTOR_DB_QDRANT_UPLOAD_BATCH_SIZE: int = 64
+    VECTOR_DB_QDRANT_UPLOAD_PARALLEL: int = 1
+    VECTOR_DB_QDRANT_QUANTIZATION: Optional[str] = None
+    VECTOR_DB_QDRANT_QUANTIZATION_ALWAYS_RAM: bool = True
+    VECTOR_DB_QDRANT_SCALAR_QUANTILE: Optional[float] = None
+    VECTOR_DB_QDRANT_ON_DISK_VECTORS: bool = False
+    VECTOR_DB_QDRANT_ON_DISK_PAYLOAD: bool = False
+    VECTOR_DB_QDRANT_HNSW_M: Optional[int] = None
+    VECTOR_DB_QDRANT_HNSW_EF_CONSTRUCT: Optional[int] = None
+    VECTOR_DB_QDRANT_SEARCH_HNSW_EF: Optional[int] = None
+    VECTOR_DB_QDRANT_SEARCH_OVERSAMPLING: Optional[float] = None
+    VECTOR_DB_QDRANT_SEARCH_RESCORE: bool = True
     VECTOR_DB_PGVEC_INDEX_THRESHOLD: int= 100
+    VECTOR_DB_PGVEC_INSERT_MODE: str = "copy"
+    VECTOR_DB_PGVEC_INDEX_TYPE: str = "hnsw"
+    VECTOR_DB_PGVEC_HNSW_M: int = 16
+    VECTOR_DB_PGVEC_HNSW_EF_CONSTRUCTION: int = 64
+    VECTOR_DB_PGVEC_IVFFLAT_LISTS: Optional[int] = None
+    VECTOR_DB_PGVEC_MAINTENANCE_WORK_MEM: Optional[str] = None
+    VECTOR_DB_PGVEC_MAX_PARALLEL_MAINTENANCE_WORKERS: Optional[int] = None
+    VECTOR_DB_PGVEC_INDEX_CONCURRENTLY: bool = False
+    VECTOR_DB_PGVEC_ITERATIVE_SCAN: str = "relaxed_order"
+    VECTOR_DB_PGVEC_HNSW_MAX_SCAN_TUPLES: Optional[int] = None
+    VECTOR_DB_PGVEC_IVFFLAT_MAX_PROBES: Optional[int] = None
+    VECTOR_DB_PGVEC_LAYOUT: str = "table_per_collection"
+    VECTOR_DB_PGVEC_PARTITION_METHOD: str = "list"
+    VECTOR_DB_PGVEC_PARTITION_COUNT: int = 16
+    VECTOR_DB_PGVEC_COLLECTIONS_CACHE_TTL: int = 30
+    VECTOR_DB_NUMPY_SEARCH_BLOCK_SIZE: int = 65536
+    VECTOR_DB_IVFPQ_NLIST: Optional[int] = None
+    VECTOR_DB_IVFPQ_M: int = 96
+    VECTOR_DB_IVFPQ_NPROBE: int = 8
+    VECTOR_DB_IVFPQ_RERANK_DEPTH: int = 100
+    VECTOR_DB_IVFPQ_MIN_TRAIN_SIZE: int = 10000
+    VECTOR_DB_IVFPQ_TRAIN_SAMPLE_SIZE: int = 100000
+    VECTOR_DB_IVFPQ_KMEANS_ITERATIONS: int = 20
+
+    SEARCH_MODE: str = "vector"
+    LEXICAL_SEARCH_BACKEND: Optional[str] = None
+    LEXICAL_SEARCH_LANGUAGES: List[str] = ["english", "arabic"]
+    LEXICAL_BM25_K1: float = 1.2
+    LEXICAL_BM25_B: float = 0.75
+    LEXICAL_BM25_MAX_CACHED_PROJECTS: int = 16
+    HYBRID_SEARCH_RRF_K: int = 60
+    HYBRID_SEARCH_CANDIDATES_FACTOR: int = 4
+    SEARCH_BATCH_MAX_QUERIES: int = 64
+
+    QUERY_CACHE_BACKEND: Optional[str] = None
+    QUERY_CACHE_MAX_ENTRIES: int = 10000
+    QUERY_CACHE_TTL_SECONDS: int = 3600
+    QUERY_CACHE_SIMILARITY_THRESHOLD: Optional[float] = None
+    QUERY_CACHE_MAX_SEMANTIC_CANDIDATES: int = 1000
 
     DEFAULT_LANG: str = "en"
     PRIMARY_LANG: str = "en"
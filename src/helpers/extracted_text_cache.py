@@ -0,0 +1,185 @@
+from typing import Iterable, Iterator
+import hashlib
+import logging
+import struct
+import json
+import mmap
+import zlib
+import os
+
+logger = logging.getLogger("uvicorn.error")
+
+CACHE_MAGIC = b"MRAGPGS1"
+# index offset, index length, magic
+CACHE_TRAILER = struct.Struct("<QQ8s")
+
+
+class ExtractedTextCache:
+    """
+    Extracted page text of source files, so re-chunking a file that did not
+    change skips re-parsing it.
+
+    Each file's pages are stored in a `<cache_dir>/<file name>.pages` file
+    next to it: the zlib compressed pages one after another, then an index
+    of their offsets together with the key they were extracted under (the
+    file's content hash and the loader version), then a fixed size trailer
+    pointing at the index. Reads mmap the cache file and decompress one page
+    at a time.
+    """
+
+    def __init__(self, cache_dir: str = ".extracted", compression_level: int = 6):
+        self.cache_dir = cache_dir
+        self.compression_level = compression_level
+
+    # get_cache_path method
+    def get_cache_path(self, file_path: str) -> str:
+        directory, file_name = os.path.split(file_path)
+        return os.path.join(directory, self.cache_dir, f"{file_name}.pages")
+
+    # get_file_hash method
+    @staticmethod
+    def get_file_hash(file_path: str, block_size: int = 1 << 20) -> str:
+        file_hash = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(block_size), b""):
+                file_hash.update(block)
+        return file_hash.hexdigest()
+
+    # get_key method
+    def get_key(self, file_path: str, loader_version: str, content_hash: str = None) -> dict:
+        # callers that already hashed the file pass it in, saving a re-read
+        return {
+            "content_hash": content_hash or self.get_file_hash(file_path),
+            "loader_version": loader_version,
+        }
+
+    # read_index method
+    def read_index(self, cache_file: mmap.mmap) -> dict:
+        if len(cache_file) < CACHE_TRAILER.size:
+            return None
+
+        index_offset, index_length, magic = CACHE_TRAILER.unpack_from(
+            cache_file, len(cache_file) - CACHE_TRAILER.size
+        )
+        if magic != CACHE_MAGIC:
+            return None
+
+        return json.loads(
+            zlib.decompress(cache_file[index_offset : index_offset + index_length])
+        )
+
+    # open_cache method
+    def open_cache(self, file_path: str, loader_version: str, content_hash: str = None):
+        cache_path = self.get_cache_path(file_path)
+        if not os.path.exists(cache_path):
+            return None
+
+        try:
+            with open(cache_path, "rb") as f:
+                cache_file = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            index = self.read_index(cache_file)
+        except (OSError, ValueError, zlib.error) as e:
+            logger.warning(f"Ignoring unreadable extracted text cache {cache_path}: {e}")
+            return None
+
+        if index is None or index["key"] != self.get_key(
+            file_path, loader_version, content_hash
+        ):
+            cache_file.close()
+            return None
+
+        return cache_file, index
+
+    # is_valid method
+    def is_valid(
+        self, file_path: str, loader_version: str, content_hash: str = None
+    ) -> bool:
+        cache = self.open_cache(file_path, loader_version, content_hash)
+        if cache is None:
+            return False
+
+        cache[0].close()
+        return True
+
+    # read_pages method
+    def read_pages(
+        self, file_path: str, loader_version: str, content_hash: str = None
+    ) -> Iterator[dict]:
+        """
+        The cached {"page_content", "metadata"} pages of the file, or None
+        when there are none for its current content and loader version.
+        """
+        cache = self.open_cache(file_path, loader_version, content_hash)
+        if cache is None:
+            return None
+
+        cache_file, index = cache
+        return self.iter_pages(cache_file, index["pages"])
+
+    # iter_pages method
+    def iter_pages(self, cache_file: mmap.mmap, pages: list) -> Iterator[dict]:
+        try:
+            for page_offset, page_length in pages:
+                yield json.loads(
+                    zlib.decompress(cache_file[page_offset : page_offset + page_length])
+                )
+        finally:
+            cache_file.close()
+
+    # write_pages method
+    def write_pages(
+        self,
+        file_path: str,
+        loader_version: str,
+        pages: Iterable[dict],
+        content_hash: str = None,
+    ) -> Iterator[dict]:
+        """
+        Pass the extracted pages through while caching them. The cache file
+        is only put in place once every page has been consumed.
+        """
+        key = self.get_key(file_path, loader_version, content_hash)
+        cache_path = self.get_cache_path(file_path)
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+
+        # a cache that can not be written only costs the next run a re-parse
+        f = None
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            f = open(temp_path, "wb")
+        except OSError as e:
+            logger.warning(f"Not caching extracted text of {file_path}: {e}")
+
+        try:
+            page_offsets = []
+            for page in pages:
+                if f is not None:
+                    try:
+                        page_data = zlib.compress(
+                            json.dumps(page, ensure_ascii=False).encode("utf-8"),
+                            self.compression_level,
+                        )
+                        page_offsets.append((f.tell(), len(page_data)))
+                        f.write(page_data)
+                    except (OSError, TypeError, ValueError) as e:
+                        logger.warning(f"Not caching extracted text of {file_path}: {e}")
+                        f.close()
+                        f = None
+                yield page
+
+            if f is not None:
+                index_data = zlib.compress(
+                    json.dumps({"key": key, "pages": page_offsets}).encode("utf-8"),
+                    self.compression_level,
+                )
+                index_offset = f.tell()
+                f.write(index_data)
+                f.write(CACHE_TRAILER.pack(index_offset, len(index_data), CACHE_MAGIC))
+                f.close()
+                f = None
+                os.replace(temp_path, cache_path)
+        finally:
+            if f is not None:
+                f.close()
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
@@ -0,0 +1,36 @@
+from stores.vectordb.VectorDBEnums import FilterOperatorEnums
+from typing import List
+
+
+def matches_metadata_filters(metadata: dict, filters: List[dict]) -> bool:
+    """
+    Evaluate backend-neutral search filters (AND of conditions) against one
+    record's metadata, for the backends that filter in Python.
+    """
+    metadata = metadata or {}
+    for condition in filters:
+        operator = condition.get("operator") or FilterOperatorEnums.EQ.value
+        value = condition.get("value")
+        field_value = metadata.get(condition["field"])
+
+        if operator == FilterOperatorEnums.EQ.value:
+            is_matched = field_value == value
+        elif operator == FilterOperatorEnums.NE.value:
+            is_matched = field_value != value
+        elif operator == FilterOperatorEnums.IN.value:
+            is_matched = field_value in value
+        else:
+            try:
+                is_matched = field_value is not None and {
+                    FilterOperatorEnums.GT.value: lambda: field_value > value,
+                    FilterOperatorEnums.GTE.value: lambda: field_value >= value,
+                    FilterOperatorEnums.LT.value: lambda: field_value < value,
+                    FilterOperatorEnums.LTE.value: lambda: field_value <= value,
+                }[operator]()
+            except TypeError:
+                is_matched = False
+
+        if not is_matched:
+            return False
+
+    return True
@@ -0,0 +1,70 @@
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import asyncio
+import logging
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class ProcessingPool:
+    """
+    Process pool for CPU-bound document parsing, off the event loop.
+
+    `run` bounds the work submitted at once with `max_in_flight` and each
+    call with `timeout`, counted from submission, so `max_in_flight` should
+    not exceed `max_workers` by much. A worker stuck past its timeout can not be
+    cancelled, so the pool is torn down and replaced; calls that were
+    running on it fail over to the new pool once.
+    """
+
+    def __init__(self, max_workers: int = 2, max_in_flight: int = 4, timeout: float = None):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.semaphore = asyncio.Semaphore(max_in_flight)
+        # spawned workers do not inherit the parent's event loop, db pools or locks
+        self.mp_context = multiprocessing.get_context("spawn")
+        self.executor = self.create_executor()
+
+    def create_executor(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=self.max_workers, mp_context=self.mp_context)
+
+    def restart(self, executor: ProcessPoolExecutor):
+        # another call may have restarted the pool already
+        if executor is not self.executor:
+            return
+
+        # killing a worker breaks the pool, failing its queued calls with
+        # BrokenProcessPool so they are retried on the new one
+        processes = list((getattr(executor, "_processes", None) or {}).values())
+        for process in processes:
+            if process.is_alive():
+                process.kill()
+        executor.shutdown(wait=False)
+
+        self.executor = self.create_executor()
+
+    async def run(self, fn, *args, timeout: float = None):
+        timeout = timeout if timeout else self.timeout
+        loop = asyncio.get_running_loop()
+
+        async with self.semaphore:
+            for attempt in range(2):
+                executor = self.executor
+                future = loop.run_in_executor(executor, fn, *args)
+                try:
+                    return await asyncio.wait_for(future, timeout=timeout)
+                except asyncio.TimeoutError:
+                    logger.error(
+                        f"Processing task timed out after {timeout}s, restarting the pool"
+                    )
+                    self.restart(executor)
+                    raise
+                except BrokenProcessPool:
+                    if attempt == 1:
+                        raise
+                    logger.warning("Processing pool was restarted, retrying task")
+                    self.restart(executor)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -4,6 +4,14 @@ from helpers.config import get_settings
 from stores.llm.LLMProviderFactory import LLMProviderFactory
 from stores.vectordb.VectorDBProviderFactory import VectorDBProviderFactory
 from stores.llm.templates.template_parser import TemplateParser
+from stores.llm.cache.EmbeddingCacheFactory import EmbeddingCacheFactory
+from stores.llm.cache.CachedEmbeddingClient import CachedEmbeddingClient
+from stores.llm.batching.BatchingEmbeddingClient import BatchingEmbeddingClient
+from stores.lexical.LexicalSearchFactory import LexicalSearchFactory
+from stores.llm.context.TokenCounter import TokenCounter
+from stores.querycache.QueryCacheFactory import QueryCacheFactory
+from stores.querycache.QueryResultCache import QueryResultCache
+from helpers.processing_pool import ProcessingPool
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 
@@ -40,12 +48,73 @@ async def startup_span():
         embedding_size=settings.EMBEDDING_MODEL_SIZE,
     )
 
+    # embedding micro-batching, behind the cache so only misses are batched
+    app.embedding_batcher = None
+    if settings.EMBEDDING_BATCH_WINDOW_MS:
+        app.embedding_batcher = BatchingEmbeddingClient(
+            embedding_client=app.embedding_client,
+            window_ms=settings.EMBEDDING_BATCH_WINDOW_MS,
+            max_batch_size=settings.EMBEDDING_BATCH_MAX_SIZE,
+        )
+        app.embedding_client = app.embedding_batcher
+
+    # embedding cache
+    if settings.EMBEDDING_CACHE_BACKEND:
+        embedding_cache_factory = EmbeddingCacheFactory(
+            config=settings, db_client=app.db_client
+        )
+        app.embedding_client = CachedEmbeddingClient(
+            embedding_client=app.embedding_client,
+            provider=settings.EMBEDDING_BACKEND,
+            cache_backend=embedding_cache_factory.create(
+                backend=settings.EMBEDDING_CACHE_BACKEND
+            ),
+            memory_max_size_bytes=settings.EMBEDDING_CACHE_MEMORY_MAX_MB * 1048576,
+        )
+        await app.embedding_client.connect()
+
     # vector db client
     app.vectordb_client = vectordb_provider_factory.create(
         provider=settings.VECTOR_DB_BACKEND
     )
     await app.vectordb_client.connect()
 
+    # lexical search client
+    app.lexical_client = LexicalSearchFactory(
+        config=settings, db_client=app.db_client
+    ).create(backend=settings.LEXICAL_SEARCH_BACKEND)
+    await app.lexical_client.connect()
+
+    # query result cache
+    app.query_cache = None
+    if settings.QUERY_CACHE_BACKEND:
+        query_cache_factory = QueryCacheFactory(config=settings, db_client=app.db_client)
+        app.query_cache = QueryResultCache(
+            cache_backend=query_cache_factory.create(
+                backend=settings.QUERY_CACHE_BACKEND
+            ),
+            max_entries=settings.QUERY_CACHE_MAX_ENTRIES,
+            ttl_seconds=settings.QUERY_CACHE_TTL_SECONDS,
+            similarity_threshold=settings.QUERY_CACHE_SIMILARITY_THRESHOLD,
+            max_semantic_candidates=settings.QUERY_CACHE_MAX_SEMANTIC_CANDIDATES,
+        )
+        await app.query_cache.connect()
+
+    # prompt token counting for the RAG context budget
+    app.token_counter = TokenCounter(
+        model_id=settings.GENERATION_MODEL_ID,
+        encoding_name=settings.GENERATION_TOKENIZER_ENCODING,
+    )
+
+    # document parsing pool
+    app.processing_pool = None
+    if settings.PROCESSING_WORKERS:
+        app.processing_pool = ProcessingPool(
+            max_workers=settings.PROCESSING_WORKERS,
+            max_in_flight=settings.PROCESSING_MAX_IN_FLIGHT,
+            timeout=settings.PROCESSING_FILE_TIMEOUT_SECONDS,
+        )
+
     app.template_parser = TemplateParser(
         language=settings.PRIMARY_LANG,
         default_language=settings.DEFAULT_LANG,
@@ -55,6 +124,13 @@ async def startup_span():
 async def shutdown_span():
     app.db_engine.dispose()
     await app.vectordb_client.disconnect()
+    await app.lexical_client.disconnect()
+    if app.query_cache:
+        await app.query_cache.disconnect()
+    if app.processing_pool:
+        app.processing_pool.shutdown()
+    await app.generation_client.close()
+    await app.embedding_client.close()
 
 
 app.on_event("startup")(startup_span)
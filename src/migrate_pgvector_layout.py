@@ -0,0 +1,72 @@
+"""
+Move pgvector collections from the table-per-collection layout into the
+shared partitioned layout.
+
+Usage (from the src directory, with VECTOR_DB_PGVEC_LAYOUT=partitioned):
+
+    $ python migrate_pgvector_layout.py
+    $ python migrate_pgvector_layout.py --collection collection_1536_3
+"""
+
+import argparse
+import asyncio
+import logging
+from helpers.config import get_settings
+from stores.vectordb.VectorDBProviderFactory import VectorDBProviderFactory
+from stores.vectordb.VectorDBEnums import VectorDBEnums, PgVectorLayoutEnums
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("uvicorn")
+
+
+async def migrate(collection_names=None):
+    settings = get_settings()
+
+    if (
+        settings.VECTOR_DB_BACKEND != VectorDBEnums.PGVECTOR.value
+        or settings.VECTOR_DB_PGVEC_LAYOUT != PgVectorLayoutEnums.PARTITIONED.value
+    ):
+        logger.error(
+            "Set VECTOR_DB_BACKEND=PGVECTOR and VECTOR_DB_PGVEC_LAYOUT=partitioned to migrate"
+        )
+        return
+
+    postgres_conn = f"postgresql+asyncpg://{settings.POSTGRES_USERNAME}:{settings.POSTGRES_PASSWORD}@{settings.POSTGRES_HOST}:{settings.POSTGRES_PORT}/{settings.POSTGRES_MAIN_DATABASE}"
+    db_engine = create_async_engine(postgres_conn)
+    db_client = sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+
+    vectordb_client = VectorDBProviderFactory(config=settings, db_client=db_client).create(
+        provider=settings.VECTOR_DB_BACKEND
+    )
+    await vectordb_client.connect()
+
+    try:
+        if not collection_names:
+            collection_names = await vectordb_client.list_legacy_collections()
+
+        for collection_name in collection_names:
+            moved_count = await vectordb_client.migrate_collection(
+                collection_name=collection_name
+            )
+            if moved_count is None:
+                logger.error(f"Skipped collection: {collection_name}")
+    finally:
+        await vectordb_client.disconnect()
+        await db_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Migrate pgvector collections to the partitioned layout"
+    )
+    parser.add_argument(
+        "--collection",
+        action="append",
+        dest="collections",
+        help="collection to migrate (repeatable), defaults to all legacy collections",
+    )
+    args = parser.parse_args()
+
+    asyncio.run(migrate(collection_names=args.collections))
@@ -3,6 +3,10 @@ from .db_schemes import Asset, Project
 from .enums.DataBaseEnum import DataBaseEnum
 from bson import ObjectId
 from sqlalchemy.future import select
+from sqlalchemy import func, or_, update, any_, literal, Integer
+from sqlalchemy.dialects.postgresql import ARRAY
+from typing import List
+from datetime import datetime
 
 
 class AssetModel(BaseDataModel):
@@ -45,3 +49,86 @@ class AssetModel(BaseDataModel):
             record = result.scalar_one_or_none()
 
             return record
+
+    async def update_asset_processing_state(
+        self, asset_id: int, content_hash: str, chunker_config: dict
+    ):
+        # new chunks have no vectors yet
+        async with self.db_client() as session:
+            async with session.begin():
+                statement = (
+                    update(Asset)
+                    .where(Asset.asset_id == asset_id)
+                    .values(
+                        asset_content_hash=content_hash,
+                        asset_chunker_config=chunker_config,
+                        asset_processed_at=func.now(),
+                        asset_indexed_at=None,
+                    )
+                )
+                result = await session.execute(statement)
+        return result.rowcount
+
+    async def clear_processing_state(self, asset_project_id: int):
+        # the project's assets are re-processed from scratch
+        async with self.db_client() as session:
+            async with session.begin():
+                statement = (
+                    update(Asset)
+                    .where(Asset.asset_project_id == asset_project_id)
+                    .values(
+                        asset_content_hash=None,
+                        asset_chunker_config=None,
+                        asset_processed_at=None,
+                        asset_indexed_at=None,
+                    )
+                )
+                result = await session.execute(statement)
+        return result.rowcount
+
+    async def get_assets_pending_indexing(self, asset_project_id: int):
+        async with self.db_client() as session:
+            # assets never processed have no chunks to index; those chunked
+            # before the processing state existed are backfilled as indexed
+            statement = select(Asset.asset_id).where(
+                Asset.asset_project_id == asset_project_id,
+                Asset.asset_processed_at.is_not(None),
+                or_(
+                    Asset.asset_indexed_at.is_(None),
+                    Asset.asset_indexed_at < Asset.asset_processed_at,
+                ),
+            )
+            result = await session.execute(statement)
+            return result.scalars().all()
+
+    async def get_current_time(self) -> datetime:
+        async with self.db_client() as session:
+            result = await session.execute(select(func.now()))
+            return result.scalar_one()
+
+    async def set_assets_indexed(
+        self,
+        asset_project_id: int,
+        indexed_at: datetime = None,
+        asset_ids: List[int] = None,
+    ):
+        # asset_ids None marks every asset of the project, indexed_at None
+        # marks them as not indexed
+        conditions = [Asset.asset_project_id == asset_project_id]
+        if asset_ids is not None:
+            conditions.append(Asset.asset_id == any_(literal(asset_ids, ARRAY(Integer))))
+
+        # only the chunks an asset had when indexing started were indexed
+        if indexed_at is not None:
+            conditions.append(Asset.asset_processed_at.is_not(None))
+            conditions.append(Asset.asset_processed_at <= indexed_at)
+
+        async with self.db_client() as session:
+            async with session.begin():
+                statement = (
+                    update(Asset)
+                    .where(*conditions)
+                    .values(asset_indexed_at=indexed_at)
+                )
+                result = await session.execute(statement)
+        return result.rowcount
@@ -4,7 +4,11 @@ from .enums.DataBaseEnum import DataBaseEnum
 from bson.objectid import ObjectId
 from pymongo import InsertOne
 from sqlalchemy.future import select
-from sqlalchemy import delete, func
+from sqlalchemy import delete, func, insert, any_, literal, Integer
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.sql import text as sql_text
+from typing import List
+import json
 
 
 class ChunkModel(BaseDataModel):
@@ -46,6 +50,102 @@ class ChunkModel(BaseDataModel):
                 await session.commit()
             return len(chunks)
 
+    async def bulk_insert_chunks(self, chunks: List[dict], batch_size: int = None):
+        """
+        Insert plain chunk rows without building ORM objects and return the
+        new chunk ids in input order.
+
+        Uses asyncpg COPY when the driver supports it, otherwise multi-row
+        INSERT ... RETURNING chunk_id.
+        """
+        if not chunks or len(chunks) == 0:
+            return []
+
+        batch_size = batch_size if batch_size else self.app_settings.CHUNKS_INSERT_BATCH_SIZE
+
+        async with self.db_client() as session:
+            async with session.begin():
+                connection = await session.connection()
+                raw_connection = await connection.get_raw_connection()
+                driver_connection = getattr(raw_connection, "driver_connection", None)
+
+                if hasattr(driver_connection, "copy_records_to_table"):
+                    chunks_ids = await self.copy_chunks(
+                        session=session,
+                        driver_connection=driver_connection,
+                        chunks=chunks,
+                    )
+                else:
+                    chunks_ids = await self.insert_chunks_returning(
+                        session=session,
+                        chunks=chunks,
+                        batch_size=batch_size,
+                    )
+
+        return chunks_ids
+
+    async def copy_chunks(self, session, driver_connection, chunks: List[dict]):
+        # COPY can not return ids, so reserve them from the sequence up front
+        ids_sql = sql_text(
+            "SELECT nextval(pg_get_serial_sequence(:table_name, 'chunk_id')) "
+            "FROM generate_series(1, :count)"
+        )
+        result = await session.execute(
+            ids_sql,
+            {"table_name": DataChunk.__tablename__, "count": len(chunks)},
+        )
+        chunks_ids = result.scalars().all()
+
+        records = (
+            (
+                chunk_id,
+                chunk["chunk_text"],
+                json.dumps(chunk.get("chunk_metadata") or {}, ensure_ascii=False),
+                chunk["chunk_order"],
+                chunk["chunk_project_id"],
+                chunk["chunk_asset_id"],
+            )
+            for chunk_id, chunk in zip(chunks_ids, chunks)
+        )
+
+        await driver_connection.copy_records_to_table(
+            DataChunk.__tablename__,
+            records=records,
+            columns=[
+                "chunk_id",
+                "chunk_text",
+                "chunk_metadata",
+                "chunk_order",
+                "chunk_project_id",
+                "chunk_asset_id",
+            ],
+        )
+
+        return chunks_ids
+
+    async def insert_chunks_returning(
+        self, session, chunks: List[dict], batch_size: int
+    ):
+        chunks_ids = []
+        for i in range(0, len(chunks), batch_size):
+            batch = [
+                {
+                    "chunk_text": chunk["chunk_text"],
+                    "chunk_metadata": chunk.get("chunk_metadata") or {},
+                    "chunk_order": chunk["chunk_order"],
+                    "chunk_project_id": chunk["chunk_project_id"],
+                    "chunk_asset_id": chunk["chunk_asset_id"],
+                }
+                for chunk in chunks[i : i + batch_size]
+            ]
+            statement = (
+                insert(DataChunk).values(batch).returning(DataChunk.chunk_id)
+            )
+            result = await session.execute(statement)
+            chunks_ids.extend(result.scalars().all())
+
+        return chunks_ids
+
     async def delete_chunks_by_project_id(self, project_id: ObjectId):
         async with self.db_client() as session:
             statement = delete(DataChunk).where(
@@ -55,14 +155,53 @@ class ChunkModel(BaseDataModel):
             await session.commit()
         return result.rowcount
 
+    async def delete_chunks_by_asset_ids(self, project_id: int, asset_ids: List[int]):
+        async with self.db_client() as session:
+            statement = delete(DataChunk).where(
+                DataChunk.chunk_project_id == project_id,
+                DataChunk.chunk_asset_id == any_(literal(asset_ids, ARRAY(Integer))),
+            )
+            result = await session.execute(statement)
+            await session.commit()
+        return result.rowcount
+
+    async def get_chunk_ids_by_asset_ids(self, project_id: int, asset_ids: List[int]):
+        async with self.db_client() as session:
+            statement = select(DataChunk.chunk_id).where(
+                *self.get_project_chunks_conditions(project_id, asset_ids)
+            )
+            result = await session.execute(statement)
+            return result.scalars().all()
+
+    def get_project_chunks_conditions(
+        self, project_id: ObjectId, asset_ids: List[int] = None
+    ):
+        conditions = [DataChunk.chunk_project_id == project_id]
+        if asset_ids is not None:
+            # one array parameter, however many assets are pending
+            conditions.append(
+                DataChunk.chunk_asset_id == any_(literal(asset_ids, ARRAY(Integer)))
+            )
+        return conditions
+
     async def get_project_chunks(
-        self, project_id: ObjectId, page_no: int = 1, page_size: int = 50
+        self,
+        project_id: ObjectId,
+        last_chunk_id: int = 0,
+        page_size: int = None,
+        asset_ids: List[int] = None,
     ):
+        # keyset pagination: served straight from (chunk_project_id, chunk_id)
+        page_size = page_size if page_size else self.app_settings.CHUNKS_PAGE_SIZE
+
         async with self.db_client() as session:
             statement = (
                 select(DataChunk)
-                .where(DataChunk.chunk_project_id == project_id)
-                .offset((page_no - 1) * page_size)
+                .where(
+                    *self.get_project_chunks_conditions(project_id, asset_ids),
+                    DataChunk.chunk_id > last_chunk_id,
+                )
+                .order_by(DataChunk.chunk_id)
                 .limit(page_size)
             )
 
@@ -71,13 +210,42 @@ class ChunkModel(BaseDataModel):
 
         return records
 
-    async def get_total_chunks_count(self, project_id: ObjectId):
+    async def iterate_project_chunks(
+        self, project_id: ObjectId, page_size: int = None, asset_ids: List[int] = None
+    ):
+        last_chunk_id = 0
+        while True:
+            page_chunks = await self.get_project_chunks(
+                project_id=project_id,
+                last_chunk_id=last_chunk_id,
+                page_size=page_size,
+                asset_ids=asset_ids,
+            )
+            if not page_chunks or len(page_chunks) == 0:
+                break
+
+            yield page_chunks
+            last_chunk_id = page_chunks[-1].chunk_id
+
+    async def get_total_chunks_count(
+        self, project_id: ObjectId, asset_ids: List[int] = None
+    ):
         total_count = 0
         async with self.db_client() as session:
             count_sql = select(func.count(DataChunk.chunk_id)).where(
-                DataChunk.chunk_project_id == project_id
+                *self.get_project_chunks_conditions(project_id, asset_ids)
             )
             records_count = await session.execute(count_sql)
             total_count = records_count.scalar()
 
         return total_count
+
+    async def get_project_chunks_version(self, project_id: int):
+        # chunks are only ever deleted or inserted with new ids, so any
+        # change to a project's chunks changes its count or its max id
+        async with self.db_client() as session:
+            version_sql = select(
+                func.count(DataChunk.chunk_id), func.max(DataChunk.chunk_id)
+            ).where(*self.get_project_chunks_conditions(project_id))
+            result = await session.execute(version_sql)
+            return tuple(result.one())
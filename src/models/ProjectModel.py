@@ -2,7 +2,7 @@ from .BaseDataModel import BaseDataModel
 from .db_schemes import Project
 from .enums.DataBaseEnum import DataBaseEnum
 from sqlalchemy.future import select
-from sqlalchemy import func
+from sqlalchemy import func, update
 
 
 class ProjectModel(BaseDataModel):
@@ -38,6 +38,18 @@ class ProjectModel(BaseDataModel):
                 else:
                     return project
 
+    async def bump_index_version(self, project_id: int) -> int:
+        async with self.db_client() as session:
+            async with session.begin():
+                query = (
+                    update(Project)
+                    .where(Project.project_id == project_id)
+                    .values(project_index_version=Project.project_index_version + 1)
+                    .returning(Project.project_index_version)
+                )
+                result = await session.execute(query)
+                return result.scalar_one_or_none()
+
     async def get_all_projects(self, page: int = 1, page_size: int = 10):
         async with self.db_client() as session:
             async with session.begin():
@@ -1 +1 @@
-from models.db_schemes.minirag.schemes import Project, DataChunk, Asset, RetrievedDocument
+from models.db_schemes.minirag.schemes import Project, DataChunk, Asset, RetrievedDocument, EmbeddingCacheEntry, QueryCacheEntry
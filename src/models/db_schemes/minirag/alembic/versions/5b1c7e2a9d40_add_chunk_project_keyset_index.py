@@ -0,0 +1,28 @@
+"""Add chunk project keyset index
+
+Revision ID: 5b1c7e2a9d40
+Revises: 122498d9ed83
+Create Date: 2026-10-18 10:12:41.503217
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b1c7e2a9d40'
+down_revision: Union[str, None] = '122498d9ed83'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_chunk_project_id_chunk_id', 'chunks', ['chunk_project_id', 'chunk_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_chunk_project_id_chunk_id', table_name='chunks')
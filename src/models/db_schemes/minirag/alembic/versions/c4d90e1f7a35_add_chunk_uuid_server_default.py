@@ -0,0 +1,28 @@
+"""Add chunk uuid server default
+
+Revision ID: c4d90e1f7a35
+Revises: 8e3f4a6c1b27
+Create Date: 2026-10-18 11:48:05.127640
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d90e1f7a35'
+down_revision: Union[str, None] = '8e3f4a6c1b27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column('chunks', 'chunk_uuid', server_default=sa.text('gen_random_uuid()'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.alter_column('chunks', 'chunk_uuid', server_default=None)
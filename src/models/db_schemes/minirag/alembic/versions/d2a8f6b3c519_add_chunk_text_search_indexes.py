@@ -0,0 +1,41 @@
+"""Add chunk text search indexes
+
+Revision ID: d2a8f6b3c519
+Revises: c4d90e1f7a35
+Create Date: 2026-10-18 16:40:12.118734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2a8f6b3c519'
+down_revision: Union[str, None] = 'c4d90e1f7a35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# one GIN index per default LEXICAL_SEARCH_LANGUAGES entry; other configured
+# languages need their own ix_chunk_text_tsv_<language> index (PGLexicalProvider
+# warns on connect about any that are missing)
+TEXT_SEARCH_LANGUAGES = ['english', 'arabic']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for language in TEXT_SEARCH_LANGUAGES:
+        op.create_index(
+            f'ix_chunk_text_tsv_{language}',
+            'chunks',
+            [sa.text(f"to_tsvector('{language}'::regconfig, chunk_text)")],
+            unique=False,
+            postgresql_using='gin',
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for language in TEXT_SEARCH_LANGUAGES:
+        op.drop_index(f'ix_chunk_text_tsv_{language}', table_name='chunks')
@@ -0,0 +1,46 @@
+"""Add query cache table and project index version
+
+Revision ID: e7b1c93a5f02
+Revises: d2a8f6b3c519
+Create Date: 2026-10-18 19:05:41.362807
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b1c93a5f02'
+down_revision: Union[str, None] = 'd2a8f6b3c519'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('projects', sa.Column('project_index_version', sa.Integer(), server_default='0', nullable=False))
+    op.create_table('query_cache',
+    sa.Column('cache_key', sa.String(), nullable=False),
+    sa.Column('scope_key', sa.String(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    sa.Column('index_version', sa.Integer(), nullable=False),
+    sa.Column('kind', sa.String(), nullable=False),
+    sa.Column('query_embedding', sa.LargeBinary(), nullable=True),
+    sa.Column('value', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+    sa.PrimaryKeyConstraint('cache_key')
+    )
+    op.create_index('ix_query_cache_scope_key', 'query_cache', ['scope_key', 'created_at'], unique=False)
+    op.create_index('ix_query_cache_project_id', 'query_cache', ['project_id', 'index_version'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_query_cache_project_id', table_name='query_cache')
+    op.drop_index('ix_query_cache_scope_key', table_name='query_cache')
+    op.drop_table('query_cache')
+    op.drop_column('projects', 'project_index_version')
@@ -0,0 +1,43 @@
+"""Add asset processing state
+
+Revision ID: f3c8a1d4b7e6
+Revises: e7b1c93a5f02
+Create Date: 2026-10-18 23:12:07.540219
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3c8a1d4b7e6'
+down_revision: Union[str, None] = 'e7b1c93a5f02'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('assets', sa.Column('asset_content_hash', sa.String(), nullable=True))
+    op.add_column('assets', sa.Column('asset_chunker_config', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+    op.add_column('assets', sa.Column('asset_processed_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('assets', sa.Column('asset_indexed_at', sa.DateTime(timezone=True), nullable=True))
+
+    # assets chunked before this revision count as processed and indexed, so
+    # pushes do not re-embed them; without a content hash, the next process
+    # still re-chunks them once
+    op.execute(
+        "UPDATE assets SET asset_processed_at = now(), asset_indexed_at = now() "
+        "WHERE EXISTS (SELECT 1 FROM chunks WHERE chunks.chunk_asset_id = assets.asset_id)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('assets', 'asset_indexed_at')
+    op.drop_column('assets', 'asset_processed_at')
+    op.drop_column('assets', 'asset_chunker_config')
+    op.drop_column('assets', 'asset_content_hash')
@@ -2,3 +2,5 @@ from  .minirag_base import SQLAlchemyBase
 from  .asset import Asset
 from  .project import Project
 from  .datachunk import DataChunk, RetrievedDocument
+from  .embedding_cache import EmbeddingCacheEntry
+from  .query_cache import QueryCacheEntry
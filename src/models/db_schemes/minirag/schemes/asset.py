@@ -17,6 +17,12 @@ class Asset(SQLAlchemyBase):
     asset_size = Column(Integer, nullable=False)
     asset_config = Column(JSONB, nullable=True)
 
+    # processing state, so unchanged assets are not re-chunked or re-embedded
+    asset_content_hash = Column(String, nullable=True)
+    asset_chunker_config = Column(JSONB, nullable=True)
+    asset_processed_at = Column(DateTime(timezone=True), nullable=True)
+    asset_indexed_at = Column(DateTime(timezone=True), nullable=True)
+
     asset_project_id = Column(
         Integer, ForeignKey("projects.project_id"), nullable=False
     )
@@ -1,10 +1,10 @@
 from .minirag_base import SQLAlchemyBase
-from sqlalchemy import Column, Integer, DateTime, func, String, ForeignKey
+from sqlalchemy import Column, Integer, DateTime, func, String, ForeignKey, text
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy import Index
-import uuid
 from pydantic import BaseModel
+from typing import Optional
 
 
 class DataChunk(SQLAlchemyBase):
@@ -12,7 +12,10 @@ class DataChunk(SQLAlchemyBase):
 
     chunk_id = Column(Integer, primary_key=True, autoincrement=True)
     chunk_uuid = Column(
-        UUID(as_uuid=True), default=uuid.uuid4, unique=True, nullable=False
+        UUID(as_uuid=True),
+        server_default=text("gen_random_uuid()"),
+        unique=True,
+        nullable=False,
     )
 
     chunk_text = Column(String, nullable=False)
@@ -35,9 +38,22 @@ class DataChunk(SQLAlchemyBase):
     __table_args__ = (
         Index("ix_chunk_project_id", chunk_project_id),
         Index("ix_chunk_asset_id", chunk_asset_id),
+        Index("ix_chunk_project_id_chunk_id", chunk_project_id, chunk_id),
+        Index(
+            "ix_chunk_text_tsv_english",
+            text("to_tsvector('english'::regconfig, chunk_text)"),
+            postgresql_using="gin",
+        ),
+        Index(
+            "ix_chunk_text_tsv_arabic",
+            text("to_tsvector('arabic'::regconfig, chunk_text)"),
+            postgresql_using="gin",
+        ),
     )
 
 
 class RetrievedDocument(BaseModel):
     text: str
     score: float
+    chunk_id: Optional[int] = None
+    metadata: Optional[dict] = None
@@ -0,0 +1,24 @@
+from .minirag_base import SQLAlchemyBase
+from sqlalchemy import Column, String, DateTime, LargeBinary, func
+from sqlalchemy import Index
+
+
+class EmbeddingCacheEntry(SQLAlchemyBase):
+    __tablename__ = "embedding_cache"
+
+    cache_key = Column(String, primary_key=True)
+
+    provider = Column(String, nullable=False)
+    model_id = Column(String, nullable=False)
+    document_type = Column(String, nullable=False)
+    text_hash = Column(String, nullable=False)
+
+    embedding = Column(LargeBinary, nullable=False)
+
+    created_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    __table_args__ = (
+        Index("ix_embedding_cache_model_id", provider, model_id),
+    )
@@ -13,6 +13,12 @@ class Project(SQLAlchemyBase):
         UUID(as_uuid=True), default=uuid.uuid4, unique=True, nullable=False
     )
 
+    # bumped whenever the project's chunks or vectors change, so cached
+    # query results of older versions are never served
+    project_index_version = Column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+
     created_at = Column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
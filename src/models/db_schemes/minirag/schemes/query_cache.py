@@ -0,0 +1,28 @@
+from .minirag_base import SQLAlchemyBase
+from sqlalchemy import Column, Integer, String, DateTime, LargeBinary, func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import Index
+
+
+class QueryCacheEntry(SQLAlchemyBase):
+    __tablename__ = "query_cache"
+
+    cache_key = Column(String, primary_key=True)
+    scope_key = Column(String, nullable=False)
+
+    project_id = Column(Integer, nullable=False)
+    index_version = Column(Integer, nullable=False)
+    kind = Column(String, nullable=False)
+
+    query_embedding = Column(LargeBinary, nullable=True)
+    value = Column(JSONB, nullable=False)
+
+    created_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index("ix_query_cache_scope_key", scope_key, created_at),
+        Index("ix_query_cache_project_id", project_id, index_version),
+    )
@@ -16,5 +16,13 @@ class ResponseSignal(Enum):
     VECTORDB_COLLECTION_RETRIEVED = "vectordb_collection_retrieved"
     VECTORDB_SEARCH_ERROR = "vectordb_search_error"
     VECTORDB_SEARCH_SUCCESS = "vectordb_search_success"
+    VECTORDB_SEARCH_FILTER_INVALID = "vectordb_search_filter_invalid"
+    VECTORDB_SEARCH_BATCH_INVALID = "vectordb_search_batch_invalid"
     RAG_ANSWER_ERROR = "rag_answer_error"
     RAG_ANSWER_SUCCESS = "rag_answer_success"
+    EMBEDDING_CACHE_STATS_RETRIEVED = "embedding_cache_stats_retrieved"
+    EMBEDDING_CACHE_NOT_ENABLED = "embedding_cache_not_enabled"
+    EMBEDDING_BATCHING_STATS_RETRIEVED = "embedding_batching_stats_retrieved"
+    EMBEDDING_BATCHING_NOT_ENABLED = "embedding_batching_not_enabled"
+    QUERY_CACHE_STATS_RETRIEVED = "query_cache_stats_retrieved"
+    QUERY_CACHE_NOT_ENABLED = "query_cache_not_enabled"
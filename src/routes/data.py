@@ -9,7 +9,7 @@ import logging
 from routes.schemes.data import ProcessRequest
 from models.ProjectModel import ProjectModel
 from models.ChunkModel import ChunkModel
-from models.db_schemes import DataChunk, Asset
+from models.db_schemes import Asset
 from models.AssetModel import AssetModel
 from controllers import NLPController
 
@@ -93,7 +93,10 @@ async def upload_data(
 # process_endpoint
 @data_router.post("/process/{project_id}")
 async def process_endpoint(
-    request: Request, project_id: int, process_resquest: ProcessRequest
+    request: Request,
+    project_id: int,
+    process_resquest: ProcessRequest,
+    app_settings: Settings = Depends(get_settings),
 ):
 
     chunk_size = process_resquest.chunk_size
@@ -109,6 +112,9 @@ async def process_endpoint(
         generation_client=request.app.generation_client,
         embedding_client=request.app.embedding_client,
         template_parser=request.app.template_parser,
+        lexical_client=request.app.lexical_client,
+        query_cache=request.app.query_cache,
+        token_counter=request.app.token_counter,
     )
 
     asset_model = await AssetModel.create_instance(
@@ -129,9 +135,7 @@ async def process_endpoint(
                 },
             )
 
-        project_file_ids = {
-            asset_record.asset_id: asset_record.asset_name,
-        }
+        project_assets = [asset_record]
 
     else:
 
@@ -140,11 +144,9 @@ async def process_endpoint(
             asset_type=AssetTypeEnum.FILE.value,
         )
 
-        project_file_ids = {
-            record.asset_id: record.asset_name for record in project_files
-        }
+        project_assets = project_files
 
-        if len(project_file_ids) == 0:
+        if len(project_assets) == 0:
             return JSONResponse(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 content={
@@ -161,12 +163,56 @@ async def process_endpoint(
         db_client=request.app.db_client,
     )
 
+    collection_name = nlp_controller.create_collection_name(
+        project_id=project.project_id
+    )
+
+    chunker_config = {"chunk_size": chunk_size, "overlap_size": overlap_size}
+    file_hashes = await process_controller.get_files_hashes(
+        project_file_ids={asset.asset_id: asset.asset_name for asset in project_assets}
+    )
+
+    # without a reset, only assets whose file or chunker parameters changed
+    project_file_ids = {
+        asset.asset_id: asset.asset_name
+        for asset in project_assets
+        if do_reset == 1
+        or process_controller.is_asset_changed(
+            asset=asset,
+            content_hash=file_hashes[asset.asset_id],
+            chunker_config=chunker_config,
+        )
+    }
+    unchanged_files = len(project_assets) - len(project_file_ids)
+
+    if do_reset == 0 and len(project_file_ids) > 0:
+        # the replaced chunks' vectors go first, they reference the chunks;
+        # an asset that fails below keeps its old chunks and gets re-indexed
+        is_deleted = await request.app.vectordb_client.delete_by_asset_ids(
+            collection_name=collection_name,
+            asset_ids=list(project_file_ids.keys()),
+            record_ids=await chunk_model.get_chunk_ids_by_asset_ids(
+                project_id=project.project_id,
+                asset_ids=list(project_file_ids.keys()),
+            ),
+        )
+        if not is_deleted:
+            return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                content={
+                    "signal": ResponseSignal.PROCESSING_FAILED.value,
+                },
+            )
+
+        _ = await asset_model.set_assets_indexed(
+            asset_project_id=project.project_id,
+            asset_ids=list(project_file_ids.keys()),
+            indexed_at=None,
+        )
+
     if do_reset == 1:
 
         # delete associated vector collections
-        collection_name = nlp_controller.create_collection_name(
-            project_id=project.project_id
-        )
         _ = await request.app.vectordb_client.delete_collection(
             collection_name=collection_name
         )
@@ -175,45 +221,84 @@ async def process_endpoint(
         _ = await chunk_model.delete_chunks_by_project_id(
             project_id=project.project_id,
         )
+        await request.app.lexical_client.invalidate(project_id=project.project_id)
 
-    for asset_id, file_id in project_file_ids.items():
-
-        file_content = process_controller.get_file_content(file_id=file_id)
+        # assets not re-processed below have no chunks left, so they must
+        # not look unchanged to the next process
+        _ = await asset_model.clear_processing_state(
+            asset_project_id=project.project_id,
+        )
 
-        if file_content is None:
+    failed_files = []
+    async for asset_id, file_id, file_chunks in process_controller.process_files(
+        project_file_ids=project_file_ids,
+        chunk_size=chunk_size,
+        overlap_size=overlap_size,
+        processing_pool=request.app.processing_pool,
+        pdf_pages_per_task=app_settings.PROCESSING_PDF_PAGES_PER_TASK,
+        file_hashes=file_hashes,
+    ):
+
+        if file_chunks is None:
             logger.error(f"Error while processing file: {file_id}")
+            failed_files.append(file_id)
             continue
 
-        file_chunks = process_controller.process_file_content(
-            file_content=file_content,
-            file_id=file_id,
-            chunk_size=chunk_size,
-            overlap_size=overlap_size,
-        )
-
-        if file_chunks is None or len(file_content) == 0:
-            return JSONResponse(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                content={"signal": ResponseSignal.PROCESSING_FAILED.value},
+        if do_reset == 0:
+            _ = await chunk_model.delete_chunks_by_asset_ids(
+                project_id=project.project_id,
+                asset_ids=[asset_id],
             )
 
         file_chunks_records = [
-            DataChunk(
-                chunk_text=chunk.page_content,
-                chunk_metadata=chunk.metadata,
-                chunk_order=i + 1,
-                chunk_project_id=project.project_id,
-                chunk_asset_id=asset_id,
-            )
+            {
+                "chunk_text": chunk.page_content,
+                "chunk_metadata": chunk.metadata,
+                "chunk_order": i + 1,
+                "chunk_project_id": project.project_id,
+                "chunk_asset_id": asset_id,
+            }
             for i, chunk in enumerate(file_chunks)
         ]
 
-        no_records += await chunk_model.insert_many_chunks(chunks=file_chunks_records)
+        inserted_chunks_ids = await chunk_model.bulk_insert_chunks(
+            chunks=file_chunks_records
+        )
+        await request.app.lexical_client.invalidate(project_id=project.project_id)
+        no_records += len(inserted_chunks_ids)
         no_files += 1
+
+        _ = await asset_model.update_asset_processing_state(
+            asset_id=asset_id,
+            content_hash=file_hashes[asset_id],
+            chunker_config=chunker_config,
+        )
+
+    if do_reset == 1 or len(project_file_ids) > 0:
+        # cached search results and answers of the previous chunks are stale
+        index_version = await project_model.bump_index_version(
+            project_id=project.project_id
+        )
+        if request.app.query_cache:
+            await request.app.query_cache.invalidate(
+                project_id=project.project_id, index_version=index_version
+            )
+
+    if no_files == 0 and len(failed_files) > 0:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.PROCESSING_FAILED.value,
+                "failed_files": failed_files,
+            },
+        )
+
     return JSONResponse(
         content={
             "signal": ResponseSignal.PROCESSING_SUCCESS.value,
             "inserted_chunks": no_records,
             "processed_files": no_files,
+            "unchanged_files": unchanged_files,
+            "failed_files": failed_files,
         }
     )
@@ -1,9 +1,12 @@
-from fastapi import FastAPI, APIRouter, status, Request
-from fastapi.responses import JSONResponse
-from routes.schemes.nlp import PushRequest, SearchRequest
+from fastapi import FastAPI, APIRouter, Depends, status, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from routes.schemes.nlp import PushRequest, SearchRequest, BatchSearchRequest
+from helpers.config import get_settings, Settings
 from models import ProjectModel, ChunkModel
+from models.AssetModel import AssetModel
 from controllers import NLPController
 from models.enums import ResponseSignal
+from stores.llm.cache.CachedEmbeddingClient import CachedEmbeddingClient
 import json
 import logging
 from tqdm.auto import tqdm
@@ -32,6 +35,10 @@ async def index_project(request: Request, project_id: int, push_request: PushReq
         db_client=request.app.db_client,
     )
 
+    asset_model = await AssetModel.create_instance(
+        db_client=request.app.db_client,
+    )
+
     if not project:
         return JSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -45,59 +52,104 @@ async def index_project(request: Request, project_id: int, push_request: PushReq
         generation_client=request.app.generation_client,
         embedding_client=request.app.embedding_client,
         template_parser=request.app.template_parser,
+        lexical_client=request.app.lexical_client,
+        query_cache=request.app.query_cache,
+        token_counter=request.app.token_counter,
     )
 
-    has_records = True
-    page_no = 1
-    inserted_items_count = 0
-    idx = 0
-
     # create collection if not exists
     collection_name = nlp_controller.create_collection_name(
         project_id=project.project_id
     )
 
-    _ = await request.app.vectordb_client.create_collection(
+    is_created = await request.app.vectordb_client.create_collection(
         collection_name=collection_name,
         embedding_size=request.app.embedding_client.embedding_size,
         do_reset=push_request.do_reset,
     )
-    total_chunks_count = await chunk_model.get_total_chunks_count(
-        project_id=project.project_id
-    )
-    projectBar = tqdm(total=total_chunks_count, desc="Vector Indexing", position=0)
-
-    while has_records:
-        page_chunks = await chunk_model.get_project_chunks(
-            project_id=project.project_id,
-            page_no=page_no,
-        )
-        if len(page_chunks):
-            page_no += 1
-
-        if not page_chunks or len(page_chunks) == 0:
-            has_records = False
-            break
 
-        chunks_ids = [c.chunk_id for c in page_chunks]
+    # assets processed after this point are left for the next push
+    indexing_started_at = await asset_model.get_current_time()
 
-        idx += len(page_chunks)
+    # a new collection needs every chunk, otherwise only the assets
+    # processed since they were last indexed
+    asset_ids = None
+    if not is_created:
+        asset_ids = await asset_model.get_assets_pending_indexing(
+            asset_project_id=project.project_id
+        )
+        if len(asset_ids) == 0:
+            return JSONResponse(
+                content={
+                    "signal": ResponseSignal.INSERT_INTO_VECTORDB_SUCCESS.value,
+                    "inserted_items_count": 0,
+                }
+            )
 
-        is_inserted = await nlp_controller.index_into_vectordb(
-            project=project,
-            chunks=page_chunks,
-            chunks_ids=chunks_ids,
+        # re-indexing an asset replaces whatever vectors it still has
+        is_deleted = await request.app.vectordb_client.delete_by_asset_ids(
+            collection_name=collection_name,
+            asset_ids=asset_ids,
+            record_ids=await chunk_model.get_chunk_ids_by_asset_ids(
+                project_id=project.project_id,
+                asset_ids=asset_ids,
+            ),
         )
-        if not is_inserted:
+        if not is_deleted:
             return JSONResponse(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 content={
                     "signal": ResponseSignal.INSERT_INTO_VECTORDB_ERROR.value,
                 },
             )
-        projectBar.update(len(page_chunks))
 
-        inserted_items_count += len(page_chunks)
+    total_chunks_count = await chunk_model.get_total_chunks_count(
+        project_id=project.project_id,
+        asset_ids=asset_ids,
+    )
+    projectBar = tqdm(total=total_chunks_count, desc="Vector Indexing", position=0)
+
+    # defer vector index maintenance until every chunk is loaded
+    _ = await request.app.vectordb_client.begin_bulk_load(
+        collection_name=collection_name,
+        drop_index=push_request.rebuild_index == 1,
+    )
+
+    # the index is rebuilt even when the pipeline fails part way
+    try:
+        inserted_items_count = await nlp_controller.index_chunks_pipeline(
+            project=project,
+            chunks_pages=chunk_model.iterate_project_chunks(
+                project_id=project.project_id,
+                asset_ids=asset_ids,
+            ),
+            on_progress=projectBar.update,
+        )
+    finally:
+        _ = await request.app.vectordb_client.end_bulk_load(
+            collection_name=collection_name,
+        )
+
+    # cached search results and answers of the previous index are now stale
+    index_version = await project_model.bump_index_version(project_id=project.project_id)
+    if request.app.query_cache:
+        await request.app.query_cache.invalidate(
+            project_id=project.project_id, index_version=index_version
+        )
+
+    if inserted_items_count is None:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.INSERT_INTO_VECTORDB_ERROR.value,
+            },
+        )
+
+    _ = await asset_model.set_assets_indexed(
+        asset_project_id=project.project_id,
+        indexed_at=indexing_started_at,
+        asset_ids=asset_ids,
+    )
 
     return JSONResponse(
         content={
@@ -123,6 +175,9 @@ async def get_project_index_info(request: Request, project_id: int):
         generation_client=request.app.generation_client,
         embedding_client=request.app.embedding_client,
         template_parser=request.app.template_parser,
+        lexical_client=request.app.lexical_client,
+        query_cache=request.app.query_cache,
+        token_counter=request.app.token_counter,
     )
 
     collection_info = await nlp_controller.get_vectordb_collection_info(
@@ -155,12 +210,34 @@ async def search_index(
         generation_client=request.app.generation_client,
         embedding_client=request.app.embedding_client,
         template_parser=request.app.template_parser,
+        lexical_client=request.app.lexical_client,
+        query_cache=request.app.query_cache,
+        token_counter=request.app.token_counter,
+    )
+
+    search_filters = nlp_controller.build_search_filters(
+        asset_ids=search_request.asset_ids,
+        filters=(
+            [f.dict() for f in search_request.filters] if search_request.filters else None
+        ),
     )
+    if search_filters is None:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.VECTORDB_SEARCH_FILTER_INVALID.value,
+            },
+        )
 
     results = await nlp_controller.search_vectordb_collection(
         project=project,
         text=search_request.text,
         limit=search_request.limit,
+        ef_search=search_request.ef_search,
+        probes=search_request.probes,
+        rerank_depth=search_request.rerank_depth,
+        filters=search_filters,
+        search_mode=search_request.search_mode,
     )
 
     if not results:
@@ -179,6 +256,86 @@ async def search_index(
     )
 
 
+@nlp_router.post("/index/search/batch/{project_id}")
+async def search_index_batch(
+    request: Request,
+    project_id: int,
+    search_request: BatchSearchRequest,
+    app_settings: Settings = Depends(get_settings),
+):
+
+    if (
+        len(search_request.texts) == 0
+        or len(search_request.texts) > app_settings.SEARCH_BATCH_MAX_QUERIES
+    ):
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.VECTORDB_SEARCH_BATCH_INVALID.value,
+            },
+        )
+
+    project_model = await ProjectModel.create_instance(
+        db_client=request.app.db_client,
+    )
+
+    project = await project_model.get_or_create_project(
+        project_id=project_id,
+    )
+
+    nlp_controller = NLPController(
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=request.app.template_parser,
+        lexical_client=request.app.lexical_client,
+        query_cache=request.app.query_cache,
+        token_counter=request.app.token_counter,
+    )
+
+    search_filters = nlp_controller.build_search_filters(
+        asset_ids=search_request.asset_ids,
+        filters=(
+            [f.dict() for f in search_request.filters] if search_request.filters else None
+        ),
+    )
+    if search_filters is None:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.VECTORDB_SEARCH_FILTER_INVALID.value,
+            },
+        )
+
+    results = await nlp_controller.search_vectordb_collection_batch(
+        project=project,
+        texts=search_request.texts,
+        limit=search_request.limit,
+        ef_search=search_request.ef_search,
+        probes=search_request.probes,
+        rerank_depth=search_request.rerank_depth,
+        filters=search_filters,
+        search_mode=search_request.search_mode,
+    )
+
+    if results is False or results is None:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.VECTORDB_SEARCH_ERROR.value,
+            },
+        )
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.VECTORDB_SEARCH_SUCCESS.value,
+            "results": [
+                [result.dict() for result in query_results] for query_results in results
+            ],
+        }
+    )
+
+
 @nlp_router.post("/index/answer/{project_id}")
 async def answer_rag(request: Request, project_id: int, search_request: SearchRequest):
 
@@ -195,12 +352,34 @@ async def answer_rag(request: Request, project_id: int, search_request: SearchRe
         generation_client=request.app.generation_client,
         embedding_client=request.app.embedding_client,
         template_parser=request.app.template_parser,
+        lexical_client=request.app.lexical_client,
+        query_cache=request.app.query_cache,
+        token_counter=request.app.token_counter,
     )
 
-    answer, full_prompt, chat_history = await nlp_controller.answer_rag_question(
+    search_filters = nlp_controller.build_search_filters(
+        asset_ids=search_request.asset_ids,
+        filters=(
+            [f.dict() for f in search_request.filters] if search_request.filters else None
+        ),
+    )
+    if search_filters is None:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.VECTORDB_SEARCH_FILTER_INVALID.value,
+            },
+        )
+
+    answer, full_prompt, chat_history, prompt_tokens = await nlp_controller.answer_rag_question(
         project=project,
         query=search_request.text,
         limit=search_request.limit,
+        ef_search=search_request.ef_search,
+        probes=search_request.probes,
+        rerank_depth=search_request.rerank_depth,
+        filters=search_filters,
+        search_mode=search_request.search_mode,
     )
 
     if not answer:
@@ -217,5 +396,128 @@ async def answer_rag(request: Request, project_id: int, search_request: SearchRe
             "answer": answer,
             "full_prompt": full_prompt,
             "chat_history": chat_history,
+            "prompt_tokens": prompt_tokens,
+        }
+    )
+
+
+@nlp_router.post("/index/answer/stream/{project_id}")
+async def answer_rag_stream(
+    request: Request, project_id: int, search_request: SearchRequest
+):
+
+    project_model = await ProjectModel.create_instance(
+        db_client=request.app.db_client,
+    )
+
+    project = await project_model.get_or_create_project(
+        project_id=project_id,
+    )
+
+    nlp_controller = NLPController(
+        vectordb_client=request.app.vectordb_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=request.app.template_parser,
+        lexical_client=request.app.lexical_client,
+        query_cache=request.app.query_cache,
+        token_counter=request.app.token_counter,
+    )
+
+    search_filters = nlp_controller.build_search_filters(
+        asset_ids=search_request.asset_ids,
+        filters=(
+            [f.dict() for f in search_request.filters] if search_request.filters else None
+        ),
+    )
+    if search_filters is None:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.VECTORDB_SEARCH_FILTER_INVALID.value,
+            },
+        )
+
+    async def event_stream():
+        events = nlp_controller.stream_rag_answer(
+            project=project,
+            query=search_request.text,
+            limit=search_request.limit,
+            ef_search=search_request.ef_search,
+            probes=search_request.probes,
+            rerank_depth=search_request.rerank_depth,
+            filters=search_filters,
+            search_mode=search_request.search_mode,
+        )
+        try:
+            async for event, data in events:
+                # stop generating as soon as the client goes away
+                if await request.is_disconnected():
+                    logger.info(f"Client left the answer stream of project {project_id}")
+                    break
+                yield f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+        finally:
+            await events.aclose()
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@nlp_router.get("/query/cache/stats")
+async def get_query_cache_stats(request: Request):
+
+    if not request.app.query_cache:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.QUERY_CACHE_NOT_ENABLED.value,
+            },
+        )
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.QUERY_CACHE_STATS_RETRIEVED.value,
+            "stats": request.app.query_cache.get_stats(),
+        }
+    )
+
+
+@nlp_router.get("/embedding/cache/stats")
+async def get_embedding_cache_stats(request: Request):
+
+    if not isinstance(request.app.embedding_client, CachedEmbeddingClient):
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.EMBEDDING_CACHE_NOT_ENABLED.value,
+            },
+        )
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.EMBEDDING_CACHE_STATS_RETRIEVED.value,
+            "stats": request.app.embedding_client.get_stats(),
+        }
+    )
+
+
+@nlp_router.get("/embedding/batching/stats")
+async def get_embedding_batching_stats(request: Request):
+
+    if not request.app.embedding_batcher:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.EMBEDDING_BATCHING_NOT_ENABLED.value,
+            },
+        )
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.EMBEDDING_BATCHING_STATS_RETRIEVED.value,
+            "stats": request.app.embedding_batcher.get_stats(),
         }
     )
@@ -1,11 +1,35 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List, Any
 
 
 class PushRequest(BaseModel):
     do_reset: Optional[int] = 0
+    rebuild_index: Optional[int] = 0
+
+
+class SearchFilter(BaseModel):
+    field: str
+    operator: Optional[str] = "eq"
+    value: Any = None
 
 
 class SearchRequest(BaseModel):
     text: str
     limit: Optional[int] = 5
+    ef_search: Optional[int] = None
+    probes: Optional[int] = None
+    rerank_depth: Optional[int] = None
+    asset_ids: Optional[List[int]] = None
+    filters: Optional[List[SearchFilter]] = None
+    search_mode: Optional[str] = None
+
+
+class BatchSearchRequest(BaseModel):
+    texts: List[str]
+    limit: Optional[int] = 5
+    ef_search: Optional[int] = None
+    probes: Optional[int] = None
+    rerank_depth: Optional[int] = None
+    asset_ids: Optional[List[int]] = None
+    filters: Optional[List[SearchFilter]] = None
+    search_mode: Optional[str] = None
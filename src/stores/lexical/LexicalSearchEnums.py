@@ -0,0 +1,11 @@
+from enum import Enum
+
+
+class LexicalSearchEnums(Enum):
+    POSTGRES = "POSTGRES"
+    BM25 = "BM25"
+
+
+class SearchModeEnums(Enum):
+    VECTOR = "vector"
+    HYBRID = "hybrid"
@@ -0,0 +1,35 @@
+from stores.lexical.providers import PGLexicalProvider, BM25LexicalProvider
+from stores.lexical.LexicalSearchEnums import LexicalSearchEnums
+from stores.vectordb.VectorDBEnums import VectorDBEnums
+from sqlalchemy.orm import sessionmaker
+
+
+class LexicalSearchFactory:
+    def __init__(self, config, db_client: sessionmaker = None):
+        self.config = config
+        self.db_client = db_client
+
+    def create(self, backend: str = None):
+        if not backend:
+            # Postgres full-text search next to pgvector, in-process BM25 otherwise
+            backend = (
+                LexicalSearchEnums.POSTGRES.value
+                if self.config.VECTOR_DB_BACKEND == VectorDBEnums.PGVECTOR.value
+                else LexicalSearchEnums.BM25.value
+            )
+
+        if backend == LexicalSearchEnums.POSTGRES.value:
+            return PGLexicalProvider(
+                db_client=self.db_client,
+                languages=self.config.LEXICAL_SEARCH_LANGUAGES,
+            )
+
+        if backend == LexicalSearchEnums.BM25.value:
+            return BM25LexicalProvider(
+                db_client=self.db_client,
+                k1=self.config.LEXICAL_BM25_K1,
+                b=self.config.LEXICAL_BM25_B,
+                max_cached_projects=self.config.LEXICAL_BM25_MAX_CACHED_PROJECTS,
+            )
+
+        return None
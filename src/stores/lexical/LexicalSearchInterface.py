@@ -0,0 +1,28 @@
+from abc import ABC, abstractmethod
+from typing import List
+from models.db_schemes import RetrievedDocument
+
+
+class LexicalSearchInterface(ABC):
+
+    @abstractmethod
+    async def connect(self):
+        pass
+
+    @abstractmethod
+    async def disconnect(self):
+        pass
+
+    @abstractmethod
+    async def search(
+        self,
+        project_id: int,
+        text: str,
+        limit: int,
+        filters: List[dict] = None,
+    ) -> List[RetrievedDocument]:
+        pass
+
+    @abstractmethod
+    async def invalidate(self, project_id: int):
+        pass
@@ -0,0 +1,208 @@
+from ..LexicalSearchInterface import LexicalSearchInterface
+from stores.vectordb.VectorDBEnums import VectorMetadataEnums
+from models.db_schemes import RetrievedDocument
+from models.ChunkModel import ChunkModel
+from helpers.filters import matches_metadata_filters
+from collections import OrderedDict
+from typing import List
+import numpy as np
+import asyncio
+import logging
+import re
+
+TOKEN_PATTERN = re.compile(r"\w+", re.UNICODE)
+# arabic diacritics and tatweel, ignored when matching terms
+ARABIC_MARKS_PATTERN = re.compile(r"[\u0610-\u061A\u064B-\u065F\u0670\u0640]")
+ARABIC_ALEF_PATTERN = re.compile(r"[\u0622\u0623\u0625]")
+
+
+class BM25LexicalProvider(LexicalSearchInterface):
+    """
+    In-process BM25 inverted index over a project's chunks, for the vector
+    backends that do not live in Postgres.
+
+    Indexes are built lazily from the chunks table on a project's first
+    lexical search and kept for the `max_cached_projects` most recently used
+    projects. Each index is keyed by the chunks version it was built from
+    (chunk count and max chunk id), so chunk changes made by any worker
+    rebuild it on the next search; `invalidate` only frees it early.
+    """
+
+    def __init__(
+        self,
+        db_client,
+        k1: float = 1.2,
+        b: float = 0.75,
+        max_cached_projects: int = 16,
+    ):
+        self.db_client = db_client
+        self.k1 = k1
+        self.b = b
+        self.max_cached_projects = max_cached_projects
+
+        # project_id -> (chunks version, built index), in least recently
+        # used order
+        self.indexes = OrderedDict()
+        self.build_locks = {}
+        self.logger = logging.getLogger("uvicorn")
+
+    # connect method
+    async def connect(self):
+        pass
+
+    # disconnect method
+    async def disconnect(self):
+        self.indexes.clear()
+
+    # invalidate method
+    async def invalidate(self, project_id: int):
+        self.indexes.pop(project_id, None)
+
+    # tokenize method
+    def tokenize(self, text: str) -> List[str]:
+        text = ARABIC_MARKS_PATTERN.sub("", text.lower())
+        text = ARABIC_ALEF_PATTERN.sub("\u0627", text)
+        return TOKEN_PATTERN.findall(text)
+
+    # build_index method
+    def build_index(self, documents: List[dict]) -> dict:
+        postings = {}
+        document_lengths = np.zeros(len(documents), dtype=np.float32)
+
+        for document_index, document in enumerate(documents):
+            tokens = self.tokenize(document["text"])
+            document_lengths[document_index] = len(tokens)
+
+            term_frequencies = {}
+            for token in tokens:
+                term_frequencies[token] = term_frequencies.get(token, 0) + 1
+            for term, frequency in term_frequencies.items():
+                postings.setdefault(term, []).append((document_index, frequency))
+
+        documents_count = len(documents)
+        return {
+            "documents": documents,
+            "document_lengths": document_lengths,
+            "average_length": float(document_lengths.mean()) if documents_count else 0.0,
+            "postings": {
+                term: (
+                    np.fromiter((p[0] for p in items), dtype=np.int64, count=len(items)),
+                    np.fromiter((p[1] for p in items), dtype=np.float32, count=len(items)),
+                )
+                for term, items in postings.items()
+            },
+        }
+
+    # get_index method
+    async def get_index(self, project_id: int) -> dict:
+        chunk_model = await ChunkModel.create_instance(db_client=self.db_client)
+        version = await chunk_model.get_project_chunks_version(project_id=project_id)
+
+        cached = self.indexes.get(project_id)
+        if cached and cached[0] == version:
+            self.indexes.move_to_end(project_id)
+            return cached[1]
+
+        lock = self.build_locks.setdefault(project_id, asyncio.Lock())
+        async with lock:
+            cached = self.indexes.get(project_id)
+            if cached and cached[0] == version:
+                return cached[1]
+
+            documents = []
+            async for page_chunks in chunk_model.iterate_project_chunks(
+                project_id=project_id
+            ):
+                documents.extend(
+                    {
+                        "chunk_id": chunk.chunk_id,
+                        "text": chunk.chunk_text,
+                        "metadata": {
+                            **(chunk.chunk_metadata or {}),
+                            VectorMetadataEnums.ASSET_ID.value: chunk.chunk_asset_id,
+                            VectorMetadataEnums.CHUNK_ORDER.value: chunk.chunk_order,
+                        },
+                    }
+                    for chunk in page_chunks
+                )
+
+            index = await asyncio.to_thread(self.build_index, documents)
+            self.logger.info(
+                f"Built BM25 index for project {project_id}: {len(documents)} chunks"
+            )
+
+            # chunks changed while building are caught by the next
+            # search's version check
+            self.indexes[project_id] = (version, index)
+            self.indexes.move_to_end(project_id)
+            while len(self.indexes) > self.max_cached_projects:
+                self.indexes.popitem(last=False)
+
+        return index
+
+    # score method
+    def score(self, index: dict, text: str, limit: int, filters: List[dict] = None):
+        documents_count = len(index["documents"])
+        if documents_count == 0:
+            return [], []
+
+        scores = np.zeros(documents_count, dtype=np.float32)
+        length_norm = self.k1 * (
+            1 - self.b + self.b * index["document_lengths"] / max(index["average_length"], 1.0)
+        )
+        for term in set(self.tokenize(text)):
+            if term not in index["postings"]:
+                continue
+            document_indices, frequencies = index["postings"][term]
+            idf = np.log(
+                1 + (documents_count - len(document_indices) + 0.5) / (len(document_indices) + 0.5)
+            )
+            scores[document_indices] += idf * frequencies * (self.k1 + 1) / (
+                frequencies + length_norm[document_indices]
+            )
+
+        matched = np.flatnonzero(scores > 0)
+        if filters:
+            matched = np.asarray(
+                [
+                    document_index
+                    for document_index in matched
+                    if matches_metadata_filters(
+                        index["documents"][document_index]["metadata"], filters
+                    )
+                ],
+                dtype=np.int64,
+            )
+        if len(matched) == 0:
+            return [], []
+
+        if len(matched) > limit:
+            matched = matched[np.argpartition(-scores[matched], limit - 1)[:limit]]
+        matched = matched[np.argsort(-scores[matched], kind="stable")]
+        return matched.tolist(), scores[matched].tolist()
+
+    # search method
+    async def search(
+        self,
+        project_id: int,
+        text: str,
+        limit: int,
+        filters: List[dict] = None,
+    ) -> List[RetrievedDocument]:
+        if not text or not text.strip():
+            return []
+
+        index = await self.get_index(project_id=project_id)
+        document_indices, scores = await asyncio.to_thread(
+            self.score, index, text, limit, filters
+        )
+
+        return [
+            RetrievedDocument(
+                text=index["documents"][document_index]["text"],
+                score=score,
+                chunk_id=index["documents"][document_index]["chunk_id"],
+                metadata=index["documents"][document_index]["metadata"],
+            )
+            for document_index, score in zip(document_indices, scores)
+        ]
@@ -0,0 +1,200 @@
+from ..LexicalSearchInterface import LexicalSearchInterface
+from stores.vectordb.VectorDBEnums import FilterOperatorEnums, VectorMetadataEnums
+from models.db_schemes import RetrievedDocument
+from sqlalchemy.sql import text as sql_text
+from typing import List
+import logging
+import json
+import re
+
+
+class PGLexicalProvider(LexicalSearchInterface):
+    """
+    Full-text search over `chunks.chunk_text` with Postgres tsvector.
+
+    Every configured text search language has its own GIN expression index
+    (see the alembic migrations); a chunk matches if any language's query
+    matches it, ranked by the best ts_rank_cd among them.
+    """
+
+    def __init__(self, db_client, languages: List[str] = None):
+        self.db_client = db_client
+        self.logger = logging.getLogger("uvicorn")
+
+        self.languages = []
+        for language in languages if languages else ["english"]:
+            # regconfig names are interpolated into the SQL
+            if not re.fullmatch(r"[a-z_]+", language):
+                self.logger.warning(
+                    f"Ignoring invalid lexical search language: {language!r}"
+                )
+                continue
+            self.languages.append(language)
+
+        # vector metadata fields that are chunk columns here
+        self.column_fields = {
+            VectorMetadataEnums.ASSET_ID.value: "chunk_asset_id",
+            VectorMetadataEnums.CHUNK_ORDER.value: "chunk_order",
+        }
+
+    # get_index_name method
+    def get_index_name(self, language: str) -> str:
+        return f"ix_chunk_text_tsv_{language}"
+
+    # connect method
+    async def connect(self):
+        async with self.db_client() as session:
+            indexes_sql = sql_text(
+                "SELECT indexname FROM pg_indexes "
+                "WHERE tablename = 'chunks' AND indexname = ANY(:index_names)"
+            )
+            result = await session.execute(
+                indexes_sql,
+                {"index_names": [self.get_index_name(language) for language in self.languages]},
+            )
+            index_names = set(result.scalars().all())
+
+        for language in self.languages:
+            if self.get_index_name(language) not in index_names:
+                self.logger.warning(
+                    f"No text search index for lexical search language {language}, "
+                    f"its searches scan every chunk; add a migration creating "
+                    f"{self.get_index_name(language)}"
+                )
+
+    # disconnect method
+    async def disconnect(self):
+        pass
+
+    # invalidate method
+    async def invalidate(self, project_id: int):
+        # the expression indexes follow the chunks table, nothing to refresh
+        pass
+
+    # get_filter_conditions method
+    def get_filter_conditions(self, filters: List[dict] = None):
+        conditions, params = [], {}
+        range_operators = {
+            FilterOperatorEnums.GT.value: ">",
+            FilterOperatorEnums.GTE.value: ">=",
+            FilterOperatorEnums.LT.value: "<",
+            FilterOperatorEnums.LTE.value: "<=",
+        }
+
+        for i, condition in enumerate(filters or []):
+            field = condition["field"]
+            operator = condition.get("operator") or FilterOperatorEnums.EQ.value
+            value = condition.get("value")
+            key = f"filter_{i}"
+
+            if field in self.column_fields:
+                column = self.column_fields[field]
+                if operator == FilterOperatorEnums.IN.value:
+                    conditions.append(f"{column} = ANY(:{key})")
+                    params[key] = list(value)
+                elif operator == FilterOperatorEnums.EQ.value:
+                    conditions.append(f"{column} = :{key}")
+                    params[key] = value
+                elif operator == FilterOperatorEnums.NE.value:
+                    conditions.append(f"{column} <> :{key}")
+                    params[key] = value
+                elif operator in range_operators:
+                    conditions.append(f"{column} {range_operators[operator]} :{key}")
+                    params[key] = value
+                else:
+                    raise ValueError(f"Unsupported filter operator: {operator}")
+                continue
+
+            if operator == FilterOperatorEnums.EQ.value:
+                conditions.append(f"chunk_metadata @> CAST(:{key} AS jsonb)")
+                params[key] = json.dumps({field: value})
+            elif operator == FilterOperatorEnums.NE.value:
+                conditions.append(
+                    f"NOT (COALESCE(chunk_metadata, '{{}}') @> CAST(:{key} AS jsonb))"
+                )
+                params[key] = json.dumps({field: value})
+            elif operator == FilterOperatorEnums.IN.value:
+                in_conditions = []
+                for j, item in enumerate(value or []):
+                    in_conditions.append(f"chunk_metadata @> CAST(:{key}_{j} AS jsonb)")
+                    params[f"{key}_{j}"] = json.dumps({field: item})
+                conditions.append(
+                    f"({' OR '.join(in_conditions)})" if in_conditions else "FALSE"
+                )
+            elif operator in range_operators:
+                conditions.append(
+                    f"CAST(chunk_metadata ->> :{key}_field AS double precision) "
+                    f"{range_operators[operator]} :{key}"
+                )
+                params[f"{key}_field"] = field
+                params[key] = float(value)
+            else:
+                raise ValueError(f"Unsupported filter operator: {operator}")
+
+        return conditions, params
+
+    # search method
+    async def search(
+        self,
+        project_id: int,
+        text: str,
+        limit: int,
+        filters: List[dict] = None,
+    ) -> List[RetrievedDocument]:
+        if not text or not text.strip() or not self.languages:
+            return []
+
+        # the tsvector expressions must match the index definitions exactly
+        queries = [
+            f"websearch_to_tsquery('{language}', :text) AS query_{i}"
+            for i, language in enumerate(self.languages)
+        ]
+        matches = [
+            f"to_tsvector('{language}'::regconfig, chunk_text) @@ query_{i}"
+            for i, language in enumerate(self.languages)
+        ]
+        ranks = [
+            f"ts_rank_cd(to_tsvector('{language}'::regconfig, chunk_text), query_{i})"
+            for i, language in enumerate(self.languages)
+        ]
+
+        filter_conditions, filter_params = self.get_filter_conditions(filters=filters)
+        conditions = ["chunk_project_id = :project_id", f"({' OR '.join(matches)})"]
+        conditions += filter_conditions
+
+        search_sql = sql_text(
+            f"""
+            SELECT chunk_id, chunk_text AS text, chunk_metadata, chunk_asset_id,
+                chunk_order, GREATEST({', '.join(ranks)}) AS score
+            FROM chunks, {', '.join(queries)}
+            WHERE {' AND '.join(conditions)}
+            ORDER BY score DESC
+            LIMIT :limit
+            """
+        )
+
+        async with self.db_client() as session:
+            result = await session.execute(
+                search_sql,
+                {
+                    "text": text,
+                    "project_id": project_id,
+                    "limit": limit,
+                    **filter_params,
+                },
+            )
+            records = result.fetchall()
+
+        return [
+            RetrievedDocument(
+                text=record.text,
+                score=record.score,
+                chunk_id=record.chunk_id,
+                metadata={
+                    **(record.chunk_metadata or {}),
+                    VectorMetadataEnums.ASSET_ID.value: record.chunk_asset_id,
+                    VectorMetadataEnums.CHUNK_ORDER.value: record.chunk_order,
+                },
+            )
+            for record in records
+        ]
@@ -0,0 +1,2 @@
+from .PGLexicalProvider import PGLexicalProvider
+from .BM25LexicalProvider import BM25LexicalProvider
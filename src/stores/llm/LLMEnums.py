@@ -20,6 +20,15 @@ class CohereEnums(Enum):
     DOCUMENT = "search_document"
     QUERY = "search_query"
 
+    TEXT_GENERATION_EVENT = "text-generation"
+
+
+class StreamEventEnums(Enum):
+    RETRIEVAL = "retrieval"
+    TOKEN = "token"
+    DONE = "done"
+    ERROR = "error"
+
 
 class DocumentTypeEnums(Enum):
     DOCUMENT = "document"
@@ -18,6 +18,11 @@ class LLMProviderFactory:
                 default_input_max_characters=self.config.INPUT_DEFAULT_MAX_CHARACTERS,
                 default_generation_max_output_tokens=self.config.GENERATION_DEFAULT_MAX_TOKENS,
                 default_generation_temperature=self.config.GENERATION_DEFAULT_TEMPERATURE,
+                http_timeout=self.config.LLM_HTTP_TIMEOUT,
+                http_connect_timeout=self.config.LLM_HTTP_CONNECT_TIMEOUT,
+                http_max_connections=self.config.LLM_HTTP_MAX_CONNECTIONS,
+                http_max_keepalive_connections=self.config.LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                http_keepalive_expiry=self.config.LLM_HTTP_KEEPALIVE_EXPIRY,
             )
 
         if provider == LLMEnums.COHERE.value:
@@ -26,6 +31,11 @@ class LLMProviderFactory:
                 default_input_max_characters=self.config.INPUT_DEFAULT_MAX_CHARACTERS,
                 default_generation_max_output_tokens=self.config.GENERATION_DEFAULT_MAX_TOKENS,
                 default_generation_temperature=self.config.GENERATION_DEFAULT_TEMPERATURE,
+                http_timeout=self.config.LLM_HTTP_TIMEOUT,
+                http_connect_timeout=self.config.LLM_HTTP_CONNECT_TIMEOUT,
+                http_max_connections=self.config.LLM_HTTP_MAX_CONNECTIONS,
+                http_max_keepalive_connections=self.config.LLM_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                http_keepalive_expiry=self.config.LLM_HTTP_KEEPALIVE_EXPIRY,
             )
 
         return None
@@ -0,0 +1,213 @@
+from stores.llm.LLMInterface import LLMInterface
+from stores.llm.LLMEnums import DocumentTypeEnums
+from collections import Counter
+from typing import List, Union
+import asyncio
+import logging
+
+
+class BatchingEmbeddingClient(LLMInterface):
+    """
+    Wraps any LLMInterface embedding client with a micro-batching dispatcher.
+
+    Concurrent small `embed_text_async` calls of the same document type are
+    held for up to `window_ms` (or until `max_batch_size` texts are waiting),
+    sent to the provider as one batched call, and the vectors are fanned
+    back out to the waiting callers. Calls that are already large batches,
+    like indexing pages, go straight to the provider.
+    """
+
+    def __init__(
+        self,
+        embedding_client: LLMInterface,
+        window_ms: float = 5,
+        max_batch_size: int = 64,
+    ):
+        self.embedding_client = embedding_client
+        self.window_seconds = window_ms / 1000
+        self.max_batch_size = max_batch_size
+
+        # document_type -> [(texts, future)] waiting for the next flush
+        self.pending = {}
+        self.pending_sizes = {}
+        self.flush_handles = {}
+        # keeps in-flight provider calls referenced until they finish
+        self.dispatch_tasks = set()
+
+        self.requests = 0
+        self.batches = 0
+        self.batch_sizes = Counter()
+
+        self.logger = logging.getLogger("uvicorn")
+
+    def __getattr__(self, name):
+        # only reached for attributes not defined on the wrapper itself
+        return getattr(self.embedding_client, name)
+
+    # set_generation_model method
+    def set_generation_model(self, model_id: str):
+        self.embedding_client.set_generation_model(model_id=model_id)
+
+    # set_embedding_model method
+    def set_embedding_model(self, model_id: str, embedding_size: int):
+        self.embedding_client.set_embedding_model(
+            model_id=model_id, embedding_size=embedding_size
+        )
+
+    # generate_text method
+    def generate_text(
+        self,
+        prompt: str,
+        chat_history: list = [],
+        max_output_tokens: int = None,
+        temperature: float = None,
+    ):
+        return self.embedding_client.generate_text(
+            prompt=prompt,
+            chat_history=chat_history,
+            max_output_tokens=max_output_tokens,
+            temperature=temperature,
+        )
+
+    # generate_text_async method
+    async def generate_text_async(
+        self,
+        prompt: str,
+        chat_history: list = [],
+        max_output_tokens: int = None,
+        temperature: float = None,
+    ):
+        return await self.embedding_client.generate_text_async(
+            prompt=prompt,
+            chat_history=chat_history,
+            max_output_tokens=max_output_tokens,
+            temperature=temperature,
+        )
+
+    # generate_text_stream method
+    async def generate_text_stream(
+        self,
+        prompt: str,
+        chat_history: list = [],
+        max_output_tokens: int = None,
+        temperature: float = None,
+    ):
+        stream = self.embedding_client.generate_text_stream(
+            prompt=prompt,
+            chat_history=chat_history,
+            max_output_tokens=max_output_tokens,
+            temperature=temperature,
+        )
+        try:
+            async for text in stream:
+                yield text
+        finally:
+            await stream.aclose()
+
+    # construct_prompt method
+    def construct_prompt(self, prompt: str, role: str):
+        return self.embedding_client.construct_prompt(prompt=prompt, role=role)
+
+    # embed_text method
+    def embed_text(self, text: Union[str, List[str]], document_type: str = None):
+        # the sync path has no event loop to wait on, it is not batched
+        return self.embedding_client.embed_text(text=text, document_type=document_type)
+
+    # embed_text_async method
+    async def embed_text_async(
+        self, text: Union[str, List[str]], document_type: str = None
+    ):
+        texts = [text] if isinstance(text, str) else list(text)
+        document_type = (
+            document_type if document_type else DocumentTypeEnums.DOCUMENT.value
+        )
+
+        if len(texts) == 0 or len(texts) >= self.max_batch_size:
+            return await self.embedding_client.embed_text_async(
+                text=texts, document_type=document_type
+            )
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.requests += 1
+
+        if document_type not in self.pending:
+            self.pending[document_type] = []
+            self.pending_sizes[document_type] = 0
+            self.flush_handles[document_type] = loop.call_later(
+                self.window_seconds, self.flush, document_type
+            )
+
+        self.pending[document_type].append((texts, future))
+        self.pending_sizes[document_type] += len(texts)
+
+        if self.pending_sizes[document_type] >= self.max_batch_size:
+            self.flush(document_type)
+
+        return await future
+
+    # flush method
+    def flush(self, document_type: str):
+        items = self.pending.pop(document_type, None)
+        self.pending_sizes.pop(document_type, None)
+        handle = self.flush_handles.pop(document_type, None)
+        if handle is not None:
+            handle.cancel()
+
+        if items:
+            task = asyncio.ensure_future(self.dispatch(items, document_type))
+            self.dispatch_tasks.add(task)
+            task.add_done_callback(self.dispatch_tasks.discard)
+
+    # dispatch method
+    async def dispatch(self, items: List[tuple], document_type: str):
+        texts = [t for item_texts, _ in items for t in item_texts]
+        self.batches += 1
+        self.batch_sizes[len(texts)] += 1
+
+        try:
+            vectors = await self.embedding_client.embed_text_async(
+                text=texts, document_type=document_type
+            )
+        except Exception as e:
+            for _, future in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        if not vectors or len(vectors) != len(texts):
+            self.logger.error(
+                f"Embedding batch of {len(texts)} texts returned "
+                f"{len(vectors) if vectors else 0} vectors"
+            )
+            vectors = None
+
+        start = 0
+        for item_texts, future in items:
+            if not future.done():
+                future.set_result(
+                    vectors[start : start + len(item_texts)] if vectors else None
+                )
+            start += len(item_texts)
+
+    # get_stats method
+    def get_stats(self):
+        return {
+            "requests": self.requests,
+            "batches": self.batches,
+            "mean_batch_size": (
+                sum(size * count for size, count in self.batch_sizes.items())
+                / self.batches
+                if self.batches
+                else 0.0
+            ),
+            "batch_size_distribution": {
+                str(size): count for size, count in sorted(self.batch_sizes.items())
+            },
+        }
+
+    # close method
+    async def close(self):
+        for document_type in list(self.pending):
+            self.flush(document_type)
+        await self.embedding_client.close()
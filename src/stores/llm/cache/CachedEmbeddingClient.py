@@ -0,0 +1,255 @@
+from stores.llm.LLMInterface import LLMInterface
+from stores.llm.LLMEnums import DocumentTypeEnums
+from .EmbeddingCacheInterface import EmbeddingCacheInterface
+from .LRUEmbeddingCache import LRUEmbeddingCache
+from array import array
+from typing import List, Union
+import hashlib
+import logging
+
+
+class CachedEmbeddingClient(LLMInterface):
+    """
+    Wraps any LLMInterface embedding client with a content-addressed cache.
+
+    Entries are keyed by (provider, model_id, document_type, sha256(text)) and
+    looked up in an in-memory LRU first, then in the persistent backend. Only
+    the remaining misses are sent to the provider, in one batched call.
+    """
+
+    def __init__(
+        self,
+        embedding_client: LLMInterface,
+        provider: str,
+        cache_backend: EmbeddingCacheInterface = None,
+        memory_max_size_bytes: int = 64 * 1048576,
+    ):
+        self.embedding_client = embedding_client
+        self.provider = provider
+        self.cache_backend = cache_backend
+        self.memory_cache = LRUEmbeddingCache(max_size_bytes=memory_max_size_bytes)
+
+        self.memory_hits = 0
+        self.backend_hits = 0
+        self.misses = 0
+        self.provider_calls = 0
+
+        self.logger = logging.getLogger(__name__)
+
+    def __getattr__(self, name):
+        # only reached for attributes not defined on the wrapper itself
+        return getattr(self.embedding_client, name)
+
+    # connect method
+    async def connect(self):
+        if self.cache_backend:
+            await self.cache_backend.connect()
+
+    # set_generation_model method
+    def set_generation_model(self, model_id: str):
+        self.embedding_client.set_generation_model(model_id=model_id)
+
+    # set_embedding_model method
+    def set_embedding_model(self, model_id: str, embedding_size: int):
+        self.embedding_client.set_embedding_model(
+            model_id=model_id, embedding_size=embedding_size
+        )
+
+    # generate_text method
+    def generate_text(
+        self,
+        prompt: str,
+        chat_history: list = [],
+        max_output_tokens: int = None,
+        temperature: float = None,
+    ):
+        return self.embedding_client.generate_text(
+            prompt=prompt,
+            chat_history=chat_history,
+            max_output_tokens=max_output_tokens,
+            temperature=temperature,
+        )
+
+    # generate_text_async method
+    async def generate_text_async(
+        self,
+        prompt: str,
+        chat_history: list = [],
+        max_output_tokens: int = None,
+        temperature: float = None,
+    ):
+        return await self.embedding_client.generate_text_async(
+            prompt=prompt,
+            chat_history=chat_history,
+            max_output_tokens=max_output_tokens,
+            temperature=temperature,
+        )
+
+    # generate_text_stream method
+    async def generate_text_stream(
+        self,
+        prompt: str,
+        chat_history: list = [],
+        max_output_tokens: int = None,
+        temperature: float = None,
+    ):
+        stream = self.embedding_client.generate_text_stream(
+            prompt=prompt,
+            chat_history=chat_history,
+            max_output_tokens=max_output_tokens,
+            temperature=temperature,
+        )
+        try:
+            async for text in stream:
+                yield text
+        finally:
+            await stream.aclose()
+
+    # construct_prompt method
+    def construct_prompt(self, prompt: str, role: str):
+        return self.embedding_client.construct_prompt(prompt=prompt, role=role)
+
+    # create_cache_entry method
+    def create_cache_entry(self, text: str, document_type: str):
+        text_hash = hashlib.sha256(text.encode("utf-8")).hexdigest()
+        model_id = str(self.embedding_client.embedding_model_id)
+        cache_key = hashlib.sha256(
+            "\x1f".join([self.provider, model_id, document_type, text_hash]).encode(
+                "utf-8"
+            )
+        ).hexdigest()
+
+        return {
+            "cache_key": cache_key,
+            "provider": self.provider,
+            "model_id": model_id,
+            "document_type": document_type,
+            "text_hash": text_hash,
+        }
+
+    # encode_vector method
+    def encode_vector(self, vector: list) -> bytes:
+        return array("f", vector).tobytes()
+
+    # decode_vector method
+    def decode_vector(self, embedding: bytes) -> list:
+        vector = array("f")
+        vector.frombytes(embedding)
+        return vector.tolist()
+
+    # prepare_lookup method
+    def prepare_lookup(self, text: Union[str, List[str]], document_type: str):
+        if isinstance(text, str):
+            text = [text]
+
+        document_type = (
+            document_type if document_type else DocumentTypeEnums.DOCUMENT.value
+        )
+        entries = [self.create_cache_entry(t, document_type) for t in text]
+        found = self.memory_cache.get_many([e["cache_key"] for e in entries])
+        self.memory_hits += sum(1 for e in entries if e["cache_key"] in found)
+
+        return text, document_type, entries, found
+
+    # collect_misses method
+    def collect_misses(self, text: List[str], entries: List[dict], found: dict):
+        # identical texts inside one call are embedded once
+        misses = {}
+        for t, entry in zip(text, entries):
+            if entry["cache_key"] not in found and entry["cache_key"] not in misses:
+                misses[entry["cache_key"]] = (t, entry)
+
+        return list(misses.values())
+
+    # embed_text method
+    def embed_text(self, text: Union[str, List[str]], document_type: str = None):
+        # the sync path has no event loop for the persistent backend,
+        # so it only uses the in-memory front
+        text, document_type, entries, found = self.prepare_lookup(
+            text=text, document_type=document_type
+        )
+
+        misses = self.collect_misses(text=text, entries=entries, found=found)
+        if len(misses):
+            self.misses += len(misses)
+            self.provider_calls += 1
+            vectors = self.embedding_client.embed_text(
+                text=[t for t, _ in misses], document_type=document_type
+            )
+            if not vectors or len(vectors) != len(misses):
+                return None
+
+            new_records = {
+                entry["cache_key"]: self.encode_vector(vector)
+                for (_, entry), vector in zip(misses, vectors)
+            }
+            self.memory_cache.set_many(new_records)
+            found.update(new_records)
+
+        return [self.decode_vector(found[e["cache_key"]]) for e in entries]
+
+    # embed_text_async method
+    async def embed_text_async(
+        self, text: Union[str, List[str]], document_type: str = None
+    ):
+        text, document_type, entries, found = self.prepare_lookup(
+            text=text, document_type=document_type
+        )
+
+        if self.cache_backend and len(found) < len(entries):
+            missing_keys = list(
+                {e["cache_key"] for e in entries if e["cache_key"] not in found}
+            )
+            backend_records = await self.cache_backend.get_many(missing_keys)
+            if backend_records:
+                self.memory_cache.set_many(backend_records)
+                found.update(backend_records)
+                self.backend_hits += sum(
+                    1 for e in entries if e["cache_key"] in backend_records
+                )
+
+        misses = self.collect_misses(text=text, entries=entries, found=found)
+        if len(misses):
+            self.misses += len(misses)
+            self.provider_calls += 1
+            vectors = await self.embedding_client.embed_text_async(
+                text=[t for t, _ in misses], document_type=document_type
+            )
+            if not vectors or len(vectors) != len(misses):
+                return None
+
+            new_entries = [
+                {**entry, "embedding": self.encode_vector(vector)}
+                for (_, entry), vector in zip(misses, vectors)
+            ]
+            new_records = {e["cache_key"]: e["embedding"] for e in new_entries}
+            self.memory_cache.set_many(new_records)
+            found.update(new_records)
+
+            if self.cache_backend:
+                try:
+                    await self.cache_backend.set_many(new_entries)
+                except Exception as e:
+                    self.logger.error(f"Error while storing embeddings in cache: {e}")
+
+        return [self.decode_vector(found[e["cache_key"]]) for e in entries]
+
+    # get_stats method
+    def get_stats(self):
+        hits = self.memory_hits + self.backend_hits
+        lookups = hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "backend_hits": self.backend_hits,
+            "misses": self.misses,
+            "provider_calls": self.provider_calls,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "memory_items": len(self.memory_cache),
+            "memory_size_bytes": self.memory_cache.size_bytes,
+        }
+
+    # close method
+    async def close(self):
+        if self.cache_backend:
+            await self.cache_backend.disconnect()
+        await self.embedding_client.close()
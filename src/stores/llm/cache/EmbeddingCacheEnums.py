@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class EmbeddingCacheEnums(Enum):
+    POSTGRES = "POSTGRES"
+    DISK = "DISK"
+    MEMORY = "MEMORY"
@@ -0,0 +1,23 @@
+from stores.llm.cache.providers import DiskEmbeddingCache, PGEmbeddingCache
+from stores.llm.cache.EmbeddingCacheEnums import EmbeddingCacheEnums
+from controllers.BaseController import BaseController
+from sqlalchemy.orm import sessionmaker
+
+
+class EmbeddingCacheFactory:
+    def __init__(self, config, db_client: sessionmaker = None):
+        self.config = config
+        self.base_controller = BaseController()
+        self.db_client = db_client
+
+    def create(self, backend: str):
+        if backend == EmbeddingCacheEnums.DISK.value:
+            db_path = self.base_controller.get_or_create_database_path(
+                db_name=self.config.EMBEDDING_CACHE_PATH
+            )
+            return DiskEmbeddingCache(db_path=db_path)
+
+        if backend == EmbeddingCacheEnums.POSTGRES.value:
+            return PGEmbeddingCache(db_client=self.db_client)
+
+        return None
@@ -0,0 +1,21 @@
+from abc import ABC, abstractmethod
+from typing import Dict, List
+
+
+class EmbeddingCacheInterface(ABC):
+
+    @abstractmethod
+    async def connect(self):
+        pass
+
+    @abstractmethod
+    async def disconnect(self):
+        pass
+
+    @abstractmethod
+    async def get_many(self, cache_keys: List[str]) -> Dict[str, bytes]:
+        pass
+
+    @abstractmethod
+    async def set_many(self, entries: List[dict]):
+        pass
@@ -0,0 +1,43 @@
+from collections import OrderedDict
+from typing import Dict, List
+
+
+class LRUEmbeddingCache:
+    """
+    In-memory front of the embedding cache, bounded by the total size of the
+    stored vectors rather than by the number of entries.
+    """
+
+    def __init__(self, max_size_bytes: int):
+        self.max_size_bytes = max_size_bytes
+        self.size_bytes = 0
+        self.entries = OrderedDict()
+
+    def get_many(self, cache_keys: List[str]) -> Dict[str, bytes]:
+        records = {}
+        for cache_key in cache_keys:
+            embedding = self.entries.get(cache_key)
+            if embedding is not None:
+                self.entries.move_to_end(cache_key)
+                records[cache_key] = embedding
+
+        return records
+
+    def set_many(self, records: Dict[str, bytes]):
+        for cache_key, embedding in records.items():
+            if len(embedding) > self.max_size_bytes:
+                continue
+
+            previous = self.entries.pop(cache_key, None)
+            if previous is not None:
+                self.size_bytes -= len(previous)
+
+            self.entries[cache_key] = embedding
+            self.size_bytes += len(embedding)
+
+        while self.size_bytes > self.max_size_bytes and len(self.entries):
+            _, evicted = self.entries.popitem(last=False)
+            self.size_bytes -= len(evicted)
+
+    def __len__(self):
+        return len(self.entries)
@@ -0,0 +1,83 @@
+from ..EmbeddingCacheInterface import EmbeddingCacheInterface
+from typing import Dict, List
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+
+
+class DiskEmbeddingCache(EmbeddingCacheInterface):
+
+    def __init__(self, db_path: str, lookup_batch_size: int = 500):
+        self.db_path = db_path
+        self.db_file = os.path.join(self.db_path, "embeddings.sqlite3")
+        self.lookup_batch_size = lookup_batch_size
+
+        self.connection = None
+        self.lock = threading.Lock()
+        self.logger = logging.getLogger("uvicorn")
+
+    # connect method
+    async def connect(self):
+        self.connection = await asyncio.to_thread(self._open)
+
+    def _open(self):
+        connection = sqlite3.connect(self.db_file, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS embedding_cache ("
+            "cache_key TEXT PRIMARY KEY, "
+            "provider TEXT, "
+            "model_id TEXT, "
+            "document_type TEXT, "
+            "text_hash TEXT, "
+            "embedding BLOB NOT NULL"
+            ")"
+        )
+        connection.commit()
+        return connection
+
+    # disconnect method
+    async def disconnect(self):
+        if self.connection:
+            self.connection.close()
+        self.connection = None
+
+    # get_many method
+    async def get_many(self, cache_keys: List[str]) -> Dict[str, bytes]:
+        if not cache_keys:
+            return {}
+        return await asyncio.to_thread(self._get_many, cache_keys)
+
+    def _get_many(self, cache_keys: List[str]) -> Dict[str, bytes]:
+        records = {}
+        with self.lock:
+            for i in range(0, len(cache_keys), self.lookup_batch_size):
+                batch_keys = cache_keys[i : i + self.lookup_batch_size]
+                placeholders = ",".join(["?"] * len(batch_keys))
+                rows = self.connection.execute(
+                    "SELECT cache_key, embedding FROM embedding_cache "
+                    f"WHERE cache_key IN ({placeholders})",
+                    batch_keys,
+                ).fetchall()
+                records.update({row[0]: row[1] for row in rows})
+
+        return records
+
+    # set_many method
+    async def set_many(self, entries: List[dict]):
+        if not entries:
+            return True
+        return await asyncio.to_thread(self._set_many, entries)
+
+    def _set_many(self, entries: List[dict]):
+        with self.lock:
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO embedding_cache "
+                "(cache_key, provider, model_id, document_type, text_hash, embedding) "
+                "VALUES (:cache_key, :provider, :model_id, :document_type, :text_hash, :embedding)",
+                entries,
+            )
+            self.connection.commit()
+        return True
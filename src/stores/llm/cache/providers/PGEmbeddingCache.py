@@ -0,0 +1,55 @@
+from ..EmbeddingCacheInterface import EmbeddingCacheInterface
+from models.db_schemes import EmbeddingCacheEntry
+from sqlalchemy.future import select
+from sqlalchemy.dialects.postgresql import insert
+from typing import Dict, List
+import logging
+
+
+class PGEmbeddingCache(EmbeddingCacheInterface):
+
+    def __init__(self, db_client, lookup_batch_size: int = 500):
+        self.db_client = db_client
+        self.lookup_batch_size = lookup_batch_size
+        self.logger = logging.getLogger("uvicorn")
+
+    # connect method
+    async def connect(self):
+        pass
+
+    # disconnect method
+    async def disconnect(self):
+        pass
+
+    # get_many method
+    async def get_many(self, cache_keys: List[str]) -> Dict[str, bytes]:
+        records = {}
+        if not cache_keys:
+            return records
+
+        async with self.db_client() as session:
+            for i in range(0, len(cache_keys), self.lookup_batch_size):
+                batch_keys = cache_keys[i : i + self.lookup_batch_size]
+                statement = select(
+                    EmbeddingCacheEntry.cache_key, EmbeddingCacheEntry.embedding
+                ).where(EmbeddingCacheEntry.cache_key.in_(batch_keys))
+                result = await session.execute(statement)
+                records.update({row.cache_key: row.embedding for row in result})
+
+        return records
+
+    # set_many method
+    async def set_many(self, entries: List[dict]):
+        if not entries:
+            return True
+
+        async with self.db_client() as session:
+            async with session.begin():
+                statement = (
+                    insert(EmbeddingCacheEntry)
+                    .values(entries)
+                    .on_conflict_do_nothing(index_elements=["cache_key"])
+                )
+                await session.execute(statement)
+
+        return True
@@ -0,0 +1,2 @@
+from .DiskEmbeddingCache import DiskEmbeddingCache
+from .PGEmbeddingCache import PGEmbeddingCache
@@ -0,0 +1,155 @@
+from .TokenCounter import TokenCounter
+from stores.vectordb.VectorDBEnums import VectorMetadataEnums
+from models.db_schemes import RetrievedDocument
+from typing import List
+import re
+
+SHINGLE_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+class ContextPacker:
+    """
+    Picks the retrieved documents that go into the RAG prompt under a token
+    budget:
+
+    - near-duplicates (word-shingle Jaccard >= `duplicate_threshold`) of a
+      better scored document are dropped,
+    - chunks of the same asset with consecutive `chunk_order` are merged into
+      one passage, with the overlap between them removed,
+    - passages are then added greedily by score until the budget is spent,
+      the first one that does not fit is cut to the remaining budget.
+    """
+
+    def __init__(
+        self,
+        token_counter: TokenCounter,
+        duplicate_threshold: float = 0.9,
+        merge_adjacent: bool = True,
+        min_truncated_tokens: int = 64,
+        max_overlap_characters: int = 1000,
+    ):
+        self.token_counter = token_counter
+        self.duplicate_threshold = duplicate_threshold
+        self.merge_adjacent = merge_adjacent
+        self.min_truncated_tokens = min_truncated_tokens
+        self.max_overlap_characters = max_overlap_characters
+
+    # get_shingles method
+    def get_shingles(self, text: str, size: int = 3) -> set:
+        words = SHINGLE_PATTERN.findall(text.casefold())
+        if len(words) < size:
+            return {tuple(words)}
+        return {tuple(words[i : i + size]) for i in range(len(words) - size + 1)}
+
+    # drop_duplicates method
+    def drop_duplicates(
+        self, documents: List[RetrievedDocument]
+    ) -> List[RetrievedDocument]:
+        kept, kept_shingles = [], []
+        for document in documents:
+            shingles = self.get_shingles(document.text)
+            is_duplicate = any(
+                len(shingles & other) / max(len(shingles | other), 1)
+                >= self.duplicate_threshold
+                for other in kept_shingles
+            )
+            if not is_duplicate:
+                kept.append(document)
+                kept_shingles.append(shingles)
+
+        return kept
+
+    # join_overlapping method
+    def join_overlapping(self, first: str, second: str) -> str:
+        # chunks are cut with an overlap, keep the shared part only once
+        max_overlap = min(len(first), len(second), self.max_overlap_characters)
+        for size in range(max_overlap, 0, -1):
+            if first.endswith(second[:size]):
+                return first + second[size:]
+        return f"{first}\n{second}"
+
+    # merge_adjacent_chunks method
+    def merge_adjacent_chunks(
+        self, documents: List[RetrievedDocument]
+    ) -> List[RetrievedDocument]:
+        asset_key = VectorMetadataEnums.ASSET_ID.value
+        order_key = VectorMetadataEnums.CHUNK_ORDER.value
+
+        groups, passages = {}, []
+        for document in documents:
+            metadata = document.metadata or {}
+            if metadata.get(asset_key) is None or metadata.get(order_key) is None:
+                passages.append(document)
+                continue
+            groups.setdefault(metadata[asset_key], []).append(document)
+
+        for asset_documents in groups.values():
+            asset_documents.sort(key=lambda d: d.metadata[order_key])
+            run = [asset_documents[0]]
+            for document in asset_documents[1:]:
+                if document.metadata[order_key] == run[-1].metadata[order_key] + 1:
+                    run.append(document)
+                    continue
+                passages.append(self.merge_run(run))
+                run = [document]
+            passages.append(self.merge_run(run))
+
+        return sorted(passages, key=lambda d: d.score, reverse=True)
+
+    # merge_run method
+    def merge_run(self, run: List[RetrievedDocument]) -> RetrievedDocument:
+        if len(run) == 1:
+            return run[0]
+
+        text = run[0].text
+        for document in run[1:]:
+            text = self.join_overlapping(text, document.text)
+
+        return run[0].model_copy(
+            update={
+                "text": text,
+                "score": max(d.score for d in run),
+                "metadata": {
+                    **(run[0].metadata or {}),
+                    "merged_chunk_orders": [
+                        d.metadata[VectorMetadataEnums.CHUNK_ORDER.value] for d in run
+                    ],
+                },
+            }
+        )
+
+    # pack method
+    def pack(
+        self,
+        documents: List[RetrievedDocument],
+        token_budget: int,
+        document_overhead_tokens: int = 0,
+    ):
+        """
+        Returns the documents to send, best first, and the tokens they use
+        including `document_overhead_tokens` per document for its template.
+        """
+        passages = sorted(documents, key=lambda d: d.score, reverse=True)
+        if self.duplicate_threshold:
+            passages = self.drop_duplicates(passages)
+        if self.merge_adjacent:
+            passages = self.merge_adjacent_chunks(passages)
+
+        packed, used_tokens = [], 0
+        for passage in passages:
+            remaining = token_budget - used_tokens - document_overhead_tokens
+            if remaining <= 0:
+                break
+
+            text = passage.text.strip()
+            tokens = self.token_counter.count(text)
+            if tokens > remaining:
+                if remaining < self.min_truncated_tokens:
+                    continue
+                text = self.token_counter.truncate(text, remaining)
+                tokens = self.token_counter.count(text)
+
+            packed.append(passage.model_copy(update={"text": text}))
+            used_tokens += tokens + document_overhead_tokens
+
+        return packed, used_tokens
@@ -0,0 +1,89 @@
+from collections import OrderedDict
+import hashlib
+import logging
+import re
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+# rough stand-in when no BPE encoding is available: words and punctuation
+APPROXIMATE_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+
+class TokenCounter:
+    """
+    Counts tokens with the target model's tiktoken encoding, remembering the
+    counts of recently seen texts so retrieved chunks are encoded once.
+
+    Falls back to an approximate word/punctuation count when tiktoken or
+    the encoding files are not available.
+    """
+
+    def __init__(
+        self,
+        model_id: str = None,
+        encoding_name: str = "cl100k_base",
+        max_cached_texts: int = 50000,
+    ):
+        self.max_cached_texts = max_cached_texts
+        self.counts = OrderedDict()
+        self.logger = logging.getLogger("uvicorn")
+        self.encoding = self.load_encoding(model_id=model_id, encoding_name=encoding_name)
+
+    # load_encoding method
+    def load_encoding(self, model_id: str, encoding_name: str):
+        if tiktoken is None:
+            self.logger.warning("tiktoken is not installed, token counts are approximate")
+            return None
+
+        try:
+            return tiktoken.encoding_for_model(model_id)
+        except Exception:
+            pass
+
+        try:
+            return tiktoken.get_encoding(encoding_name)
+        except Exception as e:
+            self.logger.warning(
+                f"Can not load tiktoken encoding {encoding_name}, "
+                f"token counts are approximate: {e}"
+            )
+            return None
+
+    # count method
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+
+        key = hashlib.sha1(text.encode("utf-8")).digest()
+        count = self.counts.get(key)
+        if count is not None:
+            self.counts.move_to_end(key)
+            return count
+
+        if self.encoding is not None:
+            count = len(self.encoding.encode(text, disallowed_special=()))
+        else:
+            count = len(APPROXIMATE_TOKEN_PATTERN.findall(text))
+
+        self.counts[key] = count
+        while len(self.counts) > self.max_cached_texts:
+            self.counts.popitem(last=False)
+
+        return count
+
+    # truncate method
+    def truncate(self, text: str, max_tokens: int) -> str:
+        if max_tokens <= 0:
+            return ""
+
+        if self.encoding is not None:
+            tokens = self.encoding.encode(text, disallowed_special=())
+            return self.encoding.decode(tokens[:max_tokens])
+
+        matches = list(APPROXIMATE_TOKEN_PATTERN.finditer(text))
+        if len(matches) <= max_tokens:
+            return text
+        return text[: matches[max_tokens].start()]
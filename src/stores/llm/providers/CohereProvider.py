@@ -1,6 +1,7 @@
 from stores.llm.LLMInterface import LLMInterface
 from stores.llm.LLMEnums import CohereEnums, DocumentTypeEnums
 import cohere
+import httpx
 import logging
 from typing import List, Union
 
@@ -13,6 +14,11 @@ class CohereProvider(LLMInterface):
         default_input_max_characters: int = 1000,
         default_generation_max_output_tokens: int = 1000,
         default_generation_temperature: float = 0.1,
+        http_timeout: float = 60.0,
+        http_connect_timeout: float = 10.0,
+        http_max_connections: int = 100,
+        http_max_keepalive_connections: int = 20,
+        http_keepalive_expiry: float = 30.0,
     ):
         self.api_key = api_key
 
@@ -27,7 +33,27 @@ class CohereProvider(LLMInterface):
 
         self.enums = CohereEnums
 
-        self.client = cohere.Client(api_key=self.api_key)
+        # one pooled HTTP client per provider, shared by every request
+        http_limits = httpx.Limits(
+            max_connections=http_max_connections,
+            max_keepalive_connections=http_max_keepalive_connections,
+            keepalive_expiry=http_keepalive_expiry,
+        )
+        http_timeout = httpx.Timeout(http_timeout, connect=http_connect_timeout)
+
+        self.http_client = httpx.Client(limits=http_limits, timeout=http_timeout)
+        self.async_http_client = httpx.AsyncClient(
+            limits=http_limits, timeout=http_timeout
+        )
+
+        self.client = cohere.Client(
+            api_key=self.api_key,
+            httpx_client=self.http_client,
+        )
+        self.async_client = cohere.AsyncClient(
+            api_key=self.api_key,
+            httpx_client=self.async_http_client,
+        )
 
         self.logger = logging.getLogger(__name__)
 
@@ -44,19 +70,14 @@ class CohereProvider(LLMInterface):
     def process_text(self, text: str):
         return text[: self.default_input_max_characters].strip()
 
-    # generate_text method
-    def generate_text(
+    # build_generation_request method
+    def build_generation_request(
         self,
         prompt: str,
         chat_history: list = [],
         max_output_tokens: int = None,
         temperature: float = None,
     ):
-
-        if not self.client:
-            self.logger.error("Cohere client was not set")
-            return None
-
         if not self.generation_model_id:
             self.logger.error("Generation model for Cohere was not set")
             return None
@@ -70,20 +91,104 @@ class CohereProvider(LLMInterface):
             temperature if temperature else self.default_generation_temperature
         )
 
-        response = self.client.chat(
-            model=self.generation_model_id,
-            chat_history=chat_history,
-            message=self.process_text(prompt),
-            temperature=temperature,
-            max_tokens=max_output_tokens,
-        )
+        return {
+            "model": self.generation_model_id,
+            "chat_history": chat_history,
+            "message": self.process_text(prompt),
+            "temperature": temperature,
+            "max_tokens": max_output_tokens,
+        }
 
+    # parse_generation_response method
+    def parse_generation_response(self, response):
         if not response or not response.text:
             self.logger.error("Error while generating text with Cohere")
             return None
 
         return response.text
 
+    # generate_text method
+    def generate_text(
+        self,
+        prompt: str,
+        chat_history: list = [],
+        max_output_tokens: int = None,
+        temperature: float = None,
+    ):
+
+        if not self.client:
+            self.logger.error("Cohere client was not set")
+            return None
+
+        request = self.build_generation_request(
+            prompt=prompt,
+            chat_history=chat_history,
+            max_output_tokens=max_output_tokens,
+            temperature=temperature,
+        )
+        if not request:
+            return None
+
+        response = self.client.chat(**request)
+
+        return self.parse_generation_response(response)
+
+    # generate_text_async method
+    async def generate_text_async(
+        self,
+        prompt: str,
+        chat_history: list = [],
+        max_output_tokens: int = None,
+        temperature: float = None,
+    ):
+
+        if not self.async_client:
+            self.logger.error("Cohere async client was not set")
+            return None
+
+        request = self.build_generation_request(
+            prompt=prompt,
+            chat_history=chat_history,
+            max_output_tokens=max_output_tokens,
+            temperature=temperature,
+        )
+        if not request:
+            return None
+
+        response = await self.async_client.chat(**request)
+
+        return self.parse_generation_response(response)
+
+    # generate_text_stream method
+    async def generate_text_stream(
+        self,
+        prompt: str,
+        chat_history: list = [],
+        max_output_tokens: int = None,
+        temperature: float = None,
+    ):
+        if not self.async_client:
+            self.logger.error("Cohere async client was not set")
+            return
+
+        request = self.build_generation_request(
+            prompt=prompt,
+            chat_history=chat_history,
+            max_output_tokens=max_output_tokens,
+            temperature=temperature,
+        )
+        if not request:
+            return
+
+        stream = self.async_client.chat_stream(**request)
+        try:
+            async for event in stream:
+                if event.event_type == CohereEnums.TEXT_GENERATION_EVENT.value:
+                    yield event.text
+        finally:
+            # closing the response stops the generation upstream
+            await stream.aclose()
+
     # construct_prompt method
     def construct_prompt(self, prompt: str, role: str):
         return {
@@ -91,12 +196,10 @@ class CohereProvider(LLMInterface):
             "text": prompt,
         }
 
-    # embed_text method
-    def embed_text(self, text: Union[str, List[str]], document_type: str = None):
-        if not self.client:
-            self.logger.error("Cohere client was not set")
-            return None
-
+    # build_embedding_request method
+    def build_embedding_request(
+        self, text: Union[str, List[str]], document_type: str = None
+    ):
         if isinstance(text, str):
             text = [text]
 
@@ -104,20 +207,57 @@ class CohereProvider(LLMInterface):
             self.logger.error("Embedding model for Cohere was not set")
             return None
 
-        input_type = CohereEnums.DOCUMENT
-        if document_type == DocumentTypeEnums.QUERY:
-            input_type = CohereEnums.QUERY
+        input_type = CohereEnums.DOCUMENT.value
+        if document_type == DocumentTypeEnums.QUERY.value:
+            input_type = CohereEnums.QUERY.value
 
-        response = self.client.embed(
-            model=self.embedding_model_id,
-            texts=[self.process_text(t) for t in text],
-            input_type=input_type,
-            embedding_types=["float"],
-            truncate="NONE",
-        )
+        return {
+            "model": self.embedding_model_id,
+            "texts": [self.process_text(t) for t in text],
+            "input_type": input_type,
+            "embedding_types": ["float"],
+            "truncate": "NONE",
+        }
 
+    # parse_embedding_response method
+    def parse_embedding_response(self, response):
         if not response or not response.embeddings or not response.embeddings.float:
             self.logger.error("Error while embedding text with Cohere")
             return None
 
         return [f for f in response.embeddings.float]
+
+    # embed_text method
+    def embed_text(self, text: Union[str, List[str]], document_type: str = None):
+        if not self.client:
+            self.logger.error("Cohere client was not set")
+            return None
+
+        request = self.build_embedding_request(text=text, document_type=document_type)
+        if not request:
+            return None
+
+        response = self.client.embed(**request)
+
+        return self.parse_embedding_response(response)
+
+    # embed_text_async method
+    async def embed_text_async(
+        self, text: Union[str, List[str]], document_type: str = None
+    ):
+        if not self.async_client:
+            self.logger.error("Cohere async client was not set")
+            return None
+
+        request = self.build_embedding_request(text=text, document_type=document_type)
+        if not request:
+            return None
+
+        response = await self.async_client.embed(**request)
+
+        return self.parse_embedding_response(response)
+
+    # close method
+    async def close(self):
+        await self.async_http_client.aclose()
+        self.http_client.close()
@@ -1,5 +1,6 @@
 from stores.llm.LLMInterface import LLMInterface
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
+import httpx
 import logging
 from stores.llm.LLMEnums import OpenAIEnums
 from typing import List, Union
@@ -14,6 +15,11 @@ class OpenAIProvider(LLMInterface):
         default_input_max_characters: int = 1000,
         default_generation_max_output_tokens: int = None,
         default_generation_temperature: float = 0.1,
+        http_timeout: float = 60.0,
+        http_connect_timeout: float = 10.0,
+        http_max_connections: int = 100,
+        http_max_keepalive_connections: int = 20,
+        http_keepalive_expiry: float = 30.0,
     ):
 
         self.api_key = api_key
@@ -30,9 +36,29 @@ class OpenAIProvider(LLMInterface):
 
         self.enums = OpenAIEnums
 
+        # one pooled HTTP client per provider, shared by every request
+        http_limits = httpx.Limits(
+            max_connections=http_max_connections,
+            max_keepalive_connections=http_max_keepalive_connections,
+            keepalive_expiry=http_keepalive_expiry,
+        )
+        http_timeout = httpx.Timeout(http_timeout, connect=http_connect_timeout)
+        base_url = self.api_url if self.api_url and len(self.api_url) else None
+
+        self.http_client = httpx.Client(limits=http_limits, timeout=http_timeout)
+        self.async_http_client = httpx.AsyncClient(
+            limits=http_limits, timeout=http_timeout
+        )
+
         self.client = OpenAI(
             api_key=self.api_key,
-            base_url=self.api_url if self.api_url and len(self.api_url) else None,
+            base_url=base_url,
+            http_client=self.http_client,
+        )
+        self.async_client = AsyncOpenAI(
+            api_key=self.api_key,
+            base_url=base_url,
+            http_client=self.async_http_client,
         )
 
         self.logger = logging.getLogger(__name__)
@@ -43,24 +69,20 @@ class OpenAIProvider(LLMInterface):
 
     # set_embedding_model method
     def set_embedding_model(self, model_id: str, embedding_size: int):
-        self.embedding_model_id = (model_id,)
+        self.embedding_model_id = model_id
         self.embedding_size = embedding_size
 
-    # generate_text method
-    def generate_text(
+    # build_generation_request method
+    def build_generation_request(
         self,
         prompt: str,
-        chat_history: list = [],
+        chat_history: list = None,
         max_output_tokens: int = None,
         temperature: float = None,
     ):
         if chat_history is None:
             chat_history = []
 
-        if not self.client:
-            self.logger.error("OpenAI client was not set")
-            return None
-
         if not self.generation_model_id:
             self.logger.error("Generation model for OpenAI was not set")
             return None
@@ -78,13 +100,15 @@ class OpenAIProvider(LLMInterface):
             self.construct_prompt(prompt=prompt, role=OpenAIEnums.USER.value)
         )
 
-        response = self.client.chat.completions.create(
-            model=self.generation_model_id,
-            messages=chat_history,
-            max_tokens=max_output_tokens,
-            temperature=temperature,
-        )
+        return {
+            "model": self.generation_model_id,
+            "messages": chat_history,
+            "max_tokens": max_output_tokens,
+            "temperature": temperature,
+        }
 
+    # parse_generation_response method
+    def parse_generation_response(self, response):
         if (
             not response
             or not response.choices
@@ -97,24 +121,102 @@ class OpenAIProvider(LLMInterface):
 
         return response.choices[0].message.content
 
-    # embed_text method
-    def embed_text(self, text: Union[str, List[str]], document_type: str = None):
-
+    # generate_text method
+    def generate_text(
+        self,
+        prompt: str,
+        chat_history: list = [],
+        max_output_tokens: int = None,
+        temperature: float = None,
+    ):
         if not self.client:
             self.logger.error("OpenAI client was not set")
             return None
 
+        request = self.build_generation_request(
+            prompt=prompt,
+            chat_history=chat_history,
+            max_output_tokens=max_output_tokens,
+            temperature=temperature,
+        )
+        if not request:
+            return None
+
+        response = self.client.chat.completions.create(**request)
+
+        return self.parse_generation_response(response)
+
+    # generate_text_async method
+    async def generate_text_async(
+        self,
+        prompt: str,
+        chat_history: list = [],
+        max_output_tokens: int = None,
+        temperature: float = None,
+    ):
+        if not self.async_client:
+            self.logger.error("OpenAI async client was not set")
+            return None
+
+        request = self.build_generation_request(
+            prompt=prompt,
+            chat_history=chat_history,
+            max_output_tokens=max_output_tokens,
+            temperature=temperature,
+        )
+        if not request:
+            return None
+
+        response = await self.async_client.chat.completions.create(**request)
+
+        return self.parse_generation_response(response)
+
+    # generate_text_stream method
+    async def generate_text_stream(
+        self,
+        prompt: str,
+        chat_history: list = [],
+        max_output_tokens: int = None,
+        temperature: float = None,
+    ):
+        if not self.async_client:
+            self.logger.error("OpenAI async client was not set")
+            return
+
+        request = self.build_generation_request(
+            prompt=prompt,
+            chat_history=chat_history,
+            max_output_tokens=max_output_tokens,
+            temperature=temperature,
+        )
+        if not request:
+            return
+
+        stream = await self.async_client.chat.completions.create(**request, stream=True)
+        try:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            # closing the response stops the generation upstream
+            await stream.close()
+
+    # build_embedding_request method
+    def build_embedding_request(self, text: Union[str, List[str]]):
         if isinstance(text, str):
             text = [text]
+
         if not self.embedding_model_id:
             self.logger.error("Embedding model for OpenAI was not set")
             return None
 
-        response = self.client.embeddings.create(
-            model=self.embedding_model_id,
-            input=text,
-        )
+        return {
+            "model": self.embedding_model_id,
+            "input": text,
+        }
 
+    # parse_embedding_response method
+    def parse_embedding_response(self, response):
         if (
             not response
             or not response.data
@@ -126,6 +228,38 @@ class OpenAIProvider(LLMInterface):
 
         return [rec.embedding for rec in response.data]
 
+    # embed_text method
+    def embed_text(self, text: Union[str, List[str]], document_type: str = None):
+
+        if not self.client:
+            self.logger.error("OpenAI client was not set")
+            return None
+
+        request = self.build_embedding_request(text=text)
+        if not request:
+            return None
+
+        response = self.client.embeddings.create(**request)
+
+        return self.parse_embedding_response(response)
+
+    # embed_text_async method
+    async def embed_text_async(
+        self, text: Union[str, List[str]], document_type: str = None
+    ):
+
+        if not self.async_client:
+            self.logger.error("OpenAI async client was not set")
+            return None
+
+        request = self.build_embedding_request(text=text)
+        if not request:
+            return None
+
+        response = await self.async_client.embeddings.create(**request)
+
+        return self.parse_embedding_response(response)
+
     # construct_prompt method
     def construct_prompt(self, prompt: str, role: str):
         return {
@@ -135,3 +269,8 @@ class OpenAIProvider(LLMInterface):
 
     def process_text(self, text: str):
         return text[: self.default_input_max_characters].strip()
+
+    # close method
+    async def close(self):
+        await self.async_http_client.aclose()
+        self.http_client.close()
@@ -0,0 +1,11 @@
+from enum import Enum
+
+
+class QueryCacheEnums(Enum):
+    POSTGRES = "POSTGRES"
+    MEMORY = "MEMORY"
+
+
+class QueryCacheKindEnums(Enum):
+    SEARCH = "search"
+    ANSWER = "answer"
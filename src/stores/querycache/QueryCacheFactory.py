@@ -0,0 +1,19 @@
+from stores.querycache.providers import PGQueryCache
+from stores.querycache.QueryCacheEnums import QueryCacheEnums
+from sqlalchemy.orm import sessionmaker
+
+
+class QueryCacheFactory:
+    def __init__(self, config, db_client: sessionmaker = None):
+        self.config = config
+        self.db_client = db_client
+
+    def create(self, backend: str):
+        if backend == QueryCacheEnums.POSTGRES.value:
+            return PGQueryCache(
+                db_client=self.db_client,
+                max_entries_per_project=self.config.QUERY_CACHE_MAX_ENTRIES,
+            )
+
+        # MEMORY runs on the in-process store alone
+        return None
@@ -0,0 +1,34 @@
+from abc import ABC, abstractmethod
+from typing import List
+
+
+class QueryCacheInterface(ABC):
+    """
+    Shared store behind the in-process query cache. Entries are dicts with
+    cache_key, scope_key, project_id, index_version, kind, query_embedding
+    (float32 bytes or None), value and expires_at.
+    """
+
+    @abstractmethod
+    async def connect(self):
+        pass
+
+    @abstractmethod
+    async def disconnect(self):
+        pass
+
+    @abstractmethod
+    async def get(self, cache_key: str) -> dict:
+        pass
+
+    @abstractmethod
+    async def get_scope_entries(self, scope_key: str, limit: int) -> List[dict]:
+        pass
+
+    @abstractmethod
+    async def set(self, entry: dict):
+        pass
+
+    @abstractmethod
+    async def delete_stale(self, project_id: int, index_version: int):
+        pass
@@ -0,0 +1,309 @@
+from .QueryCacheInterface import QueryCacheInterface
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import List
+import numpy as np
+import hashlib
+import logging
+import json
+import time
+
+
+class QueryResultCache:
+    """
+    Two-level cache for search results and RAG answers.
+
+    The exact level is keyed by the normalized query text together with the
+    project, its index version, the result kind and the request parameters
+    (the "scope"). The approximate level reuses, within the same scope, the
+    entry whose query embedding is closest to the new one when their cosine
+    similarity reaches `similarity_threshold`.
+
+    Entries are kept in an in-process TTL/LRU store; an optional shared
+    backend lets several workers reuse each other's entries.
+    """
+
+    def __init__(
+        self,
+        cache_backend: QueryCacheInterface = None,
+        max_entries: int = 10000,
+        ttl_seconds: int = 3600,
+        similarity_threshold: float = None,
+        max_semantic_candidates: int = 1000,
+    ):
+        self.cache_backend = cache_backend
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.max_semantic_candidates = max_semantic_candidates
+
+        # cache_key -> entry, in least recently used order
+        self.entries = OrderedDict()
+        # scope_key -> cache keys of the scope's entries that have an embedding
+        self.scopes = {}
+
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.backend_hits = 0
+        self.misses = 0
+        self.stores = 0
+
+        self.logger = logging.getLogger("uvicorn")
+
+    # connect method
+    async def connect(self):
+        if self.cache_backend:
+            await self.cache_backend.connect()
+
+    # disconnect method
+    async def disconnect(self):
+        self.entries.clear()
+        self.scopes.clear()
+        if self.cache_backend:
+            await self.cache_backend.disconnect()
+
+    # normalize_query method
+    def normalize_query(self, text: str) -> str:
+        return " ".join(text.casefold().split())
+
+    # get_scope_key method
+    def get_scope_key(
+        self, kind: str, project_id: int, index_version: int, params: dict
+    ) -> str:
+        scope = json.dumps(
+            [kind, project_id, index_version, params], sort_keys=True, default=str
+        )
+        return hashlib.sha256(scope.encode("utf-8")).hexdigest()
+
+    # get_cache_key method
+    def get_cache_key(self, scope_key: str, text: str) -> str:
+        return hashlib.sha256(
+            "\x1f".join([scope_key, self.normalize_query(text)]).encode("utf-8")
+        ).hexdigest()
+
+    # normalize_vector method
+    def normalize_vector(self, vector: list) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+    # is_expired method
+    def is_expired(self, entry: dict) -> bool:
+        return entry["expires_at"] <= time.time()
+
+    # store_local method
+    def store_local(self, entry: dict):
+        self.drop_local(entry["cache_key"])
+        self.entries[entry["cache_key"]] = entry
+        if entry["embedding"] is not None:
+            self.scopes.setdefault(entry["scope_key"], OrderedDict())[
+                entry["cache_key"]
+            ] = None
+
+        while len(self.entries) > self.max_entries:
+            self.drop_local(next(iter(self.entries)))
+
+    # drop_local method
+    def drop_local(self, cache_key: str):
+        entry = self.entries.pop(cache_key, None)
+        if entry is None:
+            return
+
+        scope = self.scopes.get(entry["scope_key"])
+        if scope is not None:
+            scope.pop(cache_key, None)
+            if not scope:
+                self.scopes.pop(entry["scope_key"], None)
+
+    # from_backend_entry method
+    def from_backend_entry(self, record: dict) -> dict:
+        embedding = record.get("query_embedding")
+        return {
+            "cache_key": record["cache_key"],
+            "scope_key": record["scope_key"],
+            "project_id": record["project_id"],
+            "index_version": record["index_version"],
+            "embedding": (
+                np.frombuffer(embedding, dtype=np.float32) if embedding else None
+            ),
+            "value": record["value"],
+            "expires_at": record["expires_at"].timestamp(),
+        }
+
+    # get_exact method
+    async def get_exact(
+        self, kind: str, project_id: int, index_version: int, params: dict, text: str
+    ):
+        scope_key = self.get_scope_key(kind, project_id, index_version, params)
+        cache_key = self.get_cache_key(scope_key, text)
+
+        entry = self.entries.get(cache_key)
+        if entry is not None and self.is_expired(entry):
+            self.drop_local(cache_key)
+            entry = None
+
+        if entry is None and self.cache_backend:
+            try:
+                record = await self.cache_backend.get(cache_key)
+            except Exception as e:
+                self.logger.error(f"Error while reading query cache: {e}")
+                record = None
+
+            if record is not None:
+                entry = self.from_backend_entry(record)
+                self.store_local(entry)
+                self.backend_hits += 1
+
+        if entry is None:
+            return None
+
+        self.entries.move_to_end(cache_key)
+        self.exact_hits += 1
+        return entry["value"]
+
+    # find_similar method
+    def find_similar(self, entries: List[dict], query: np.ndarray):
+        entries = [
+            entry
+            for entry in entries
+            if entry["embedding"] is not None
+            and len(entry["embedding"]) == len(query)
+            and not self.is_expired(entry)
+        ]
+        if not entries:
+            return None
+
+        similarities = np.stack([entry["embedding"] for entry in entries]) @ query
+        best = int(np.argmax(similarities))
+        if similarities[best] < self.similarity_threshold:
+            return None
+
+        return entries[best]
+
+    # get_similar method
+    async def get_similar(
+        self,
+        kind: str,
+        project_id: int,
+        index_version: int,
+        params: dict,
+        vector: list,
+    ):
+        if self.similarity_threshold is None or vector is None:
+            self.misses += 1
+            return None
+
+        scope_key = self.get_scope_key(kind, project_id, index_version, params)
+        query = self.normalize_vector(vector)
+
+        scope = self.scopes.get(scope_key, {})
+        entry = self.find_similar([self.entries[key] for key in scope], query)
+
+        if entry is None and self.cache_backend:
+            try:
+                records = await self.cache_backend.get_scope_entries(
+                    scope_key=scope_key, limit=self.max_semantic_candidates
+                )
+            except Exception as e:
+                self.logger.error(f"Error while reading query cache: {e}")
+                records = []
+
+            entry = self.find_similar(
+                [self.from_backend_entry(record) for record in records], query
+            )
+            if entry is not None:
+                self.store_local(entry)
+                self.backend_hits += 1
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(entry["cache_key"])
+        self.semantic_hits += 1
+        return entry["value"]
+
+    # set method
+    async def set(
+        self,
+        kind: str,
+        project_id: int,
+        index_version: int,
+        params: dict,
+        text: str,
+        vector: list,
+        value: dict,
+    ):
+        scope_key = self.get_scope_key(kind, project_id, index_version, params)
+        entry = {
+            "cache_key": self.get_cache_key(scope_key, text),
+            "scope_key": scope_key,
+            "project_id": project_id,
+            "index_version": index_version,
+            "embedding": self.normalize_vector(vector) if vector is not None else None,
+            "value": value,
+            "expires_at": time.time() + self.ttl_seconds,
+        }
+        self.store_local(entry)
+        self.stores += 1
+
+        if self.cache_backend:
+            try:
+                await self.cache_backend.set(
+                    {
+                        "cache_key": entry["cache_key"],
+                        "scope_key": scope_key,
+                        "project_id": project_id,
+                        "index_version": index_version,
+                        "kind": kind,
+                        "query_embedding": (
+                            entry["embedding"].tobytes()
+                            if entry["embedding"] is not None
+                            else None
+                        ),
+                        "value": value,
+                        "expires_at": datetime.fromtimestamp(
+                            entry["expires_at"], tz=timezone.utc
+                        ),
+                    }
+                )
+            except Exception as e:
+                self.logger.error(f"Error while storing query cache entry: {e}")
+
+        return True
+
+    # invalidate method
+    async def invalidate(self, project_id: int, index_version: int):
+        # older versions can no longer be hit, this only frees their space
+        stale_keys = [
+            cache_key
+            for cache_key, entry in self.entries.items()
+            if entry["project_id"] == project_id
+            and entry["index_version"] < index_version
+        ]
+        for cache_key in stale_keys:
+            self.drop_local(cache_key)
+
+        if self.cache_backend:
+            try:
+                await self.cache_backend.delete_stale(
+                    project_id=project_id, index_version=index_version
+                )
+            except Exception as e:
+                self.logger.error(f"Error while invalidating query cache: {e}")
+
+        return True
+
+    # get_stats method
+    def get_stats(self):
+        hits = self.exact_hits + self.semantic_hits
+        lookups = hits + self.misses
+        return {
+            "exact_hits": self.exact_hits,
+            "semantic_hits": self.semantic_hits,
+            "backend_hits": self.backend_hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "memory_items": len(self.entries),
+        }
@@ -0,0 +1,145 @@
+from ..QueryCacheInterface import QueryCacheInterface
+from models.db_schemes import QueryCacheEntry
+from sqlalchemy.future import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy import delete, func
+from typing import List
+import logging
+
+
+class PGQueryCache(QueryCacheInterface):
+    """
+    Query cache entries shared by every worker in one Postgres table.
+
+    Every `purge_interval` sets, a worker deletes the expired rows and trims
+    the project it wrote to down to its `max_entries_per_project` newest
+    rows, so the table stays bounded while the workers run.
+    """
+
+    def __init__(
+        self,
+        db_client,
+        max_entries_per_project: int = 10000,
+        purge_interval: int = 100,
+    ):
+        self.db_client = db_client
+        self.max_entries_per_project = max_entries_per_project
+        self.purge_interval = purge_interval
+        self.sets_since_purge = 0
+        self.logger = logging.getLogger("uvicorn")
+
+    # connect method
+    async def connect(self):
+        async with self.db_client() as session:
+            async with session.begin():
+                await self.delete_expired(session)
+
+    # delete_expired method
+    async def delete_expired(self, session):
+        await session.execute(
+            delete(QueryCacheEntry).where(QueryCacheEntry.expires_at <= func.now())
+        )
+
+    # purge method
+    async def purge(self, project_id: int):
+        # keep the newest rows of the project, drop the rest
+        newest = (
+            select(QueryCacheEntry.cache_key)
+            .where(QueryCacheEntry.project_id == project_id)
+            .order_by(QueryCacheEntry.created_at.desc())
+            .limit(self.max_entries_per_project)
+        )
+
+        async with self.db_client() as session:
+            async with session.begin():
+                await self.delete_expired(session)
+                await session.execute(
+                    delete(QueryCacheEntry).where(
+                        QueryCacheEntry.project_id == project_id,
+                        QueryCacheEntry.cache_key.not_in(newest),
+                    )
+                )
+
+    # disconnect method
+    async def disconnect(self):
+        pass
+
+    # to_entry method
+    def to_entry(self, record: QueryCacheEntry) -> dict:
+        return {
+            "cache_key": record.cache_key,
+            "scope_key": record.scope_key,
+            "project_id": record.project_id,
+            "index_version": record.index_version,
+            "kind": record.kind,
+            "query_embedding": record.query_embedding,
+            "value": record.value,
+            "expires_at": record.expires_at,
+        }
+
+    # get method
+    async def get(self, cache_key: str) -> dict:
+        async with self.db_client() as session:
+            statement = select(QueryCacheEntry).where(
+                QueryCacheEntry.cache_key == cache_key,
+                QueryCacheEntry.expires_at > func.now(),
+            )
+            result = await session.execute(statement)
+            record = result.scalar_one_or_none()
+
+        return self.to_entry(record) if record else None
+
+    # get_scope_entries method
+    async def get_scope_entries(self, scope_key: str, limit: int) -> List[dict]:
+        async with self.db_client() as session:
+            statement = (
+                select(QueryCacheEntry)
+                .where(
+                    QueryCacheEntry.scope_key == scope_key,
+                    QueryCacheEntry.query_embedding.is_not(None),
+                    QueryCacheEntry.expires_at > func.now(),
+                )
+                .order_by(QueryCacheEntry.created_at.desc())
+                .limit(limit)
+            )
+            result = await session.execute(statement)
+            records = result.scalars().all()
+
+        return [self.to_entry(record) for record in records]
+
+    # set method
+    async def set(self, entry: dict):
+        async with self.db_client() as session:
+            async with session.begin():
+                statement = insert(QueryCacheEntry).values(entry)
+                statement = statement.on_conflict_do_update(
+                    index_elements=["cache_key"],
+                    set_={
+                        "query_embedding": statement.excluded.query_embedding,
+                        "value": statement.excluded.value,
+                        "created_at": func.now(),
+                        "expires_at": statement.excluded.expires_at,
+                    },
+                )
+                await session.execute(statement)
+
+        self.sets_since_purge += 1
+        if self.sets_since_purge >= self.purge_interval:
+            self.sets_since_purge = 0
+            await self.purge(project_id=entry["project_id"])
+
+        return True
+
+    # delete_stale method
+    async def delete_stale(self, project_id: int, index_version: int):
+        async with self.db_client() as session:
+            async with session.begin():
+                await session.execute(
+                    delete(QueryCacheEntry).where(
+                        QueryCacheEntry.project_id == project_id,
+                        QueryCacheEntry.index_version < index_version,
+                    )
+                )
+                await self.delete_expired(session)
+
+        return True
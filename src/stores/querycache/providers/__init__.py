@@ -0,0 +1 @@
+from .PGQueryCache import PGQueryCache
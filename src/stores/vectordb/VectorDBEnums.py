@@ -4,6 +4,8 @@ from enum import Enum
 class VectorDBEnums(Enum):
     QDRANT = "QDRANT"
     PGVECTOR = "PGVECTOR"
+    NUMPY = "NUMPY"
+    IVFPQ = "IVFPQ"
 
 
 class DistanceMethodEnums(Enum):
@@ -11,19 +13,81 @@ class DistanceMethodEnums(Enum):
     DOT = "dot"
 
 
+class FilterOperatorEnums(Enum):
+    EQ = "eq"
+    NE = "ne"
+    IN = "in"
+    GT = "gt"
+    GTE = "gte"
+    LT = "lt"
+    LTE = "lte"
+
+
+class VectorMetadataEnums(Enum):
+    ASSET_ID = "asset_id"
+    CHUNK_ORDER = "chunk_order"
+    PAGE = "page"
+
+
+class QdrantQuantizationEnums(Enum):
+    SCALAR = "scalar"
+    BINARY = "binary"
+
+
 class PgVectorTableSchemeEnums(Enum):
     ID = "id"
     TEXT = "text"
     VECTOR = "vector"
     CHUNK_ID = "chunk_id"
     METADATA = "metadata"
+    COLLECTION = "collection"
     _PREFIX = "pgvector"
 
 
 class PgVectorDistanceMethodEnums(Enum):
     COSINE = "vector_cosine_ops"
-    DOT = "vector_12_ops"
+    DOT = "vector_ip_ops"
+
+
+class PgVectorDistanceOperatorEnums(Enum):
+    COSINE = "<=>"
+    DOT = "<#>"
 
 class PgVectorIndexTypeEnums(Enum):
-    IVFFLAT="ivffalt"
-    HNSW="hnsw"
\ No newline at end of file
+    IVFFLAT="ivfflat"
+    HNSW="hnsw"
+
+
+class PgVectorIterativeScanEnums(Enum):
+    OFF = "off"
+    STRICT_ORDER = "strict_order"
+    RELAXED_ORDER = "relaxed_order"
+
+
+class PgVectorInsertModeEnums(Enum):
+    COPY = "copy"
+    INSERT = "insert"
+
+
+class PgVectorLayoutEnums(Enum):
+    TABLE_PER_COLLECTION = "table_per_collection"
+    PARTITIONED = "partitioned"
+
+
+class PgVectorPartitionMethodEnums(Enum):
+    LIST = "list"
+    HASH = "hash"
+
+
+class NumpyStorageEnums(Enum):
+    CONFIG = "collection.json"
+    VECTORS = "vectors.f32"
+    IDS = "ids.i64"
+    OFFSETS = "payload_ends.u64"
+    PAYLOADS = "payloads.jsonl"
+
+
+class IvfPqStorageEnums(Enum):
+    INDEX = "ivfpq_index.npz"
+    CODES = "pq_codes.u8"
+    LISTS = "ivf_lists.i32"
@@ -58,8 +58,56 @@ class VectorDBInterface(ABC):
     ):
         pass
 
+    @abstractmethod
+    def delete_by_asset_ids(
+        self, collection_name: str, asset_ids: List[int], record_ids: List[int] = None
+    ):
+        """
+        Delete the records of the given assets. `record_ids` are the chunk
+        ids of the assets' current chunks: records pushed before the asset
+        id was stored in their metadata can only be matched on those.
+        """
+        pass
+
+    @abstractmethod
+    def begin_bulk_load(self, collection_name: str, drop_index: bool = False):
+        pass
+
+    @abstractmethod
+    def end_bulk_load(self, collection_name: str):
+        pass
+
     @abstractmethod
     def search_by_vector(
-        self, collection_name: str, vector: list, limit: int
+        self,
+        collection_name: str,
+        vector: list,
+        limit: int,
+        ef_search: int = None,
+        probes: int = None,
+        rerank_depth: int = None,
+        filters: List[dict] = None,
     ) -> List[RetrievedDocument]:
+        """
+        `filters` is a backend-neutral list of conditions on the record
+        metadata, combined with AND, each as
+        {"field": ..., "operator": FilterOperatorEnums value, "value": ...}.
+        """
+        pass
+
+    @abstractmethod
+    def search_by_vectors(
+        self,
+        collection_name: str,
+        vectors: List[list],
+        limit: int,
+        ef_search: int = None,
+        probes: int = None,
+        rerank_depth: int = None,
+        filters: List[dict] = None,
+    ) -> List[List[RetrievedDocument]]:
+        """
+        Batched `search_by_vector`: one result list per query vector, in
+        the same order, fetched in as few backend round-trips as possible.
+        """
         pass
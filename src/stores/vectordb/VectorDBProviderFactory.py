@@ -1,5 +1,11 @@
-from stores.vectordb.provider import QdrantDBProvider, PGVectorProvider
-from stores.vectordb.VectorDBEnums import VectorDBEnums
+from stores.vectordb.provider import (
+    QdrantDBProvider,
+    PGVectorProvider,
+    PGVectorPartitionedProvider,
+    NumpyDBProvider,
+    IVFPQDBProvider,
+)
+from stores.vectordb.VectorDBEnums import VectorDBEnums, PgVectorLayoutEnums
 from controllers.BaseController import BaseController
 from sqlalchemy.orm import sessionmaker
 
@@ -21,13 +27,86 @@ class VectorDBProviderFactory:
                 distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
                 default_vector_size=self.config.EMBEDDING_MODEL_SIZE,
                 index_threshold=self.config.VECTOR_DB_PGVEC_INDEX_THRESHOLD,
+                url=self.config.VECTOR_DB_QDRANT_URL,
+                api_key=self.config.VECTOR_DB_QDRANT_API_KEY,
+                prefer_grpc=self.config.VECTOR_DB_QDRANT_PREFER_GRPC,
+                timeout=self.config.VECTOR_DB_QDRANT_TIMEOUT,
+                upload_batch_size=self.config.VECTOR_DB_QDRANT_UPLOAD_BATCH_SIZE,
+                upload_parallel=self.config.VECTOR_DB_QDRANT_UPLOAD_PARALLEL,
+                quantization=self.config.VECTOR_DB_QDRANT_QUANTIZATION,
+                quantization_always_ram=self.config.VECTOR_DB_QDRANT_QUANTIZATION_ALWAYS_RAM,
+                scalar_quantile=self.config.VECTOR_DB_QDRANT_SCALAR_QUANTILE,
+                on_disk_vectors=self.config.VECTOR_DB_QDRANT_ON_DISK_VECTORS,
+                on_disk_payload=self.config.VECTOR_DB_QDRANT_ON_DISK_PAYLOAD,
+                hnsw_m=self.config.VECTOR_DB_QDRANT_HNSW_M,
+                hnsw_ef_construct=self.config.VECTOR_DB_QDRANT_HNSW_EF_CONSTRUCT,
+                search_hnsw_ef=self.config.VECTOR_DB_QDRANT_SEARCH_HNSW_EF,
+                search_oversampling=self.config.VECTOR_DB_QDRANT_SEARCH_OVERSAMPLING,
+                search_rescore=self.config.VECTOR_DB_QDRANT_SEARCH_RESCORE,
             )
 
         if provider == VectorDBEnums.PGVECTOR.value:
+            if self.config.VECTOR_DB_PGVEC_LAYOUT == PgVectorLayoutEnums.PARTITIONED.value:
+                return PGVectorPartitionedProvider(
+                    db_client=self.db_client,
+                    partition_method=self.config.VECTOR_DB_PGVEC_PARTITION_METHOD,
+                    partition_count=self.config.VECTOR_DB_PGVEC_PARTITION_COUNT,
+                    collections_cache_ttl=self.config.VECTOR_DB_PGVEC_COLLECTIONS_CACHE_TTL,
+                    **self.get_pgvector_options(),
+                )
+
             return PGVectorProvider(
                 db_client=self.db_client,
+                **self.get_pgvector_options(),
+            )
+        if provider == VectorDBEnums.NUMPY.value:
+            numpy_db_path = self.base_controller.get_or_create_database_path(
+                db_name=self.config.VECTOR_DB_PATH
+            )
+
+            return NumpyDBProvider(
+                db_client=numpy_db_path,
                 distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
                 default_vector_size=self.config.EMBEDDING_MODEL_SIZE,
-                index_threshold=self.config.VECTOR_DB_PGVEC_INDEX_THRESHOLD,
+                search_block_size=self.config.VECTOR_DB_NUMPY_SEARCH_BLOCK_SIZE,
             )
+
+        if provider == VectorDBEnums.IVFPQ.value:
+            ivfpq_db_path = self.base_controller.get_or_create_database_path(
+                db_name=self.config.VECTOR_DB_PATH
+            )
+
+            return IVFPQDBProvider(
+                db_client=ivfpq_db_path,
+                distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
+                default_vector_size=self.config.EMBEDDING_MODEL_SIZE,
+                search_block_size=self.config.VECTOR_DB_NUMPY_SEARCH_BLOCK_SIZE,
+                nlist=self.config.VECTOR_DB_IVFPQ_NLIST,
+                pq_m=self.config.VECTOR_DB_IVFPQ_M,
+                nprobe=self.config.VECTOR_DB_IVFPQ_NPROBE,
+                rerank_depth=self.config.VECTOR_DB_IVFPQ_RERANK_DEPTH,
+                min_train_size=self.config.VECTOR_DB_IVFPQ_MIN_TRAIN_SIZE,
+                train_sample_size=self.config.VECTOR_DB_IVFPQ_TRAIN_SAMPLE_SIZE,
+                kmeans_iterations=self.config.VECTOR_DB_IVFPQ_KMEANS_ITERATIONS,
+            )
+
         return None
+
+    # get_pgvector_options method
+    def get_pgvector_options(self) -> dict:
+        return dict(
+            distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
+            default_vector_size=self.config.EMBEDDING_MODEL_SIZE,
+            index_threshold=self.config.VECTOR_DB_PGVEC_INDEX_THRESHOLD,
+            insert_mode=self.config.VECTOR_DB_PGVEC_INSERT_MODE,
+            index_type=self.config.VECTOR_DB_PGVEC_INDEX_TYPE,
+            hnsw_m=self.config.VECTOR_DB_PGVEC_HNSW_M,
+            hnsw_ef_construction=self.config.VECTOR_DB_PGVEC_HNSW_EF_CONSTRUCTION,
+            ivfflat_lists=self.config.VECTOR_DB_PGVEC_IVFFLAT_LISTS,
+            maintenance_work_mem=self.config.VECTOR_DB_PGVEC_MAINTENANCE_WORK_MEM,
+            max_parallel_maintenance_workers=self.config.VECTOR_DB_PGVEC_MAX_PARALLEL_MAINTENANCE_WORKERS,
+            index_concurrently=self.config.VECTOR_DB_PGVEC_INDEX_CONCURRENTLY,
+            iterative_scan=self.config.VECTOR_DB_PGVEC_ITERATIVE_SCAN,
+            hnsw_max_scan_tuples=self.config.VECTOR_DB_PGVEC_HNSW_MAX_SCAN_TUPLES,
+            ivfflat_max_probes=self.config.VECTOR_DB_PGVEC_IVFFLAT_MAX_PROBES,
+        )
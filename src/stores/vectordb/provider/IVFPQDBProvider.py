@@ -0,0 +1,508 @@
+from .NumpyDBProvider import NumpyDBProvider
+from stores.vectordb.VectorDBEnums import IvfPqStorageEnums
+from typing import List
+import numpy as np
+import asyncio
+import shutil
+import os
+
+
+class IVFPQDBProvider(NumpyDBProvider):
+    """
+    Compressed in-process vector index (IVF-PQ) on top of the numpy store.
+
+    Vectors are assigned to k-means coarse centroids and their residuals are
+    product-quantized into `pq_m` uint8 codes, so search only touches the
+    codes (e.g. 96 bytes instead of 6 KB for a 1536-dim vector). Candidates
+    from the `nprobe` closest lists are scored with asymmetric distance
+    tables, and a shortlist of `rerank_depth` is re-scored exactly against
+    the float32 matrix, which stays memory-mapped on disk.
+
+    Collections smaller than `min_train_size` are searched exactly until the
+    index gets trained at the end of a bulk load.
+    """
+
+    def __init__(
+        self,
+        db_client: str,
+        distance_method: str,
+        default_vector_size: int = 786,
+        search_block_size: int = 65536,
+        nlist: int = None,
+        pq_m: int = 96,
+        nprobe: int = 8,
+        rerank_depth: int = 100,
+        min_train_size: int = 10000,
+        train_sample_size: int = 100000,
+        kmeans_iterations: int = 20,
+    ):
+        super().__init__(
+            db_client=db_client,
+            distance_method=distance_method,
+            default_vector_size=default_vector_size,
+            search_block_size=search_block_size,
+        )
+
+        self.nlist = nlist
+        self.pq_m = pq_m
+        self.nprobe = nprobe
+        self.rerank_depth = rerank_depth
+        self.min_train_size = min_train_size
+        self.train_sample_size = train_sample_size
+        self.kmeans_iterations = kmeans_iterations
+
+        self.bulk_load_collections = set()
+
+        # collection_name -> loaded index (centroids, codebooks, inverted lists)
+        self.index_cache = {}
+
+    # delete_collection method
+    async def delete_collection(self, collection_name: str):
+        self.index_cache.pop(collection_name, None)
+        return await super().delete_collection(collection_name=collection_name)
+
+    # get_sub_vectors_count method
+    def get_sub_vectors_count(self, embedding_size: int) -> int:
+        # largest divisor of the embedding size not above pq_m
+        pq_m = min(self.pq_m, embedding_size)
+        while embedding_size % pq_m:
+            pq_m -= 1
+        return pq_m
+
+    # assign method
+    def assign(self, data: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        centroids_norms = (centroids**2).sum(axis=1)
+        labels = np.empty(len(data), dtype=np.int64)
+        for start in range(0, len(data), self.search_block_size):
+            block = data[start : start + self.search_block_size]
+            distances = centroids_norms - 2 * (block @ centroids.T)
+            labels[start : start + len(block)] = distances.argmin(axis=1)
+        return labels
+
+    # kmeans method
+    def kmeans(self, data: np.ndarray, k: int, rng: np.random.Generator) -> np.ndarray:
+        centroids = data[rng.choice(len(data), k, replace=False)].copy()
+
+        for _ in range(self.kmeans_iterations):
+            labels = self.assign(data, centroids)
+            counts = np.bincount(labels, minlength=k)
+
+            # per-cluster sums over the points sorted by cluster
+            non_empty = np.flatnonzero(counts)
+            starts = np.concatenate([[0], np.cumsum(counts)])[non_empty]
+            sums = np.add.reduceat(data[np.argsort(labels, kind="stable")], starts, axis=0)
+            centroids[non_empty] = sums / counts[non_empty, None]
+
+            empty = counts == 0
+            # reseed empty clusters with random points
+            if empty.any():
+                centroids[empty] = data[rng.choice(len(data), int(empty.sum()))]
+
+        return centroids
+
+    # encode method
+    def encode(self, vectors: np.ndarray, centroids: np.ndarray, codebooks: np.ndarray):
+        lists = self.assign(vectors, centroids)
+        residuals = vectors - centroids[lists]
+
+        pq_m, _, sub_size = codebooks.shape
+        codes = np.empty((len(vectors), pq_m), dtype=np.uint8)
+        for j in range(pq_m):
+            codes[:, j] = self.assign(
+                residuals[:, j * sub_size : (j + 1) * sub_size], codebooks[j]
+            )
+
+        return lists.astype(np.int32), codes
+
+    # train_index method
+    def train_index(self, collection_name: str, embedding_size: int):
+        vectors = self.get_vectors(collection_name, embedding_size)
+        rng = np.random.default_rng(0)
+
+        sample_size = min(len(vectors), self.train_sample_size)
+        sample = np.asarray(
+            vectors[np.sort(rng.choice(len(vectors), sample_size, replace=False))],
+            dtype=np.float32,
+        )
+
+        nlist = self.nlist if self.nlist else int(4 * np.sqrt(len(vectors)))
+        nlist = max(1, min(nlist, sample_size))
+        self.logger.info(
+            f"Training IVF-PQ index for collection: {collection_name} "
+            f"(nlist={nlist}, sample={sample_size})"
+        )
+        centroids = self.kmeans(sample, nlist, rng)
+
+        residuals = sample - centroids[self.assign(sample, centroids)]
+        pq_m = self.get_sub_vectors_count(embedding_size)
+        sub_size = embedding_size // pq_m
+        codebook_size = min(256, sample_size)
+        codebooks = np.stack(
+            [
+                self.kmeans(
+                    np.ascontiguousarray(residuals[:, j * sub_size : (j + 1) * sub_size]),
+                    codebook_size,
+                    rng,
+                )
+                for j in range(pq_m)
+            ]
+        )
+
+        # codes are re-encoded from scratch against the new codebooks
+        for storage_file in (IvfPqStorageEnums.CODES, IvfPqStorageEnums.LISTS):
+            open(self.get_collection_path(collection_name, storage_file.value), "wb").close()
+
+        index_path = self.get_collection_path(collection_name, IvfPqStorageEnums.INDEX.value)
+        with open(index_path + ".tmp", "wb") as f:
+            np.savez(f, centroids=centroids, codebooks=codebooks)
+        os.replace(index_path + ".tmp", index_path)
+
+        self.index_cache.pop(collection_name, None)
+
+    # get_encoded_count method
+    def get_encoded_count(self, collection_name: str, pq_m: int) -> int:
+        lists_path = self.get_collection_path(collection_name, IvfPqStorageEnums.LISTS.value)
+        codes_path = self.get_collection_path(collection_name, IvfPqStorageEnums.CODES.value)
+        if not os.path.exists(lists_path) or not os.path.exists(codes_path):
+            return 0
+
+        return min(
+            os.path.getsize(lists_path) // np.dtype(np.int32).itemsize,
+            os.path.getsize(codes_path) // pq_m,
+        )
+
+    # encode_pending method
+    def encode_pending(self, collection_name: str, embedding_size: int):
+        index = self.load_index(collection_name)
+        if index is None:
+            return 0
+
+        centroids, codebooks = index["centroids"], index["codebooks"]
+        pq_m = codebooks.shape[0]
+
+        encoded_count = self.get_encoded_count(collection_name, pq_m)
+        vectors = self.get_vectors(collection_name, embedding_size)
+        if vectors is None or encoded_count >= len(vectors):
+            return 0
+
+        # the lists file is written last, drop any torn tail first
+        codes_path = self.get_collection_path(collection_name, IvfPqStorageEnums.CODES.value)
+        lists_path = self.get_collection_path(collection_name, IvfPqStorageEnums.LISTS.value)
+        os.truncate(codes_path, encoded_count * pq_m)
+        os.truncate(lists_path, encoded_count * np.dtype(np.int32).itemsize)
+
+        for start in range(encoded_count, len(vectors), self.search_block_size):
+            block = np.asarray(vectors[start : start + self.search_block_size])
+            lists, codes = self.encode(block, centroids, codebooks)
+            with open(codes_path, "ab") as f:
+                f.write(codes.tobytes())
+            with open(lists_path, "ab") as f:
+                f.write(lists.tobytes())
+
+        self.index_cache.pop(collection_name, None)
+        return len(vectors) - encoded_count
+
+    # build_index method
+    def build_index(self, collection_name: str, embedding_size: int):
+        index_path = self.get_collection_path(collection_name, IvfPqStorageEnums.INDEX.value)
+        if not os.path.exists(index_path):
+            if self.get_records_count(collection_name) < self.min_train_size:
+                return False
+            self.train_index(collection_name, embedding_size)
+
+        encoded_count = self.encode_pending(collection_name, embedding_size)
+        self.logger.info(
+            f"Encoded {encoded_count} vectors for collection: {collection_name}"
+        )
+        return True
+
+    # load_index method
+    def load_index(self, collection_name: str) -> dict:
+        index = self.index_cache.get(collection_name)
+        if index is not None:
+            return index
+
+        index_path = self.get_collection_path(collection_name, IvfPqStorageEnums.INDEX.value)
+        if not os.path.exists(index_path):
+            return None
+
+        with np.load(index_path) as data:
+            index = {
+                "centroids": data["centroids"],
+                "codebooks": data["codebooks"],
+            }
+
+        pq_m = index["codebooks"].shape[0]
+        encoded_count = self.get_encoded_count(collection_name, pq_m)
+        index["encoded_count"] = encoded_count
+
+        if encoded_count > 0:
+            index["codes"] = np.memmap(
+                self.get_collection_path(collection_name, IvfPqStorageEnums.CODES.value),
+                dtype=np.uint8,
+                mode="r",
+                shape=(encoded_count, pq_m),
+            )
+            lists = np.fromfile(
+                self.get_collection_path(collection_name, IvfPqStorageEnums.LISTS.value),
+                dtype=np.int32,
+                count=encoded_count,
+            )
+            # inverted lists: record indices grouped by coarse centroid
+            index["order"] = np.argsort(lists, kind="stable")
+            index["list_starts"] = np.concatenate(
+                [[0], np.cumsum(np.bincount(lists, minlength=len(index["centroids"])))]
+            )
+
+        self.index_cache[collection_name] = index
+        return index
+
+    # compact_collection method
+    def compact_collection(
+        self, collection_name: str, embedding_size: int, keep: np.ndarray, compact_path: str
+    ):
+        super().compact_collection(collection_name, embedding_size, keep, compact_path)
+
+        # the kept records keep their codes, no re-encoding needed
+        index = self.load_index(collection_name)
+        if index is None:
+            return
+
+        shutil.copyfile(
+            self.get_collection_path(collection_name, IvfPqStorageEnums.INDEX.value),
+            os.path.join(compact_path, IvfPqStorageEnums.INDEX.value),
+        )
+
+        pq_m = index["codebooks"].shape[0]
+        encoded_count = index["encoded_count"]
+        kept = np.flatnonzero(keep[:encoded_count])
+
+        codes = np.fromfile(
+            self.get_collection_path(collection_name, IvfPqStorageEnums.CODES.value),
+            dtype=np.uint8,
+            count=encoded_count * pq_m,
+        ).reshape(encoded_count, pq_m)
+        lists = np.fromfile(
+            self.get_collection_path(collection_name, IvfPqStorageEnums.LISTS.value),
+            dtype=np.int32,
+            count=encoded_count,
+        )
+        codes[kept].tofile(os.path.join(compact_path, IvfPqStorageEnums.CODES.value))
+        lists[kept].tofile(os.path.join(compact_path, IvfPqStorageEnums.LISTS.value))
+
+    # bump_generation method
+    def bump_generation(self, collection_name: str):
+        super().bump_generation(collection_name)
+        self.index_cache.pop(collection_name, None)
+
+    # insert_many method
+    async def insert_many(
+        self,
+        collection_name: str,
+        texts: list,
+        vectors: list,
+        metadata: list = None,
+        record_ids: list = None,
+        batch_size: int = 50,
+    ):
+        is_inserted = await super().insert_many(
+            collection_name=collection_name,
+            texts=texts,
+            vectors=vectors,
+            metadata=metadata,
+            record_ids=record_ids,
+            batch_size=batch_size,
+        )
+        if not is_inserted or collection_name in self.bulk_load_collections:
+            return is_inserted
+
+        return await self.update_index(collection_name=collection_name)
+
+    # update_index method
+    async def update_index(self, collection_name: str) -> bool:
+        collection_config = self.read_collection_config(collection_name)
+        if collection_config is None:
+            return False
+
+        async with self.get_collection_lock(collection_name):
+            try:
+                _ = await asyncio.to_thread(
+                    self.build_index, collection_name, collection_config["embedding_size"]
+                )
+            except Exception as e:
+                self.logger.error(
+                    f"Error while building IVF-PQ index for collection: {collection_name}: {e}"
+                )
+                return False
+
+        return True
+
+    # begin_bulk_load method
+    async def begin_bulk_load(self, collection_name: str, drop_index: bool = False):
+        self.bulk_load_collections.add(collection_name)
+
+        if drop_index:
+            # retrain the codebooks on the reloaded data
+            self.index_cache.pop(collection_name, None)
+            index_path = self.get_collection_path(
+                collection_name, IvfPqStorageEnums.INDEX.value
+            )
+            if os.path.exists(index_path):
+                os.remove(index_path)
+
+        return True
+
+    # end_bulk_load method
+    async def end_bulk_load(self, collection_name: str):
+        self.bulk_load_collections.discard(collection_name)
+
+        return await self.update_index(collection_name=collection_name)
+
+    # probe_candidates method
+    def probe_candidates(self, index: dict, query: np.ndarray, nprobe: int):
+        centroids, codebooks = index["centroids"], index["codebooks"]
+        order, list_starts = index["order"], index["list_starts"]
+
+        # coarse step: the nprobe lists whose centroids score highest
+        coarse_scores = centroids @ query
+        probed_lists = self.top_k(coarse_scores, min(nprobe, len(centroids)))
+        list_sizes = list_starts[probed_lists + 1] - list_starts[probed_lists]
+        candidates = np.concatenate(
+            [order[list_starts[l] : list_starts[l + 1]] for l in probed_lists]
+        )
+
+        # asymmetric distance: q.x ~= q.centroid + sum_j q_j.codebook_j[code_j]
+        pq_m, _, sub_size = codebooks.shape
+        distance_table = np.einsum(
+            "js,jcs->jc", query.reshape(pq_m, sub_size), codebooks
+        )
+        approx_scores = np.repeat(coarse_scores[probed_lists], list_sizes)
+        approx_scores = approx_scores + distance_table[
+            np.arange(pq_m), index["codes"][candidates]
+        ].sum(axis=1)
+
+        return candidates, approx_scores
+
+    # ivfpq_search method
+    def ivfpq_search(
+        self,
+        collection_name: str,
+        vector: list,
+        limit: int,
+        nprobe: int,
+        rerank_depth: int,
+        filters: List[dict] = None,
+    ):
+        collection_config = self.read_collection_config(collection_name)
+        if collection_config is None:
+            return [], []
+
+        index = self.load_index(collection_name)
+        if index is None or index["encoded_count"] == 0:
+            return self.exact_search(collection_name, vector, limit, filters)
+
+        embedding_size = collection_config["embedding_size"]
+        vectors = self.get_vectors(collection_name, embedding_size)
+        query = self.normalize_vectors(np.asarray(vector, dtype=np.float32))
+
+        # records appended after the last encode are scored exactly
+        pending = np.arange(index["encoded_count"], len(vectors))
+        shortlist_size = max(limit, rerank_depth)
+
+        candidates, approx_scores = self.probe_candidates(index, query, nprobe)
+        if filters:
+            # probe more lists until the filtered shortlist can fill the limit
+            shortlist, _ = self.select_filtered(
+                collection_name, candidates, approx_scores, shortlist_size, filters
+            )
+            while len(shortlist) < limit and nprobe < len(index["centroids"]):
+                nprobe *= 2
+                candidates, approx_scores = self.probe_candidates(index, query, nprobe)
+                shortlist, _ = self.select_filtered(
+                    collection_name, candidates, approx_scores, shortlist_size, filters
+                )
+
+            if len(pending):
+                pending = np.asarray(
+                    [
+                        position
+                        for position, payload in zip(
+                            pending, self.read_payloads(collection_name, pending.tolist())
+                        )
+                        if self.matches_filters(payload.get("metadata"), filters)
+                    ],
+                    dtype=np.int64,
+                )
+        else:
+            if rerank_depth <= 0 and len(pending) == 0:
+                best = self.top_k(approx_scores, limit)
+                return candidates[best].tolist(), approx_scores[best].tolist()
+            shortlist = candidates[self.top_k(approx_scores, shortlist_size)]
+
+        rerank_indices = np.sort(np.concatenate([shortlist, pending]))
+        if len(rerank_indices) == 0:
+            return [], []
+
+        exact_scores = np.asarray(vectors[rerank_indices]) @ query
+        best = self.top_k(exact_scores, limit)
+        return rerank_indices[best].tolist(), exact_scores[best].tolist()
+
+    # search_by_vector method
+    async def search_by_vector(
+        self,
+        collection_name: str,
+        vector: list,
+        limit: int = 5,
+        ef_search: int = None,
+        probes: int = None,
+        rerank_depth: int = None,
+        filters: List[dict] = None,
+    ):
+        async with self.searching_collection(collection_name):
+            indices, scores = await asyncio.to_thread(
+                self.ivfpq_search,
+                collection_name,
+                vector,
+                limit,
+                probes if probes else self.nprobe,
+                rerank_depth if rerank_depth is not None else self.rerank_depth,
+                filters,
+            )
+            if not indices:
+                return None
+
+            payloads = await asyncio.to_thread(
+                self.read_payloads, collection_name, indices
+            )
+
+        return self.to_retrieved_documents(scores=scores, payloads=payloads)
+
+    # search_by_vectors method
+    async def search_by_vectors(
+        self,
+        collection_name: str,
+        vectors: List[list],
+        limit: int = 5,
+        ef_search: int = None,
+        probes: int = None,
+        rerank_depth: int = None,
+        filters: List[dict] = None,
+    ):
+        if not vectors:
+            return []
+
+        nprobe = probes if probes else self.nprobe
+        rerank_depth = rerank_depth if rerank_depth is not None else self.rerank_depth
+
+        def search_all():
+            return [
+                self.ivfpq_search(
+                    collection_name, vector, limit, nprobe, rerank_depth, filters
+                )
+                for vector in vectors
+            ]
+
+        async with self.searching_collection(collection_name):
+            results = await asyncio.to_thread(search_all)
+
+            return await self.read_batch_results(collection_name, results)
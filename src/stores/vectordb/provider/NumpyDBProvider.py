@@ -0,0 +1,758 @@
+from stores.vectordb.VectorDBInterface import VectorDBInterface
+from stores.vectordb.VectorDBEnums import (
+    DistanceMethodEnums,
+    NumpyStorageEnums,
+    VectorMetadataEnums,
+)
+from models.db_schemes import RetrievedDocument
+from helpers.filters import matches_metadata_filters
+from typing import List
+import numpy as np
+import contextlib
+import asyncio
+import logging
+import json
+import os
+import shutil
+
+
+class NumpyDBProvider(VectorDBInterface):
+    """
+    In-process vector store: each collection is a directory under the
+    vector db path holding an append-only float32 matrix plus id/payload
+    sidecar files. All files are memory-mapped for reading, so opening a
+    collection costs nothing and search is exact (matmul + argpartition).
+
+    The ids file is written last on every append and acts as the commit
+    marker; anything past it is a torn write and is truncated on the next
+    append. Deleting records rewrites the collection and swaps it in, so
+    searches wait for a running rewrite and a rewrite waits for running
+    searches.
+    """
+
+    def __init__(
+        self,
+        db_client: str,
+        distance_method: str,
+        default_vector_size: int = 786,
+        search_block_size: int = 65536,
+    ):
+        self.db_client = db_client
+        self.distance_method = distance_method
+        self.default_vector_size = default_vector_size
+        self.search_block_size = search_block_size
+
+        # collection_name -> (generation, records_count, memmap)
+        self.vectors_cache = {}
+        self.collection_locks = {}
+        self.repaired_collections = set()
+
+        # bumped whenever a collection's files are replaced
+        self.collection_generations = {}
+        self.collection_conditions = {}
+        self.active_searches = {}
+        self.rewriting_collections = set()
+
+        self.logger = logging.getLogger("uvicorn")
+
+    # connect method
+    async def connect(self):
+        os.makedirs(self.db_client, exist_ok=True)
+
+    # disconnect method
+    async def disconnect(self):
+        self.vectors_cache = {}
+
+    # get_collection_path method
+    def get_collection_path(self, collection_name: str, file_name: str = None) -> str:
+        collection_path = os.path.join(self.db_client, collection_name)
+        if file_name is None:
+            return collection_path
+        return os.path.join(collection_path, file_name)
+
+    # get_collection_lock method
+    def get_collection_lock(self, collection_name: str) -> asyncio.Lock:
+        if collection_name not in self.collection_locks:
+            self.collection_locks[collection_name] = asyncio.Lock()
+        return self.collection_locks[collection_name]
+
+    # get_collection_condition method
+    def get_collection_condition(self, collection_name: str) -> asyncio.Condition:
+        if collection_name not in self.collection_conditions:
+            self.collection_conditions[collection_name] = asyncio.Condition()
+        return self.collection_conditions[collection_name]
+
+    # searching_collection method
+    @contextlib.asynccontextmanager
+    async def searching_collection(self, collection_name: str):
+        condition = self.get_collection_condition(collection_name)
+        async with condition:
+            await condition.wait_for(
+                lambda: collection_name not in self.rewriting_collections
+            )
+            self.active_searches[collection_name] = (
+                self.active_searches.get(collection_name, 0) + 1
+            )
+
+        try:
+            yield
+        finally:
+            async with condition:
+                self.active_searches[collection_name] -= 1
+                condition.notify_all()
+
+    # rewriting_collection method
+    @contextlib.asynccontextmanager
+    async def rewriting_collection(self, collection_name: str):
+        # new searches wait from here on, running ones are let finish
+        condition = self.get_collection_condition(collection_name)
+        async with condition:
+            self.rewriting_collections.add(collection_name)
+            await condition.wait_for(
+                lambda: self.active_searches.get(collection_name, 0) == 0
+            )
+
+        try:
+            yield
+        finally:
+            async with condition:
+                self.rewriting_collections.discard(collection_name)
+                condition.notify_all()
+
+    # read_collection_config method
+    def read_collection_config(self, collection_name: str) -> dict:
+        config_path = self.get_collection_path(
+            collection_name, NumpyStorageEnums.CONFIG.value
+        )
+        if not os.path.exists(config_path):
+            return None
+
+        with open(config_path, "r") as f:
+            return json.load(f)
+
+    # get_records_count method
+    def get_records_count(self, collection_name: str) -> int:
+        ids_path = self.get_collection_path(collection_name, NumpyStorageEnums.IDS.value)
+        if not os.path.exists(ids_path):
+            return 0
+        return os.path.getsize(ids_path) // np.dtype(np.int64).itemsize
+
+    # is_collection_existed method
+    async def is_collection_existed(self, collection_name: str) -> bool:
+        return os.path.exists(
+            self.get_collection_path(collection_name, NumpyStorageEnums.CONFIG.value)
+        )
+
+    # list_all_collections method
+    async def list_all_collections(self) -> List:
+        if not os.path.isdir(self.db_client):
+            return []
+
+        return sorted(
+            collection_name
+            for collection_name in os.listdir(self.db_client)
+            if os.path.exists(
+                self.get_collection_path(collection_name, NumpyStorageEnums.CONFIG.value)
+            )
+        )
+
+    # get_collection_info method
+    async def get_collection_info(self, collection_name: str) -> dict:
+        collection_config = self.read_collection_config(collection_name)
+        if collection_config is None:
+            return None
+
+        vectors_path = self.get_collection_path(
+            collection_name, NumpyStorageEnums.VECTORS.value
+        )
+        return {
+            **collection_config,
+            "record_count": self.get_records_count(collection_name),
+            "vectors_size_bytes": (
+                os.path.getsize(vectors_path) if os.path.exists(vectors_path) else 0
+            ),
+        }
+
+    # delete_collection method
+    async def delete_collection(self, collection_name: str):
+        self.vectors_cache.pop(collection_name, None)
+        self.repaired_collections.discard(collection_name)
+
+        collection_path = self.get_collection_path(collection_name)
+        if not os.path.exists(collection_path):
+            self.logger.error("Collection does not exist")
+            return None
+
+        self.logger.info(f"Delete collection: {collection_name}")
+        async with self.rewriting_collection(collection_name):
+            await asyncio.to_thread(shutil.rmtree, collection_path)
+            self.bump_generation(collection_name)
+        return True
+
+    # bump_generation method
+    def bump_generation(self, collection_name: str):
+        self.collection_generations[collection_name] = (
+            self.collection_generations.get(collection_name, 0) + 1
+        )
+        self.vectors_cache.pop(collection_name, None)
+
+    # create_collection method
+    async def create_collection(
+        self, collection_name: str, embedding_size: int, do_reset: bool = False
+    ):
+        if do_reset:
+            _ = await self.delete_collection(collection_name=collection_name)
+
+        if await self.is_collection_existed(collection_name=collection_name):
+            return False
+
+        self.logger.info(f"Creating new numpy collection: {collection_name}")
+        os.makedirs(self.get_collection_path(collection_name), exist_ok=True)
+
+        for storage_file in NumpyStorageEnums:
+            if storage_file == NumpyStorageEnums.CONFIG:
+                continue
+            open(self.get_collection_path(collection_name, storage_file.value), "wb").close()
+
+        # the config file is written last, it marks the collection as existing
+        with open(
+            self.get_collection_path(collection_name, NumpyStorageEnums.CONFIG.value), "w"
+        ) as f:
+            json.dump(
+                {
+                    "embedding_size": int(embedding_size),
+                    "distance_method": self.distance_method,
+                },
+                f,
+            )
+
+        return True
+
+    # normalize_vectors method
+    def normalize_vectors(self, vectors: np.ndarray) -> np.ndarray:
+        if self.distance_method != DistanceMethodEnums.COSINE.value:
+            return vectors
+
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    # repair_collection method
+    def repair_collection(self, collection_name: str, embedding_size: int):
+        # drop anything written after the last committed record
+        records_count = self.get_records_count(collection_name)
+
+        ends_path = self.get_collection_path(collection_name, NumpyStorageEnums.OFFSETS.value)
+        payloads_end = 0
+        if records_count > 0:
+            ends = np.memmap(ends_path, dtype=np.uint64, mode="r", shape=(records_count,))
+            payloads_end = int(ends[-1])
+            del ends
+
+        expected_sizes = {
+            NumpyStorageEnums.VECTORS.value: records_count * embedding_size * 4,
+            NumpyStorageEnums.OFFSETS.value: records_count * 8,
+            NumpyStorageEnums.PAYLOADS.value: payloads_end,
+        }
+        for file_name, expected_size in expected_sizes.items():
+            file_path = self.get_collection_path(collection_name, file_name)
+            if os.path.getsize(file_path) > expected_size:
+                self.logger.error(
+                    f"Truncating torn write in {file_name} of collection: {collection_name}"
+                )
+                os.truncate(file_path, expected_size)
+
+    # append_records method
+    def append_records(
+        self,
+        collection_name: str,
+        texts: list,
+        vectors: np.ndarray,
+        metadata: list,
+        record_ids: list,
+    ):
+        embedding_size = vectors.shape[1]
+        if collection_name not in self.repaired_collections:
+            self.repair_collection(collection_name, embedding_size)
+            self.repaired_collections.add(collection_name)
+
+        payloads_path = self.get_collection_path(
+            collection_name, NumpyStorageEnums.PAYLOADS.value
+        )
+        with open(payloads_path, "ab") as f:
+            payloads_end = f.tell()
+            ends = np.empty(len(texts), dtype=np.uint64)
+            for i, (text, record_metadata) in enumerate(zip(texts, metadata)):
+                line = (
+                    json.dumps({"text": text, "metadata": record_metadata}) + "\n"
+                ).encode("utf-8")
+                f.write(line)
+                payloads_end += len(line)
+                ends[i] = payloads_end
+
+        with open(
+            self.get_collection_path(collection_name, NumpyStorageEnums.VECTORS.value), "ab"
+        ) as f:
+            f.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+
+        with open(
+            self.get_collection_path(collection_name, NumpyStorageEnums.OFFSETS.value), "ab"
+        ) as f:
+            f.write(ends.tobytes())
+
+        with open(
+            self.get_collection_path(collection_name, NumpyStorageEnums.IDS.value), "ab"
+        ) as f:
+            f.write(np.asarray(record_ids, dtype=np.int64).tobytes())
+            f.flush()
+            os.fsync(f.fileno())
+
+        return True
+
+    # insert_one method
+    async def insert_one(
+        self,
+        collection_name: str,
+        text: str,
+        vector: list,
+        metadata: dict = None,
+        record_id: str = None,
+    ):
+        return await self.insert_many(
+            collection_name=collection_name,
+            texts=[text],
+            vectors=[vector],
+            metadata=[metadata],
+            record_ids=[record_id] if record_id is not None else None,
+        )
+
+    # insert_many method
+    async def insert_many(
+        self,
+        collection_name: str,
+        texts: list,
+        vectors: list,
+        metadata: list = None,
+        record_ids: list = None,
+        batch_size: int = 50,
+    ):
+        collection_config = self.read_collection_config(collection_name)
+        if collection_config is None:
+            self.logger.error(
+                f"Can not insert new record to non-existed collection: {collection_name}"
+            )
+            return False
+
+        if metadata is None:
+            metadata = [None] * len(texts)
+
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2 or vectors.shape[1] != collection_config["embedding_size"]:
+            self.logger.error(
+                f"Vector size mismatch while inserting into collection: {collection_name}"
+            )
+            return False
+        vectors = self.normalize_vectors(vectors)
+
+        async with self.get_collection_lock(collection_name):
+            if record_ids is None:
+                records_count = self.get_records_count(collection_name)
+                record_ids = list(range(records_count, records_count + len(texts)))
+
+            try:
+                await asyncio.to_thread(
+                    self.append_records,
+                    collection_name,
+                    texts,
+                    vectors,
+                    metadata,
+                    record_ids,
+                )
+            except Exception as e:
+                self.logger.error(f"Error while inserting batch: {e}")
+                return False
+
+        return True
+
+    # get_asset_keep_mask method
+    def get_asset_keep_mask(
+        self, collection_name: str, asset_ids: List[int], record_ids: List[int] = None
+    ) -> np.ndarray:
+        records_count = self.get_records_count(collection_name)
+        asset_ids = set(asset_ids)
+
+        # records without an asset id in their metadata match on their id
+        ids = np.fromfile(
+            self.get_collection_path(collection_name, NumpyStorageEnums.IDS.value),
+            dtype=np.int64,
+            count=records_count,
+        )
+        keep = ~np.isin(ids, np.asarray(record_ids or [], dtype=np.int64))
+        with open(
+            self.get_collection_path(collection_name, NumpyStorageEnums.PAYLOADS.value), "rb"
+        ) as f:
+            for index in range(records_count):
+                metadata = json.loads(f.readline()).get("metadata") or {}
+                if metadata.get(VectorMetadataEnums.ASSET_ID.value) in asset_ids:
+                    keep[index] = False
+
+        return keep
+
+    # compact_collection method
+    def compact_collection(
+        self, collection_name: str, embedding_size: int, keep: np.ndarray, compact_path: str
+    ):
+        records_count = len(keep)
+        kept = np.flatnonzero(keep)
+
+        vectors = self.get_vectors(collection_name, embedding_size)
+        with open(os.path.join(compact_path, NumpyStorageEnums.VECTORS.value), "wb") as f:
+            for start in range(0, len(kept), self.search_block_size):
+                block = kept[start : start + self.search_block_size]
+                f.write(np.ascontiguousarray(vectors[block], dtype=np.float32).tobytes())
+
+        payloads_end = 0
+        ends = np.empty(len(kept), dtype=np.uint64)
+        with open(
+            self.get_collection_path(collection_name, NumpyStorageEnums.PAYLOADS.value), "rb"
+        ) as source, open(
+            os.path.join(compact_path, NumpyStorageEnums.PAYLOADS.value), "wb"
+        ) as target:
+            kept_count = 0
+            for index in range(records_count):
+                line = source.readline()
+                if keep[index]:
+                    target.write(line)
+                    payloads_end += len(line)
+                    ends[kept_count] = payloads_end
+                    kept_count += 1
+
+        ends.tofile(os.path.join(compact_path, NumpyStorageEnums.OFFSETS.value))
+
+        ids = np.fromfile(
+            self.get_collection_path(collection_name, NumpyStorageEnums.IDS.value),
+            dtype=np.int64,
+            count=records_count,
+        )
+        ids[kept].tofile(os.path.join(compact_path, NumpyStorageEnums.IDS.value))
+
+        shutil.copyfile(
+            self.get_collection_path(collection_name, NumpyStorageEnums.CONFIG.value),
+            os.path.join(compact_path, NumpyStorageEnums.CONFIG.value),
+        )
+
+    # delete_asset_records method
+    def delete_asset_records(
+        self,
+        collection_name: str,
+        embedding_size: int,
+        asset_ids: List[int],
+        record_ids: List[int] = None,
+    ) -> int:
+        """
+        Rewrite the collection without the records of `asset_ids` into a
+        sibling directory and swap it in, so the append-only files are
+        never left half rewritten.
+        """
+        if collection_name not in self.repaired_collections:
+            self.repair_collection(collection_name, embedding_size)
+            self.repaired_collections.add(collection_name)
+
+        keep = self.get_asset_keep_mask(collection_name, asset_ids, record_ids)
+        deleted_count = int(len(keep) - np.count_nonzero(keep))
+        if deleted_count == 0:
+            return 0
+
+        collection_path = self.get_collection_path(collection_name)
+        compact_path = f"{collection_path}.compact"
+        old_path = f"{collection_path}.old"
+        for path in (compact_path, old_path):
+            if os.path.exists(path):
+                shutil.rmtree(path)
+
+        os.makedirs(compact_path)
+        self.compact_collection(collection_name, embedding_size, keep, compact_path)
+
+        os.rename(collection_path, old_path)
+        os.rename(compact_path, collection_path)
+        self.bump_generation(collection_name)
+        shutil.rmtree(old_path)
+
+        return deleted_count
+
+    # delete_by_asset_ids method
+    async def delete_by_asset_ids(
+        self, collection_name: str, asset_ids: List[int], record_ids: List[int] = None
+    ):
+        collection_config = self.read_collection_config(collection_name)
+        if collection_config is None or not asset_ids:
+            return True
+
+        async with self.get_collection_lock(collection_name):
+            try:
+                async with self.rewriting_collection(collection_name):
+                    deleted_count = await asyncio.to_thread(
+                        self.delete_asset_records,
+                        collection_name,
+                        collection_config["embedding_size"],
+                        asset_ids,
+                        record_ids,
+                    )
+            except Exception as e:
+                self.logger.error(f"Error while deleting asset records: {e}")
+                return False
+
+        self.logger.info(
+            f"Deleted {deleted_count} records of {len(asset_ids)} assets "
+            f"from collection: {collection_name}"
+        )
+        return True
+
+    # begin_bulk_load method
+    async def begin_bulk_load(self, collection_name: str, drop_index: bool = False):
+        return True
+
+    # end_bulk_load method
+    async def end_bulk_load(self, collection_name: str):
+        return True
+
+    # get_vectors method
+    def get_vectors(self, collection_name: str, embedding_size: int) -> np.ndarray:
+        records_count = self.get_records_count(collection_name)
+        if records_count == 0:
+            return None
+
+        # a rewrite can leave as many records as before, so the count alone
+        # does not tell the cached memmap is still the current file
+        generation = self.collection_generations.get(collection_name, 0)
+        cached = self.vectors_cache.get(collection_name)
+        if cached and cached[:2] == (generation, records_count):
+            return cached[2]
+
+        vectors = np.memmap(
+            self.get_collection_path(collection_name, NumpyStorageEnums.VECTORS.value),
+            dtype=np.float32,
+            mode="r",
+            shape=(records_count, embedding_size),
+        )
+        self.vectors_cache[collection_name] = (generation, records_count, vectors)
+        return vectors
+
+    # read_payloads method
+    def read_payloads(self, collection_name: str, indices: List[int]) -> List[dict]:
+        records_count = self.get_records_count(collection_name)
+        ends = np.memmap(
+            self.get_collection_path(collection_name, NumpyStorageEnums.OFFSETS.value),
+            dtype=np.uint64,
+            mode="r",
+            shape=(records_count,),
+        )
+
+        ids = np.memmap(
+            self.get_collection_path(collection_name, NumpyStorageEnums.IDS.value),
+            dtype=np.int64,
+            mode="r",
+            shape=(records_count,),
+        )
+
+        payloads = []
+        with open(
+            self.get_collection_path(collection_name, NumpyStorageEnums.PAYLOADS.value), "rb"
+        ) as f:
+            for index in indices:
+                start = int(ends[index - 1]) if index > 0 else 0
+                f.seek(start)
+                payload = json.loads(f.read(int(ends[index]) - start))
+                payload["id"] = int(ids[index])
+                payloads.append(payload)
+
+        return payloads
+
+    # matches_filters method
+    def matches_filters(self, metadata: dict, filters: List[dict]) -> bool:
+        return matches_metadata_filters(metadata=metadata, filters=filters)
+
+    # select_filtered method
+    def select_filtered(
+        self,
+        collection_name: str,
+        indices: np.ndarray,
+        scores: np.ndarray,
+        limit: int,
+        filters: List[dict],
+    ):
+        """
+        Walk `indices` from the best score down, checking payloads in growing
+        windows, until `limit` records match the filters or none are left.
+        """
+        matched = []
+        checked_count = 0
+        window_size = limit * 4
+        while len(matched) < limit and checked_count < len(indices):
+            ranked = self.top_k(scores, min(window_size, len(indices)))
+            window = ranked[checked_count:]
+            payloads = self.read_payloads(collection_name, indices[window].tolist())
+            matched.extend(
+                position
+                for position, payload in zip(window, payloads)
+                if self.matches_filters(payload.get("metadata"), filters)
+            )
+            checked_count = len(ranked)
+            window_size *= 4
+
+        matched = np.asarray(matched[:limit], dtype=np.int64)
+        return indices[matched], scores[matched]
+
+    # top_k method
+    def top_k(self, scores: np.ndarray, limit: int):
+        if len(scores) > limit:
+            candidates = np.argpartition(-scores, limit - 1)[:limit]
+        else:
+            candidates = np.arange(len(scores))
+        return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+    # exact_search method
+    def exact_search(
+        self, collection_name: str, vector: list, limit: int, filters: List[dict] = None
+    ):
+        return self.exact_search_batch(collection_name, [vector], limit, filters)[0]
+
+    # exact_search_batch method
+    def exact_search_batch(
+        self,
+        collection_name: str,
+        vectors: List[list],
+        limit: int,
+        filters: List[dict] = None,
+    ):
+        """
+        Score all query vectors in one pass over the collection, a block of
+        records against the whole query matrix at a time.
+        """
+        collection_config = self.read_collection_config(collection_name)
+        if collection_config is None:
+            return [([], []) for _ in vectors]
+
+        records = self.get_vectors(collection_name, collection_config["embedding_size"])
+        if records is None:
+            return [([], []) for _ in vectors]
+
+        queries = self.normalize_vectors(np.asarray(vectors, dtype=np.float32))
+
+        if filters:
+            # all scores are needed to keep walking down past filtered records
+            scores = np.concatenate(
+                [
+                    records[start : start + self.search_block_size] @ queries.T
+                    for start in range(0, len(records), self.search_block_size)
+                ]
+            )
+            results = []
+            for query_index in range(len(queries)):
+                indices, query_scores = self.select_filtered(
+                    collection_name,
+                    np.arange(len(records)),
+                    np.ascontiguousarray(scores[:, query_index]),
+                    limit,
+                    filters,
+                )
+                results.append((indices.tolist(), query_scores.tolist()))
+            return results
+
+        # score block by block so huge collections never materialize fully
+        candidate_indices = [[] for _ in queries]
+        candidate_scores = [[] for _ in queries]
+        for start in range(0, len(records), self.search_block_size):
+            block_scores = records[start : start + self.search_block_size] @ queries.T
+            for query_index in range(len(queries)):
+                query_block_scores = block_scores[:, query_index]
+                block_top = self.top_k(query_block_scores, limit)
+                candidate_indices[query_index].append(block_top + start)
+                candidate_scores[query_index].append(query_block_scores[block_top])
+
+        results = []
+        for query_index in range(len(queries)):
+            indices = np.concatenate(candidate_indices[query_index])
+            scores = np.concatenate(candidate_scores[query_index])
+            best = self.top_k(scores, limit)
+            results.append((indices[best].tolist(), scores[best].tolist()))
+        return results
+
+    # search_by_vector method
+    async def search_by_vector(
+        self,
+        collection_name: str,
+        vector: list,
+        limit: int = 5,
+        ef_search: int = None,
+        probes: int = None,
+        rerank_depth: int = None,
+        filters: List[dict] = None,
+    ):
+        # search is exact, ef_search, probes and rerank_depth do not apply
+        async with self.searching_collection(collection_name):
+            indices, scores = await asyncio.to_thread(
+                self.exact_search, collection_name, vector, limit, filters
+            )
+            if not indices:
+                return None
+
+            payloads = await asyncio.to_thread(
+                self.read_payloads, collection_name, indices
+            )
+
+        return self.to_retrieved_documents(scores=scores, payloads=payloads)
+
+    # search_by_vectors method
+    async def search_by_vectors(
+        self,
+        collection_name: str,
+        vectors: List[list],
+        limit: int = 5,
+        ef_search: int = None,
+        probes: int = None,
+        rerank_depth: int = None,
+        filters: List[dict] = None,
+    ):
+        if not vectors:
+            return []
+
+        async with self.searching_collection(collection_name):
+            results = await asyncio.to_thread(
+                self.exact_search_batch, collection_name, vectors, limit, filters
+            )
+
+            return await self.read_batch_results(collection_name, results)
+
+    # read_batch_results method
+    async def read_batch_results(self, collection_name: str, results: List[tuple]):
+        # queries of one batch often share hits, read each payload once
+        unique_indices = sorted({index for indices, _ in results for index in indices})
+        payloads = await asyncio.to_thread(
+            self.read_payloads, collection_name, unique_indices
+        )
+        payloads_by_index = dict(zip(unique_indices, payloads))
+
+        return [
+            self.to_retrieved_documents(
+                scores=scores,
+                payloads=[payloads_by_index[index] for index in indices],
+            )
+            for indices, scores in results
+        ]
+
+    # to_retrieved_documents method
+    def to_retrieved_documents(
+        self, scores: List[float], payloads: List[dict]
+    ) -> List[RetrievedDocument]:
+        return [
+            RetrievedDocument(
+                **{
+                    "score": score,
+                    "text": payload["text"],
+                    "chunk_id": payload.get("id"),
+                    "metadata": payload.get("metadata"),
+                }
+            )
+            for score, payload in zip(scores, payloads)
+        ]
@@ -0,0 +1,383 @@
+from .PGVectorProvider import PGVectorProvider
+from ..VectorDBEnums import (
+    PgVectorTableSchemeEnums,
+    PgVectorPartitionMethodEnums,
+)
+from typing import List
+import re
+import time
+from sqlalchemy.sql import text as sql_text
+
+
+class PGVectorPartitionedProvider(PGVectorProvider):
+    """
+    Stores every collection in one shared pgvector table per embedding size,
+    partitioned by collection name, instead of one table per project.
+
+    LIST partitioning gives each collection its own partition (and index);
+    HASH partitioning spreads collections over a fixed number of partitions,
+    so the catalog does not grow with the number of projects.
+    """
+
+    def __init__(
+        self,
+        db_client,
+        partition_method: str = PgVectorPartitionMethodEnums.LIST.value,
+        partition_count: int = 16,
+        collections_cache_ttl: int = 30,
+        **kwargs,
+    ):
+        super().__init__(db_client=db_client, **kwargs)
+
+        self.partition_method = partition_method
+        self.partition_count = partition_count
+        self.collections_cache_ttl = collections_cache_ttl
+
+        self.collection_column = PgVectorTableSchemeEnums.COLLECTION.value
+        self.registry_table_name = f"{self.pgvector_table_prefix}_collections"
+
+        # collection_name -> (table_name, partition_name, cached_at); other
+        # workers create and delete collections too, so entries expire
+        self.collections_cache = {}
+
+    async def connect(self):
+        await super().connect()
+
+        async with self.db_client() as session:
+            async with session.begin():
+                create_sql = sql_text(
+                    f"CREATE TABLE IF NOT EXISTS {self.registry_table_name} ("
+                    "collection_name text PRIMARY KEY, "
+                    "embedding_size integer NOT NULL, "
+                    "table_name text NOT NULL, "
+                    "partition_name text, "
+                    "created_at timestamptz NOT NULL DEFAULT now()"
+                    ")"
+                )
+                await session.execute(create_sql)
+
+    # get_parent_table_name method
+    def get_parent_table_name(self, embedding_size: int) -> str:
+        return f"{self.pgvector_table_prefix}_vectors_{int(embedding_size)}"
+
+    # get_partition_name method
+    def get_partition_name(self, collection_name: str) -> str:
+        return f"{self.pgvector_table_prefix}_{re.sub(r'[^a-zA-Z0-9_]', '_', collection_name)}"
+
+    # is_index_shared method
+    def is_index_shared(self) -> bool:
+        # hash partitions hold many collections behind one index
+        return self.partition_method == PgVectorPartitionMethodEnums.HASH.value
+
+    # quote_literal method
+    def quote_literal(self, value: str) -> str:
+        # partition bounds are DDL and can not use bind parameters
+        return "'" + value.replace("'", "''") + "'"
+
+    # get_collection_record method
+    async def get_collection_record(self, collection_name: str, refresh: bool = False):
+        cached = self.collections_cache.get(collection_name)
+        if (
+            cached
+            and not refresh
+            and time.monotonic() - cached[2] < self.collections_cache_ttl
+        ):
+            return cached[:2]
+
+        async with self.db_client() as session:
+            async with session.begin():
+                select_sql = sql_text(
+                    f"SELECT table_name, partition_name FROM {self.registry_table_name} "
+                    "WHERE collection_name = :collection_name"
+                )
+                result = await session.execute(
+                    select_sql, {"collection_name": collection_name}
+                )
+                record = result.fetchone()
+
+        if not record:
+            self.collections_cache.pop(collection_name, None)
+            return None
+
+        self.collections_cache[collection_name] = (record[0], record[1], time.monotonic())
+        return record[0], record[1]
+
+    async def get_table_name(self, collection_name: str) -> str:
+        record = await self.get_collection_record(collection_name=collection_name)
+        return record[0] if record else None
+
+    async def get_index_table_name(self, collection_name: str) -> str:
+        record = await self.get_collection_record(collection_name=collection_name)
+        if not record:
+            return None
+
+        table_name, partition_name = record
+        if partition_name:
+            return partition_name
+
+        # hash layout: the partition is whichever one holds this collection
+        async with self.db_client() as session:
+            async with session.begin():
+                partition_sql = sql_text(
+                    f"SELECT tableoid::regclass::text FROM {table_name} "
+                    f"WHERE {self.collection_column} = :collection_name LIMIT 1"
+                )
+                result = await session.execute(
+                    partition_sql, {"collection_name": collection_name}
+                )
+                return result.scalar_one_or_none()
+
+    async def is_collection_existed(self, collection_name: str) -> bool:
+        record = await self.get_collection_record(collection_name=collection_name)
+        return record is not None
+
+    async def list_all_collections(self) -> List:
+        async with self.db_client() as session:
+            async with session.begin():
+                list_sql = sql_text(
+                    f"SELECT collection_name FROM {self.registry_table_name} "
+                    "ORDER BY collection_name"
+                )
+                results = await session.execute(list_sql)
+                return results.scalars().all()
+
+    async def get_collection_info(self, collection_name: str) -> dict:
+        record = await self.get_collection_record(collection_name=collection_name)
+        if not record:
+            return None
+
+        table_name, partition_name = record
+        async with self.db_client() as session:
+            async with session.begin():
+                count_sql = sql_text(
+                    f"SELECT COUNT(*) FROM {table_name} "
+                    f"WHERE {self.collection_column} = :collection_name"
+                )
+                record_count = await session.execute(
+                    count_sql, {"collection_name": collection_name}
+                )
+
+                return {
+                    "table_info": {
+                        "tablename": table_name,
+                        "partition_method": self.partition_method,
+                        "partition_name": partition_name,
+                    },
+                    "record_count": record_count.scalar_one(),
+                }
+
+    async def delete_collection(self, collection_name: str):
+        record = await self.get_collection_record(
+            collection_name=collection_name, refresh=True
+        )
+        self.collections_cache.pop(collection_name, None)
+        if not record:
+            return True
+
+        table_name, partition_name = record
+        async with self.db_client() as session:
+            async with session.begin():
+                self.logger.info(f"Deleting collection:{collection_name}")
+                if partition_name:
+                    delete_sql = sql_text(f"DROP TABLE IF EXISTS {partition_name}")
+                    await session.execute(delete_sql)
+                else:
+                    delete_sql = sql_text(
+                        f"DELETE FROM {table_name} "
+                        f"WHERE {self.collection_column} = :collection_name"
+                    )
+                    await session.execute(
+                        delete_sql, {"collection_name": collection_name}
+                    )
+
+                unregister_sql = sql_text(
+                    f"DELETE FROM {self.registry_table_name} "
+                    "WHERE collection_name = :collection_name"
+                )
+                await session.execute(
+                    unregister_sql, {"collection_name": collection_name}
+                )
+        return True
+
+    # create_parent_table method
+    async def create_parent_table(self, session, embedding_size: int) -> str:
+        table_name = self.get_parent_table_name(embedding_size=embedding_size)
+        partition_by = (
+            "HASH" if self.partition_method == PgVectorPartitionMethodEnums.HASH.value else "LIST"
+        )
+
+        create_sql = sql_text(
+            f"CREATE TABLE IF NOT EXISTS {table_name} ("
+            f"{PgVectorTableSchemeEnums.ID.value} bigserial, "
+            f"{self.collection_column} text NOT NULL, "
+            f"{PgVectorTableSchemeEnums.TEXT.value} text, "
+            f"{PgVectorTableSchemeEnums.VECTOR.value} vector({int(embedding_size)}), "
+            f"{PgVectorTableSchemeEnums.METADATA.value} jsonb DEFAULT '{{}}', "
+            f"{PgVectorTableSchemeEnums.CHUNK_ID.value} integer, "
+            f"PRIMARY KEY ({PgVectorTableSchemeEnums.ID.value}, {self.collection_column}), "
+            f"FOREIGN KEY ({PgVectorTableSchemeEnums.CHUNK_ID.value}) REFERENCES chunks(chunk_id)"
+            f") PARTITION BY {partition_by} ({self.collection_column})"
+        )
+        await session.execute(create_sql)
+
+        # created on the parent, so every partition inherits it
+        create_index_sql = sql_text(
+            f"CREATE INDEX IF NOT EXISTS {table_name}_metadata_idx "
+            f"ON {table_name} USING gin "
+            f"({PgVectorTableSchemeEnums.METADATA.value} jsonb_path_ops)"
+        )
+        await session.execute(create_index_sql)
+
+        if self.partition_method == PgVectorPartitionMethodEnums.HASH.value:
+            for remainder in range(self.partition_count):
+                partition_sql = sql_text(
+                    f"CREATE TABLE IF NOT EXISTS {table_name}_p{remainder} "
+                    f"PARTITION OF {table_name} "
+                    f"FOR VALUES WITH (MODULUS {int(self.partition_count)}, REMAINDER {remainder})"
+                )
+                await session.execute(partition_sql)
+
+        return table_name
+
+    async def create_collection(
+        self, collection_name: str, embedding_size: int, do_reset: bool = False
+    ):
+        if do_reset:
+            _ = await self.delete_collection(collection_name=collection_name)
+
+        # checked against the registry, the collection may have been
+        # deleted by another worker since it was cached
+        record = await self.get_collection_record(
+            collection_name=collection_name, refresh=True
+        )
+        if record:
+            return False
+
+        self.logger.info(f"Creating collecion: {collection_name}")
+        partition_name = None
+        async with self.db_client() as session:
+            async with session.begin():
+                table_name = await self.create_parent_table(
+                    session=session, embedding_size=embedding_size
+                )
+
+                if self.partition_method == PgVectorPartitionMethodEnums.LIST.value:
+                    partition_name = self.get_partition_name(
+                        collection_name=collection_name
+                    )
+                    partition_sql = sql_text(
+                        f"CREATE TABLE {partition_name} "
+                        f"PARTITION OF {table_name} "
+                        f"FOR VALUES IN ({self.quote_literal(collection_name)})"
+                    )
+                    await session.execute(partition_sql)
+
+                register_sql = sql_text(
+                    f"INSERT INTO {self.registry_table_name} "
+                    "(collection_name, embedding_size, table_name, partition_name) "
+                    "VALUES (:collection_name, :embedding_size, :table_name, :partition_name)"
+                )
+                await session.execute(
+                    register_sql,
+                    {
+                        "collection_name": collection_name,
+                        "embedding_size": embedding_size,
+                        "table_name": table_name,
+                        "partition_name": partition_name,
+                    },
+                )
+
+        self.collections_cache[collection_name] = (
+            table_name, partition_name, time.monotonic()
+        )
+        return True
+
+    async def begin_bulk_load(self, collection_name: str, drop_index: bool = False):
+        record = await self.get_collection_record(collection_name=collection_name)
+        if drop_index and record and not record[1]:
+            # a hash partition index is shared with other collections
+            self.logger.info(
+                f"Keeping shared hash partition index during bulk load: {collection_name}"
+            )
+            drop_index = False
+
+        return await super().begin_bulk_load(
+            collection_name=collection_name, drop_index=drop_index
+        )
+
+    # migrate_collection method
+    async def migrate_collection(self, collection_name: str) -> int:
+        """
+        Move a collection stored as its own table (the table-per-collection
+        layout) into the partitioned layout, then drop the old table.
+
+        Returns the number of moved records, or None if there was nothing
+        to migrate.
+        """
+        async with self.db_client() as session:
+            async with session.begin():
+                size_sql = sql_text(
+                    "SELECT a.atttypmod FROM pg_attribute a "
+                    "JOIN pg_class c ON c.oid = a.attrelid "
+                    "WHERE c.relname = :collection_name AND c.relkind = 'r' "
+                    "AND a.attname = :vector_column"
+                )
+                result = await session.execute(
+                    size_sql,
+                    {
+                        "collection_name": collection_name,
+                        "vector_column": PgVectorTableSchemeEnums.VECTOR.value,
+                    },
+                )
+                embedding_size = result.scalar_one_or_none()
+
+        if not embedding_size:
+            self.logger.error(f"No table to migrate for collection: {collection_name}")
+            return None
+
+        _ = await self.create_collection(
+            collection_name=collection_name, embedding_size=embedding_size
+        )
+        table_name = await self.get_table_name(collection_name=collection_name)
+
+        columns = ", ".join(
+            [
+                PgVectorTableSchemeEnums.TEXT.value,
+                PgVectorTableSchemeEnums.VECTOR.value,
+                PgVectorTableSchemeEnums.METADATA.value,
+                PgVectorTableSchemeEnums.CHUNK_ID.value,
+            ]
+        )
+        async with self.db_client() as session:
+            async with session.begin():
+                move_sql = sql_text(
+                    f"INSERT INTO {table_name} ({self.collection_column}, {columns}) "
+                    f"SELECT :collection_name, {columns} FROM {collection_name}"
+                )
+                result = await session.execute(
+                    move_sql, {"collection_name": collection_name}
+                )
+                moved_count = result.rowcount
+
+                await session.execute(sql_text(f"DROP TABLE {collection_name}"))
+
+        await self.create_vector_index(collection_name=collection_name)
+        self.logger.info(
+            f"Migrated {moved_count} records of collection: {collection_name}"
+        )
+        return moved_count
+
+    # list_legacy_collections method
+    async def list_legacy_collections(self, prefix: str = "collection_") -> List:
+        async with self.db_client() as session:
+            async with session.begin():
+                list_sql = sql_text(
+                    "SELECT c.relname FROM pg_class c "
+                    "JOIN pg_namespace n ON n.oid = c.relnamespace "
+                    "WHERE c.relkind = 'r' AND NOT c.relispartition "
+                    "AND n.nspname = current_schema() "
+                    "AND starts_with(c.relname, :prefix) "
+                    "ORDER BY c.relname"
+                )
+                results = await session.execute(list_sql, {"prefix": prefix})
+                return results.scalars().all()
@@ -2,15 +2,25 @@ from ..VectorDBInterface import VectorDBInterface
 from ..VectorDBEnums import (
     DistanceMethodEnums,
     PgVectorDistanceMethodEnums,
+    PgVectorDistanceOperatorEnums,
     PgVectorTableSchemeEnums,
     PgVectorIndexTypeEnums,
+    PgVectorInsertModeEnums,
+    PgVectorIterativeScanEnums,
+    FilterOperatorEnums,
 )
 import logging
 from typing import List
 from models.db_schemes import RetrievedDocument
 from sqlalchemy.sql import text as sql_text
+import numpy as np
+import struct
 import json
 
+# PostgreSQL binary COPY framing: signature, flags and header extension length
+PG_COPY_BINARY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+PG_COPY_BINARY_TRAILER = struct.pack(">h", -1)
+
 
 class PGVectorProvider(VectorDBInterface):
 
@@ -20,33 +30,116 @@ class PGVectorProvider(VectorDBInterface):
         default_vector_size: int = 786,
         distance_method: str = None,
         index_threshold: int = 100,
+        insert_mode: str = PgVectorInsertModeEnums.COPY.value,
+        index_type: str = PgVectorIndexTypeEnums.HNSW.value,
+        hnsw_m: int = 16,
+        hnsw_ef_construction: int = 64,
+        ivfflat_lists: int = None,
+        maintenance_work_mem: str = None,
+        max_parallel_maintenance_workers: int = None,
+        index_concurrently: bool = False,
+        iterative_scan: str = PgVectorIterativeScanEnums.RELAXED_ORDER.value,
+        hnsw_max_scan_tuples: int = None,
+        ivfflat_max_probes: int = None,
     ):
         self.db_client = db_client
         self.default_vector_size = default_vector_size
 
         self.index_threshold = index_threshold
+        self.insert_mode = insert_mode
+
+        self.index_type = index_type
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_construction = hnsw_ef_construction
+        self.ivfflat_lists = ivfflat_lists
+        self.maintenance_work_mem = maintenance_work_mem
+        self.max_parallel_maintenance_workers = max_parallel_maintenance_workers
+        self.index_concurrently = index_concurrently
+
+        # filtered ANN scans keep going until enough rows pass the filter
+        # (pgvector >= 0.8), checked against the installed version on connect
+        self.iterative_scan = iterative_scan
+        self.hnsw_max_scan_tuples = hnsw_max_scan_tuples
+        self.ivfflat_max_probes = ivfflat_max_probes
+        self.supports_iterative_scan = False
+
+        # collections being bulk loaded skip per-insert index builds
+        self.bulk_load_collections = set()
+
+        # set by layouts that share one table between collections
+        self.collection_column = None
+
+        # the ORDER BY operator must match the index opclass for the ANN
+        # index to be used; score converts the distance back to a similarity
+        vector_column = PgVectorTableSchemeEnums.VECTOR.value
+        self.distance_operator = PgVectorDistanceOperatorEnums.COSINE.value
+        self.score_template = f"1 - ({vector_column} <=> {{query}})"
 
         if distance_method == DistanceMethodEnums.COSINE.value:
             distance_method = PgVectorDistanceMethodEnums.COSINE.value
         elif distance_method == DistanceMethodEnums.DOT.value:
             distance_method = PgVectorDistanceMethodEnums.DOT.value
+            self.distance_operator = PgVectorDistanceOperatorEnums.DOT.value
+            self.score_template = f"({vector_column} <#> {{query}}) * -1"
+
+        self.score_expression = self.score_template.format(query=":vector")
 
         self.distance_method = distance_method
         self.pgvector_table_prefix = PgVectorTableSchemeEnums._PREFIX.value
         self.logger = logging.getLogger("uvicorn")
         self.default_index_name = (
-            lambda collection_name: f"{collection_name}_vector_idx"
+            lambda table_name: f"{table_name}_vector_idx"
         )
 
     async def connect(self):
         async with self.db_client() as session:
             async with session.begin():
                 await session.execute(sql_text("CREATE EXTENSION IF NOT EXISTS vector"))
+                result = await session.execute(
+                    sql_text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+                )
+                extension_version = result.scalar_one_or_none()
                 await session.commit()
 
+        self.supports_iterative_scan = self.is_version_at_least(extension_version, (0, 8))
+        if not self.supports_iterative_scan:
+            self.logger.info(
+                f"pgvector {extension_version} has no iterative index scans, "
+                "filtered searches may return fewer rows than requested"
+            )
+
+    # is_version_at_least method
+    def is_version_at_least(self, version: str, minimum: tuple) -> bool:
+        if not version:
+            return False
+        try:
+            return tuple(int(part) for part in version.split(".")[:2]) >= minimum
+        except ValueError:
+            return False
+
     async def disconnect(self):
         pass
 
+    # get_table_name method
+    async def get_table_name(self, collection_name: str) -> str:
+        return collection_name
+
+    # get_index_table_name method
+    async def get_index_table_name(self, collection_name: str) -> str:
+        return collection_name
+
+    # get_collection_conditions method
+    def get_collection_conditions(self) -> List[str]:
+        if not self.collection_column:
+            return []
+        return [f"{self.collection_column} = :collection_name"]
+
+    # is_index_shared method
+    def is_index_shared(self) -> bool:
+        # whether the vector index also holds rows of other collections, so
+        # the collection condition filters its results like a metadata filter
+        return False
+
     async def is_collection_existed(self, collection_name: str) -> bool:
         record = None
         async with self.db_client() as session:
@@ -141,23 +234,43 @@ class PGVectorProvider(VectorDBInterface):
 
                     await session.execute(create_sql)
                     await session.commit()
+
+            await self.create_metadata_index(collection_name=collection_name)
             return True
         return False
 
-    async def is_index_existed(self, collection_name: str) -> bool:
-        index_name = self.default_index_name(collection_name=collection_name)
+    # create_metadata_index method
+    async def create_metadata_index(self, collection_name: str) -> bool:
+        table_name = await self.get_table_name(collection_name=collection_name)
+        if not table_name:
+            return False
+
+        # jsonb_path_ops serves the @> containment filters of search_by_vector
+        async with self.db_client() as session:
+            async with session.begin():
+                create_index_sql = sql_text(
+                    f"CREATE INDEX IF NOT EXISTS {table_name}_metadata_idx "
+                    f"ON {table_name} USING gin "
+                    f"({PgVectorTableSchemeEnums.METADATA.value} jsonb_path_ops)"
+                )
+                await session.execute(create_index_sql)
+
+        return True
+
+    async def is_index_existed(self, table_name: str) -> bool:
+        index_name = self.default_index_name(table_name)
         async with self.db_client() as session:
             async with session.begin():
                 check_sql = sql_text(
                     f"""
                     SELECT 1 FROM pg_indexes 
-                    WHERE tablename= :collection_name
+                    WHERE tablename= :table_name
                     AND indexname = :index_name
                     """
                 )
                 results = await session.execute(
                     check_sql,
-                    {"index_name": index_name, "collection_name": collection_name},
+                    {"index_name": index_name, "table_name": table_name},
                 )
                 return bool(results.scalar_one_or_none())
 
@@ -184,15 +297,18 @@ class PGVectorProvider(VectorDBInterface):
             )
             return False
 
+        table_name = await self.get_table_name(collection_name=collection_name)
         async with self.db_client() as session:
             async with session.begin():
                 insert_sql = sql_text(
-                    f"INSERT INTO {collection_name} "
-                    f"({PgVectorTableSchemeEnums.TEXT.value}, {PgVectorTableSchemeEnums.VECTOR.value}, {PgVectorTableSchemeEnums.METADATA.value}, {PgVectorTableSchemeEnums.CHUNK_ID.value})"
-                    "VALUES (:text, :vector, :metadata, :chunk_id)"
+                    f"INSERT INTO {table_name} "
+                    f"({self.get_insert_columns()}) "
+                    f"VALUES ({self.get_insert_values()})"
                 )
-                metadata_json = json.dumps(
-                    metadata, ensure_ascii=False if metadata is not None else "{}"
+                metadata_json = (
+                    json.dumps(metadata, ensure_ascii=False)
+                    if metadata is not None
+                    else "{}"
                 )
                 await session.execute(
                     insert_sql,
@@ -201,10 +317,12 @@ class PGVectorProvider(VectorDBInterface):
                         "vector": "[" + ",".join([str(v) for v in vector]) + "]",
                         "metadata": metadata_json,
                         "chunk_id": record_id,
+                        "collection_name": collection_name,
                     },
                 )
                 await session.commit()
-        await self.create_vector_index(collection_name=collection_name)
+        if collection_name not in self.bulk_load_collections:
+            await self.create_vector_index(collection_name=collection_name)
 
         return True
 
@@ -233,6 +351,20 @@ class PGVectorProvider(VectorDBInterface):
         if not metadata or len(metadata) == 0:
             metadata = [None] * len(texts)
 
+        if self.insert_mode == PgVectorInsertModeEnums.COPY.value:
+            is_copied = await self.copy_many(
+                collection_name=collection_name,
+                texts=texts,
+                vectors=vectors,
+                metadata=metadata,
+                record_ids=record_ids,
+            )
+            if is_copied:
+                if collection_name not in self.bulk_load_collections:
+                    await self.create_vector_index(collection_name=collection_name)
+                return True
+
+        table_name = await self.get_table_name(collection_name=collection_name)
         async with self.db_client() as session:
             async with session.begin():
                 for i in range(0, len(texts), batch_size):
@@ -258,25 +390,270 @@ class PGVectorProvider(VectorDBInterface):
                                 + "]",
                                 "metadata": metadata_json,
                                 "chunk_id": _record_id,
+                                "collection_name": collection_name,
                             }
                         )
 
                     batch_insert_sql = sql_text(
-                        f"INSERT INTO {collection_name} "
-                        f"({PgVectorTableSchemeEnums.TEXT.value}, "
-                        f"{PgVectorTableSchemeEnums.VECTOR.value}, "
-                        f"{PgVectorTableSchemeEnums.METADATA.value}, "
-                        f"{PgVectorTableSchemeEnums.CHUNK_ID.value}) "
-                        f"VALUES (:text, :vector, :metadata, :chunk_id)"
+                        f"INSERT INTO {table_name} "
+                        f"({self.get_insert_columns()}) "
+                        f"VALUES ({self.get_insert_values()})"
                     )
 
                     await session.execute(batch_insert_sql, values)
-        await self.create_vector_index(collection_name=collection_name)
+        if collection_name not in self.bulk_load_collections:
+            await self.create_vector_index(collection_name=collection_name)
 
         return True
 
+    # delete_by_asset_ids method
+    async def delete_by_asset_ids(
+        self, collection_name: str, asset_ids: List[int], record_ids: List[int] = None
+    ):
+        if not asset_ids:
+            return True
+
+        is_collection_existed = await self.is_collection_existed(
+            collection_name=collection_name
+        )
+        if not is_collection_existed:
+            return True
+
+        # matched through the chunks table, which every record references,
+        # so records without an asset id in their metadata go too
+        conditions = self.get_collection_conditions() + [
+            f"{PgVectorTableSchemeEnums.CHUNK_ID.value} IN ("
+            "SELECT chunk_id FROM chunks WHERE chunk_asset_id = ANY(:asset_ids))"
+        ]
+
+        table_name = await self.get_table_name(collection_name=collection_name)
+        try:
+            async with self.db_client() as session:
+                async with session.begin():
+                    delete_sql = sql_text(
+                        f"DELETE FROM {table_name} WHERE {' AND '.join(conditions)}"
+                    )
+                    result = await session.execute(
+                        delete_sql,
+                        {"collection_name": collection_name, "asset_ids": list(asset_ids)},
+                    )
+        except Exception as e:
+            self.logger.error(f"Error while deleting asset records: {e}")
+            return False
+
+        self.logger.info(
+            f"Deleted {result.rowcount} records of {len(asset_ids)} assets "
+            f"from collection: {collection_name}"
+        )
+        return True
+
+    # get_insert_columns method
+    def get_insert_columns(self) -> str:
+        columns = [
+            PgVectorTableSchemeEnums.TEXT.value,
+            PgVectorTableSchemeEnums.VECTOR.value,
+            PgVectorTableSchemeEnums.METADATA.value,
+            PgVectorTableSchemeEnums.CHUNK_ID.value,
+        ]
+        if self.collection_column:
+            columns.append(self.collection_column)
+        return ", ".join(columns)
+
+    # get_insert_values method
+    def get_insert_values(self) -> str:
+        values = [":text", ":vector", ":metadata", ":chunk_id"]
+        if self.collection_column:
+            values.append(":collection_name")
+        return ", ".join(values)
+
+    # encode_copy_rows method
+    def encode_copy_rows(
+        self,
+        texts: list,
+        vectors: np.ndarray,
+        metadata: list,
+        record_ids: list,
+        collection_name: str = None,
+    ):
+        """
+        Yield rows in PostgreSQL binary COPY format.
+
+        Vectors go over the wire in pgvector's binary layout (int16 dim,
+        int16 unused, big-endian float32 values), taken straight from a
+        contiguous NumPy buffer.
+        """
+        dimension = vectors.shape[1]
+        vector_header = struct.pack(">hh", dimension, 0)
+        vector_length = struct.pack(">i", len(vector_header) + 4 * dimension)
+        vectors = np.ascontiguousarray(vectors, dtype=">f4")
+
+        fields_count = struct.pack(">h", 4)
+        collection_field = b""
+        if self.collection_column:
+            collection_bytes = collection_name.encode("utf-8")
+            fields_count = struct.pack(">h", 5)
+            collection_field = struct.pack(">i", len(collection_bytes)) + collection_bytes
+
+        for _text, _vector, _metadata, _record_id in zip(
+            texts, vectors, metadata, record_ids
+        ):
+            text_bytes = (_text or "").encode("utf-8")
+            metadata_bytes = b"\x01" + json.dumps(
+                _metadata if _metadata is not None else {}, ensure_ascii=False
+            ).encode("utf-8")
+
+            yield b"".join(
+                [
+                    fields_count,
+                    struct.pack(">i", len(text_bytes)),
+                    text_bytes,
+                    vector_length,
+                    vector_header,
+                    _vector.tobytes(),
+                    struct.pack(">i", len(metadata_bytes)),
+                    metadata_bytes,
+                    (
+                        struct.pack(">ii", 4, _record_id)
+                        if _record_id is not None
+                        else struct.pack(">i", -1)
+                    ),
+                    collection_field,
+                ]
+            )
+
+    # copy_many method
+    async def copy_many(
+        self,
+        collection_name: str,
+        texts: list,
+        vectors: list,
+        metadata: list,
+        record_ids: list,
+    ) -> bool:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2:
+            self.logger.error(f"Invalid vectors shape for collection: {collection_name}")
+            return False
+
+        async def copy_source():
+            yield PG_COPY_BINARY_HEADER
+            for row in self.encode_copy_rows(
+                texts=texts,
+                vectors=vectors,
+                metadata=metadata,
+                record_ids=record_ids,
+                collection_name=collection_name,
+            ):
+                yield row
+            yield PG_COPY_BINARY_TRAILER
+
+        table_name = await self.get_table_name(collection_name=collection_name)
+        async with self.db_client() as session:
+            async with session.begin():
+                connection = await session.connection()
+                raw_connection = await connection.get_raw_connection()
+                driver_connection = getattr(raw_connection, "driver_connection", None)
+
+                if not hasattr(driver_connection, "copy_to_table"):
+                    self.logger.info(
+                        "Binary COPY is not supported by the db driver, falling back to INSERT"
+                    )
+                    return False
+
+                await driver_connection.copy_to_table(
+                    table_name,
+                    source=copy_source(),
+                    columns=self.get_insert_columns().split(", "),
+                    format="binary",
+                )
+
+        return True
+
+    # get_search_settings method
+    def get_search_settings(
+        self, ef_search: int = None, probes: int = None, is_filtered: bool = False
+    ) -> dict:
+        search_settings = {}
+        if ef_search:
+            search_settings["hnsw.ef_search"] = int(ef_search)
+        if probes:
+            search_settings["ivfflat.probes"] = int(probes)
+
+        if is_filtered and self.use_iterative_scan():
+            search_settings["hnsw.iterative_scan"] = self.iterative_scan
+            search_settings["ivfflat.iterative_scan"] = self.iterative_scan
+            if self.hnsw_max_scan_tuples:
+                search_settings["hnsw.max_scan_tuples"] = int(self.hnsw_max_scan_tuples)
+            if self.ivfflat_max_probes:
+                search_settings["ivfflat.max_probes"] = int(self.ivfflat_max_probes)
+
+        return search_settings
+
+    # use_iterative_scan method
+    def use_iterative_scan(self) -> bool:
+        return (
+            self.supports_iterative_scan
+            and self.iterative_scan
+            and self.iterative_scan != PgVectorIterativeScanEnums.OFF.value
+        )
+
+    # get_filter_conditions method
+    def get_filter_conditions(self, filters: List[dict] = None):
+        conditions, params = [], {}
+        metadata_column = PgVectorTableSchemeEnums.METADATA.value
+        range_operators = {
+            FilterOperatorEnums.GT.value: ">",
+            FilterOperatorEnums.GTE.value: ">=",
+            FilterOperatorEnums.LT.value: "<",
+            FilterOperatorEnums.LTE.value: "<=",
+        }
+
+        for i, condition in enumerate(filters or []):
+            field = condition["field"]
+            operator = condition.get("operator") or FilterOperatorEnums.EQ.value
+            value = condition.get("value")
+            key = f"filter_{i}"
+
+            # equality goes through @> containment so the GIN index applies
+            if operator == FilterOperatorEnums.EQ.value:
+                conditions.append(f"{metadata_column} @> CAST(:{key} AS jsonb)")
+                params[key] = json.dumps({field: value})
+
+            elif operator == FilterOperatorEnums.NE.value:
+                conditions.append(f"NOT ({metadata_column} @> CAST(:{key} AS jsonb))")
+                params[key] = json.dumps({field: value})
+
+            elif operator == FilterOperatorEnums.IN.value:
+                in_conditions = []
+                for j, item in enumerate(value or []):
+                    in_conditions.append(f"{metadata_column} @> CAST(:{key}_{j} AS jsonb)")
+                    params[f"{key}_{j}"] = json.dumps({field: item})
+                conditions.append(
+                    f"({' OR '.join(in_conditions)})" if in_conditions else "FALSE"
+                )
+
+            elif operator in range_operators:
+                conditions.append(
+                    f"CAST({metadata_column} ->> :{key}_field AS double precision) "
+                    f"{range_operators[operator]} :{key}"
+                )
+                params[f"{key}_field"] = field
+                params[key] = float(value)
+
+            else:
+                raise ValueError(f"Unsupported filter operator: {operator}")
+
+        return conditions, params
+
     async def search_by_vector(
-        self, collection_name: str, vector: list, limit: int
+        self,
+        collection_name: str,
+        vector: list,
+        limit: int,
+        ef_search: int = None,
+        probes: int = None,
+        rerank_depth: int = None,
+        filters: List[dict] = None,
     ) -> List[RetrievedDocument]:
         is_collection_existed = await self.is_collection_existed(
             collection_name=collection_name
@@ -288,63 +665,283 @@ class PGVectorProvider(VectorDBInterface):
             return False
 
         vector = "[" +",".join([str(v) for v in vector]) + "]"
+        table_name = await self.get_table_name(collection_name=collection_name)
+
+        filter_conditions, filter_params = self.get_filter_conditions(filters=filters)
+        conditions = self.get_collection_conditions() + filter_conditions
+        where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        search_settings = self.get_search_settings(
+            ef_search=ef_search,
+            probes=probes,
+            is_filtered=bool(filter_conditions) or self.is_index_shared(),
+        )
+
+        search_sql = f"""
+            SELECT {PgVectorTableSchemeEnums.TEXT.value} AS text,
+                {self.score_expression} AS score,
+                {PgVectorTableSchemeEnums.CHUNK_ID.value} AS chunk_id,
+                {PgVectorTableSchemeEnums.METADATA.value} AS metadata
+            FROM {table_name}
+            {where_clause}
+            ORDER BY {PgVectorTableSchemeEnums.VECTOR.value} {self.distance_operator} :vector
+            LIMIT :limit
+        """
+        if search_settings.get("hnsw.iterative_scan") == PgVectorIterativeScanEnums.RELAXED_ORDER.value:
+            # relaxed iterative scans may return rows slightly out of order
+            search_sql = (
+                f"WITH results AS MATERIALIZED ({search_sql}) "
+                "SELECT * FROM results ORDER BY score DESC"
+            )
+
         async with self.db_client() as session:
             async with session.begin():
-                search_sql = sql_text(
-                    f"""
-                    SELECT {PgVectorTableSchemeEnums.TEXT.value} AS text,
-                        1 - ({PgVectorTableSchemeEnums.VECTOR.value} <=> :vector) AS score
-                    FROM {collection_name}
-                    ORDER BY score DESC
-                    LIMIT {limit}
-                    """
+                # SET LOCAL keeps the recall knobs scoped to this transaction
+                for name, value in search_settings.items():
+                    await session.execute(sql_text(f"SET LOCAL {name} = {value}"))
+
+                result = await session.execute(
+                    sql_text(search_sql),
+                    {
+                        "vector": vector,
+                        "limit": limit,
+                        "collection_name": collection_name,
+                        **filter_params,
+                    },
                 )
-                result = await session.execute(search_sql, {"vector": vector})
                 records = result.fetchall()
 
                 return [
-                    RetrievedDocument(text=record.text, score=record.score)
+                    RetrievedDocument(
+                        text=record.text,
+                        score=record.score,
+                        chunk_id=record.chunk_id,
+                        metadata=record.metadata,
+                    )
                     for record in records
                 ]
 
-    async def create_vector_index(
-        self, collection_name: str, index_type: str = PgVectorIndexTypeEnums.HNSW.value
-    ):
-        is_index_existed = await self.is_index_existed(collection_name=collection_name)
-        if is_index_existed:
+    # search_by_vectors method
+    async def search_by_vectors(
+        self,
+        collection_name: str,
+        vectors: List[list],
+        limit: int,
+        ef_search: int = None,
+        probes: int = None,
+        rerank_depth: int = None,
+        filters: List[dict] = None,
+    ) -> List[List[RetrievedDocument]]:
+        is_collection_existed = await self.is_collection_existed(
+            collection_name=collection_name
+        )
+        if not is_collection_existed:
+            self.logger.error(
+                f"Can not search in non-existed collection: {collection_name}"
+            )
             return False
 
+        if not vectors:
+            return []
+
+        table_name = await self.get_table_name(collection_name=collection_name)
+
+        filter_conditions, filter_params = self.get_filter_conditions(filters=filters)
+        conditions = self.get_collection_conditions() + filter_conditions
+        where_clause = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        search_settings = self.get_search_settings(
+            ef_search=ef_search,
+            probes=probes,
+            is_filtered=bool(filter_conditions) or self.is_index_shared(),
+        )
+
+        vectors_params = {
+            f"vector_{i}": "[" + ",".join([str(v) for v in vector]) + "]"
+            for i, vector in enumerate(vectors)
+        }
+        queries_values = ", ".join(
+            f"({i}, CAST(:vector_{i} AS vector))" for i in range(len(vectors))
+        )
+
+        # every query vector drives its own ANN index scan through the lateral
+        # join; the outer sort also restores order after relaxed iterative scans
+        search_sql = f"""
+            SELECT queries.query_index, results.*
+            FROM (VALUES {queries_values}) AS queries(query_index, query_vector)
+            CROSS JOIN LATERAL (
+                SELECT {PgVectorTableSchemeEnums.TEXT.value} AS text,
+                    {self.score_template.format(query="queries.query_vector")} AS score,
+                    {PgVectorTableSchemeEnums.CHUNK_ID.value} AS chunk_id,
+                    {PgVectorTableSchemeEnums.METADATA.value} AS metadata
+                FROM {table_name}
+                {where_clause}
+                ORDER BY {PgVectorTableSchemeEnums.VECTOR.value} {self.distance_operator} queries.query_vector
+                LIMIT :limit
+            ) AS results
+            ORDER BY queries.query_index, results.score DESC
+        """
+
         async with self.db_client() as session:
             async with session.begin():
-                count_sql = sql_text(f"SELECT COUNT(*) FROM {collection_name}")
-                result = await session.execute(count_sql)
-                records_count = result.scalar_one()
-                if records_count < self.index_threshold:
-                    return False
+                for name, value in search_settings.items():
+                    await session.execute(sql_text(f"SET LOCAL {name} = {value}"))
 
-                self.logger.info(
-                    f"START: Creating vector index for collection: {collection_name}"
+                result = await session.execute(
+                    sql_text(search_sql),
+                    {
+                        "limit": limit,
+                        "collection_name": collection_name,
+                        **vectors_params,
+                        **filter_params,
+                    },
                 )
+                records = result.fetchall()
 
-                index_name = self.default_index_name(collection_name=collection_name)
-                create_index_sql = sql_text(
-                    f"CREATE INDEX {index_name} ON {collection_name} "
-                    f"USING {index_type} ({PgVectorTableSchemeEnums.VECTOR.value} {self.distance_method})"
+        results = [[] for _ in vectors]
+        for record in records:
+            results[record.query_index].append(
+                RetrievedDocument(
+                    text=record.text,
+                    score=record.score,
+                    chunk_id=record.chunk_id,
+                    metadata=record.metadata,
                 )
-                await session.execute(create_index_sql)
-                self.logger.info(
-                    f"END: Created vector index for collection: {collection_name}"
+            )
+
+        return results
+
+    # get_index_params method
+    def get_index_params(self, index_type: str, records_count: int) -> str:
+        if index_type == PgVectorIndexTypeEnums.IVFFLAT.value:
+            lists = self.ivfflat_lists
+            if not lists:
+                # pgvector guidance: rows / 1000 up to 1M rows, sqrt(rows) above
+                lists = (
+                    max(records_count // 1000, 10)
+                    if records_count <= 1000000
+                    else int(records_count**0.5)
                 )
+            return f"lists = {int(lists)}"
+
+        return f"m = {int(self.hnsw_m)}, ef_construction = {int(self.hnsw_ef_construction)}"
+
+    # get_index_build_settings method
+    def get_index_build_settings(self) -> dict:
+        build_settings = {}
+        if self.maintenance_work_mem:
+            build_settings["maintenance_work_mem"] = f"'{self.maintenance_work_mem}'"
+        if self.max_parallel_maintenance_workers is not None:
+            build_settings["max_parallel_maintenance_workers"] = str(
+                int(self.max_parallel_maintenance_workers)
+            )
+        return build_settings
+
+    async def create_vector_index(self, collection_name: str, index_type: str = None):
+        index_type = index_type if index_type else self.index_type
+
+        index_table_name = await self.get_index_table_name(
+            collection_name=collection_name
+        )
+        if not index_table_name:
+            return False
+
+        is_index_existed = await self.is_index_existed(table_name=index_table_name)
+        if is_index_existed:
+            return False
 
-    async def reset_vector_index(
-        self, collection_name: str, index_type: str = PgVectorIndexTypeEnums.HNSW.value
-    ) -> bool:
-        index_name = self.default_index_name(collection_name=collection_name)
         async with self.db_client() as session:
             async with session.begin():
-                drop_index_sql = sql_text(f"DROP INDEX EXISTS {index_name}")
+                count_sql = sql_text(f"SELECT COUNT(*) FROM {index_table_name}")
+                result = await session.execute(count_sql)
+                records_count = result.scalar_one()
+
+        if records_count < self.index_threshold:
+            return False
+
+        index_name = self.default_index_name(index_table_name)
+        create_index_sql = sql_text(
+            f"CREATE INDEX {'CONCURRENTLY ' if self.index_concurrently else ''}"
+            f"IF NOT EXISTS {index_name} ON {index_table_name} "
+            f"USING {index_type} ({PgVectorTableSchemeEnums.VECTOR.value} {self.distance_method}) "
+            f"WITH ({self.get_index_params(index_type=index_type, records_count=records_count)})"
+        )
+        build_settings = self.get_index_build_settings()
+
+        self.logger.info(
+            f"START: Creating {index_type} vector index for collection: {collection_name}"
+        )
+
+        try:
+            if self.index_concurrently:
+                # CONCURRENTLY can not run inside a transaction block, so use an
+                # autocommit connection and reset the session settings afterwards
+                async with self.db_client() as session:
+                    connection = await session.connection(
+                        execution_options={"isolation_level": "AUTOCOMMIT"}
+                    )
+                    for name, value in build_settings.items():
+                        await connection.execute(sql_text(f"SET {name} = {value}"))
+                    try:
+                        await connection.execute(create_index_sql)
+                    finally:
+                        for name in build_settings:
+                            await connection.execute(sql_text(f"RESET {name}"))
+            else:
+                async with self.db_client() as session:
+                    async with session.begin():
+                        for name, value in build_settings.items():
+                            await session.execute(
+                                sql_text(f"SET LOCAL {name} = {value}")
+                            )
+                        await session.execute(create_index_sql)
+
+        except Exception as e:
+            self.logger.error(
+                f"Error while creating vector index for collection: {collection_name}: {e}"
+            )
+            # a failed concurrent build leaves an invalid index behind
+            await self.drop_vector_index(collection_name=collection_name)
+            return False
+
+        self.logger.info(
+            f"END: Created vector index for collection: {collection_name}"
+        )
+        return True
+
+    async def drop_vector_index(self, collection_name: str) -> bool:
+        index_table_name = await self.get_index_table_name(
+            collection_name=collection_name
+        )
+        if not index_table_name:
+            return False
+
+        index_name = self.default_index_name(index_table_name)
+        async with self.db_client() as session:
+            async with session.begin():
+                drop_index_sql = sql_text(f"DROP INDEX IF EXISTS {index_name}")
                 await session.execute(drop_index_sql)
 
+        return True
+
+    async def reset_vector_index(self, collection_name: str, index_type: str = None) -> bool:
+        _ = await self.drop_vector_index(collection_name=collection_name)
+
         return await self.create_vector_index(
             collection_name=collection_name, index_type=index_type
         )
+
+    async def begin_bulk_load(self, collection_name: str, drop_index: bool = False):
+        self.bulk_load_collections.add(collection_name)
+
+        if drop_index:
+            self.logger.info(f"Dropping vector index for bulk load: {collection_name}")
+            _ = await self.drop_vector_index(collection_name=collection_name)
+
+        return True
+
+    async def end_bulk_load(self, collection_name: str):
+        self.bulk_load_collections.discard(collection_name)
+        _ = await self.create_metadata_index(collection_name=collection_name)
+
+        return await self.create_vector_index(collection_name=collection_name)
@@ -1,6 +1,12 @@
-from qdrant_client import models, QdrantClient
+from qdrant_client import models, AsyncQdrantClient
 from stores.vectordb.VectorDBInterface import VectorDBInterface
-from stores.vectordb.VectorDBEnums import DistanceMethodEnums
+from stores.vectordb.VectorDBEnums import (
+    DistanceMethodEnums,
+    QdrantQuantizationEnums,
+    FilterOperatorEnums,
+    VectorMetadataEnums,
+)
+import asyncio
 import logging
 from typing import List
 from models.db_schemes import RetrievedDocument
@@ -14,9 +20,43 @@ class QdrantDBProvider(VectorDBInterface):
         distance_method: str,
         default_vector_size: int = 786,
         index_threshold: int = 100,
+        url: str = None,
+        api_key: str = None,
+        prefer_grpc: bool = False,
+        timeout: int = None,
+        upload_batch_size: int = 64,
+        upload_parallel: int = 1,
+        quantization: str = None,
+        quantization_always_ram: bool = True,
+        scalar_quantile: float = None,
+        on_disk_vectors: bool = False,
+        on_disk_payload: bool = False,
+        hnsw_m: int = None,
+        hnsw_ef_construct: int = None,
+        search_hnsw_ef: int = None,
+        search_oversampling: float = None,
+        search_rescore: bool = True,
     ):
         self.client = None
+        # local storage path, used when no server url is configured
         self.db_client = db_client
+        self.url = url
+        self.api_key = api_key
+        self.prefer_grpc = prefer_grpc
+        self.timeout = timeout
+        self.upload_batch_size = upload_batch_size
+        self.upload_parallel = upload_parallel
+
+        self.quantization = quantization
+        self.quantization_always_ram = quantization_always_ram
+        self.scalar_quantile = scalar_quantile
+        self.on_disk_vectors = on_disk_vectors
+        self.on_disk_payload = on_disk_payload
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_construct = hnsw_ef_construct
+        self.search_hnsw_ef = search_hnsw_ef
+        self.search_oversampling = search_oversampling
+        self.search_rescore = search_rescore
         self.distance_method = distance_method
         self.default_vector_size= default_vector_size
         self.index_thrtehold= index_threshold
@@ -31,51 +71,173 @@ class QdrantDBProvider(VectorDBInterface):
 
     # connect method
     async def connect(self):
-        self.client = QdrantClient(path=self.db_client)
+        if self.url:
+            self.client = AsyncQdrantClient(
+                url=self.url,
+                api_key=self.api_key,
+                prefer_grpc=self.prefer_grpc,
+                timeout=self.timeout,
+            )
+        else:
+            self.client = AsyncQdrantClient(path=self.db_client)
 
     # disconnect method
     async def disconnect(self):
+        if self.client:
+            await self.client.close()
         self.client = None
 
     # is_collection_existed method
     async def is_collection_existed(self, collection_name: str) -> bool:
-        return self.client.collection_exists(collection_name=collection_name)
+        return await self.client.collection_exists(collection_name=collection_name)
 
     # list_all_collections method
     async def list_all_collections(self) -> List:
-        return self.client.get_collections()
+        return await self.client.get_collections()
 
     # get_collection_info method
     async def get_collection_info(self, collection_name: str) -> dict:
-        return self.client.get_collection(collection_name=collection_name)
+        return await self.client.get_collection(collection_name=collection_name)
 
     # delete_collection method
     async def delete_collection(self, collection_name: str):
-        if self.is_collection_existed(collection_name):
+        if await self.is_collection_existed(collection_name):
             self.logger.info(f"Delete collection: {collection_name}")
-            return self.client.delete_collection(collection_name=collection_name)
+            return await self.client.delete_collection(collection_name=collection_name)
         else:
             self.logger.error("Collection does not exist")
             return None
 
+    # get_quantization_config method
+    def get_quantization_config(self):
+        if self.quantization == QdrantQuantizationEnums.SCALAR.value:
+            return models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(
+                    type=models.ScalarType.INT8,
+                    quantile=self.scalar_quantile,
+                    always_ram=self.quantization_always_ram,
+                )
+            )
+
+        if self.quantization == QdrantQuantizationEnums.BINARY.value:
+            return models.BinaryQuantization(
+                binary=models.BinaryQuantizationConfig(
+                    always_ram=self.quantization_always_ram,
+                )
+            )
+
+        return None
+
+    # get_hnsw_config method
+    def get_hnsw_config(self):
+        if self.hnsw_m is None and self.hnsw_ef_construct is None:
+            return None
+
+        return models.HnswConfigDiff(
+            m=self.hnsw_m,
+            ef_construct=self.hnsw_ef_construct,
+        )
+
+    # get_search_params method
+    def get_search_params(self, ef_search: int = None):
+        hnsw_ef = ef_search if ef_search else self.search_hnsw_ef
+
+        quantization_params = None
+        if self.quantization:
+            # oversample candidates from the quantized vectors, then rescore
+            # them with the original ones
+            quantization_params = models.QuantizationSearchParams(
+                rescore=self.search_rescore,
+                oversampling=self.search_oversampling,
+            )
+
+        if hnsw_ef is None and quantization_params is None:
+            return None
+
+        return models.SearchParams(
+            hnsw_ef=hnsw_ef,
+            quantization=quantization_params,
+        )
+
+    # create_payload_indexes method
+    async def create_payload_indexes(self, collection_name: str):
+        # integer indexes on the metadata fields search filters use most
+        for field in VectorMetadataEnums:
+            _ = await self.client.create_payload_index(
+                collection_name=collection_name,
+                field_name=self.get_payload_key(field.value),
+                field_schema=models.PayloadSchemaType.INTEGER,
+            )
+
+    # get_payload_key method
+    def get_payload_key(self, field: str) -> str:
+        return f"metadata.{field}"
+
+    # get_query_filter method
+    def get_query_filter(self, filters: List[dict] = None):
+        if not filters:
+            return None
+
+        must, must_not = [], []
+        for condition in filters:
+            key = self.get_payload_key(condition["field"])
+            operator = condition.get("operator") or FilterOperatorEnums.EQ.value
+            value = condition.get("value")
+
+            if operator == FilterOperatorEnums.EQ.value:
+                must.append(
+                    models.FieldCondition(key=key, match=models.MatchValue(value=value))
+                )
+            elif operator == FilterOperatorEnums.NE.value:
+                must_not.append(
+                    models.FieldCondition(key=key, match=models.MatchValue(value=value))
+                )
+            elif operator == FilterOperatorEnums.IN.value:
+                must.append(
+                    models.FieldCondition(key=key, match=models.MatchAny(any=list(value)))
+                )
+            elif operator in (
+                FilterOperatorEnums.GT.value,
+                FilterOperatorEnums.GTE.value,
+                FilterOperatorEnums.LT.value,
+                FilterOperatorEnums.LTE.value,
+            ):
+                must.append(
+                    models.FieldCondition(
+                        key=key, range=models.Range(**{operator: value})
+                    )
+                )
+            else:
+                raise ValueError(f"Unsupported filter operator: {operator}")
+
+        return models.Filter(must=must or None, must_not=must_not or None)
+
     # create_collection method
     async def create_collection(
         self, collection_name: str, embedding_size: int, do_reset: bool = False
     ):
         if do_reset:
-            _ = self.delete_collection(collection_name=collection_name)
+            _ = await self.delete_collection(collection_name=collection_name)
 
-        if not self.is_collection_existed(collection_name=collection_name):
+        if not await self.is_collection_existed(collection_name=collection_name):
             self.logger.info(f"Creating new Qdrant collection: {collection_name}")
 
-            _ = self.client.create_collection(
+            _ = await self.client.create_collection(
                 collection_name=collection_name,
                 vectors_config=models.VectorParams(
                     size=embedding_size,
                     distance=self.distance_method,
+                    on_disk=self.on_disk_vectors,
                 ),
+                on_disk_payload=self.on_disk_payload,
+                hnsw_config=self.get_hnsw_config(),
+                quantization_config=self.get_quantization_config(),
             )
 
+            if self.url:
+                # payload indexes only exist on a Qdrant server
+                await self.create_payload_indexes(collection_name=collection_name)
+
             return True
 
         return False
@@ -89,19 +251,19 @@ class QdrantDBProvider(VectorDBInterface):
         metadata: dict = None,
         record_id: str = None,
     ):
-        if not self.is_collection_existed(collection_name=collection_name):
+        if not await self.is_collection_existed(collection_name=collection_name):
             self.logger.error(
                 f"Can not insert new record to non-existed collection: {collection_name}"
             )
             return False
 
         try:
-            _ = self.client.upload_records(
+            _ = await self.client.upsert(
                 collection_name=collection_name,
-                records=[
-                    models.Record(
-                        id=[record_id],
-                        vecotr=vector,
+                points=[
+                    models.PointStruct(
+                        id=record_id,
+                        vector=vector,
                         payload={
                             "text": text,
                             "metadata": metadata,
@@ -132,48 +294,128 @@ class QdrantDBProvider(VectorDBInterface):
         if record_ids is None:
             record_ids = list(range(0, len(texts)))
 
-        for i in range(0, len(texts), batch_size):
-            batch_end = i + batch_size
-
-            batch_texts = texts[i:batch_end]
-            batch_vectors = vectors[i:batch_end]
-            batch_metadat = metadata[i:batch_end]
-            batch_record_ids = record_ids[i:batch_end]
-
-            batch_records = [
-                models.Record(
-                    id=batch_record_ids[x],
-                    vector=batch_vectors[x],
-                    payload={
-                        "text": batch_texts[x],
-                        "metadata": batch_metadat[x],
-                    },
+        points = [
+            models.PointStruct(
+                id=record_ids[x],
+                vector=vectors[x],
+                payload={
+                    "text": texts[x],
+                    "metadata": metadata[x],
+                },
+            )
+            for x in range(len(texts))
+        ]
+
+        try:
+            if self.url:
+                # parallel > 1 starts a process pool on every call, which only
+                # pays off when each worker gets more than one batch
+                parallel = (
+                    self.upload_parallel
+                    if len(points) > self.upload_batch_size * self.upload_parallel
+                    else 1
+                )
+
+                # upload_points is blocking; it batches the points and sends
+                # them from `parallel` workers, so keep it off the event loop
+                await asyncio.to_thread(
+                    self.client.upload_points,
+                    collection_name=collection_name,
+                    points=points,
+                    batch_size=self.upload_batch_size,
+                    parallel=parallel,
+                    wait=True,
                 )
-                for x in range(len(batch_texts))
+            else:
+                # local mode runs in-process, upload batch by batch
+                for i in range(0, len(points), self.upload_batch_size):
+                    _ = await self.client.upsert(
+                        collection_name=collection_name,
+                        points=points[i : i + self.upload_batch_size],
+                    )
+
+        except Exception as e:
+            self.logger.error(f"Error while inserting batch: {e}")
+            return False
+
+        return True
+
+    # delete_by_asset_ids method
+    async def delete_by_asset_ids(
+        self, collection_name: str, asset_ids: List[int], record_ids: List[int] = None
+    ):
+        if not asset_ids or not await self.is_collection_existed(collection_name):
+            return True
+
+        query_filter = self.get_query_filter(
+            [
+                {
+                    "field": VectorMetadataEnums.ASSET_ID.value,
+                    "operator": FilterOperatorEnums.IN.value,
+                    "value": list(asset_ids),
+                }
             ]
+        )
 
-            try:
-                _ = self.client.upload_records(
+        try:
+            # point ids are chunk ids, this also covers points without an asset id
+            record_ids = list(record_ids or [])
+            for i in range(0, len(record_ids), self.upload_batch_size):
+                # a has_id filter, unlike a points list, skips missing ids
+                _ = await self.client.delete(
                     collection_name=collection_name,
-                    records=batch_records,
+                    points_selector=models.FilterSelector(
+                        filter=models.Filter(
+                            must=[
+                                models.HasIdCondition(
+                                    has_id=record_ids[i : i + self.upload_batch_size]
+                                )
+                            ]
+                        )
+                    ),
+                    wait=True,
                 )
 
-            except Exception as e:
-                self.logger.error(f"Error while inserting batch: {e}")
-                return False
+            _ = await self.client.delete(
+                collection_name=collection_name,
+                points_selector=models.FilterSelector(filter=query_filter),
+                wait=True,
+            )
+        except Exception as e:
+            self.logger.error(f"Error while deleting asset records: {e}")
+            return False
+
+        return True
+
+    # begin_bulk_load method
+    async def begin_bulk_load(self, collection_name: str, drop_index: bool = False):
+        return True
 
+    # end_bulk_load method
+    async def end_bulk_load(self, collection_name: str):
         return True
 
     # search_by_vector method
     async def search_by_vector(
-        self, collection_name: str, vector: list, limit: int = 5
+        self,
+        collection_name: str,
+        vector: list,
+        limit: int = 5,
+        ef_search: int = None,
+        probes: int = None,
+        rerank_depth: int = None,
+        filters: List[dict] = None,
     ):
 
-        results = self.client.search(
+        response = await self.client.query_points(
             collection_name=collection_name,
-            query_vector=vector,
+            query=vector,
             limit=limit,
+            search_params=self.get_search_params(ef_search=ef_search),
+            query_filter=self.get_query_filter(filters=filters),
+            with_payload=True,
         )
+        results = response.points
         if not results or len(results) == 0:
             return None
 
@@ -182,7 +424,56 @@ class QdrantDBProvider(VectorDBInterface):
                 **{
                     "score": result.score,
                     "text": result.payload["text"],
+                    "chunk_id": result.id,
+                    "metadata": result.payload.get("metadata"),
                 }
             )
             for result in results
         ]
+
+    # search_by_vectors method
+    async def search_by_vectors(
+        self,
+        collection_name: str,
+        vectors: List[list],
+        limit: int = 5,
+        ef_search: int = None,
+        probes: int = None,
+        rerank_depth: int = None,
+        filters: List[dict] = None,
+    ):
+        if not vectors:
+            return []
+
+        search_params = self.get_search_params(ef_search=ef_search)
+        query_filter = self.get_query_filter(filters=filters)
+
+        # the batch query API is the successor of search_batch
+        responses = await self.client.query_batch_points(
+            collection_name=collection_name,
+            requests=[
+                models.QueryRequest(
+                    query=vector,
+                    limit=limit,
+                    params=search_params,
+                    filter=query_filter,
+                    with_payload=True,
+                )
+                for vector in vectors
+            ],
+        )
+
+        return [
+            [
+                RetrievedDocument(
+                    **{
+                        "score": result.score,
+                        "text": result.payload["text"],
+                        "chunk_id": result.id,
+                        "metadata": result.payload.get("metadata"),
+                    }
+                )
+                for result in response.points
+            ]
+            for response in responses
+        ]
@@ -1,2 +1,5 @@
 from .QdrantDBProvider import QdrantDBProvider
-from .PGVectorProvider import PGVectorProvider
\ No newline at end of file
+from .PGVectorProvider import PGVectorProvider
+from .PGVectorPartitionedProvider import PGVectorPartitionedProvider
+from .NumpyDBProvider import NumpyDBProvider
+from .IVFPQDBProvider import IVFPQDBProvider